@@ -6,9 +6,11 @@ import shutil
 import logging
 import tempfile
 from datetime import datetime
+import anyio
 
 from app import crud
 from app.api import deps
+from app.api.api_v1.endpoints.orders import pending_orders_cache
 from app.schemas.cruise_order import (
     CruiseOrderUploadResponse,
     CruiseOrderConfirmRequest,
@@ -29,6 +31,9 @@ logger = logging.getLogger(__name__)
 # 临时存储解析结果
 _temp_storage = {}
 
+# 上传文件分块写入磁盘时每块的大小
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 @router.post("/upload", response_model=CruiseOrderUploadResponse)
 async def upload_cruise_order_file(
@@ -50,14 +55,16 @@ async def upload_cruise_order_file(
             )
         
         # 创建临时文件
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as temp_file:
-            temp_file_path = temp_file.name
-            
-            # 保存上传的文件
-            content = await file.read()
-            temp_file.write(content)
+        fd, temp_file_path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
         
         try:
+            # 保存上传的文件
+            # 🚀 性能优化：分块异步写入临时文件，不阻塞事件循环，内存占用与文件大小无关
+            async with await anyio.open_file(temp_file_path, "wb") as temp_file:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    await temp_file.write(chunk)
+            
             # 解析Excel文件
             parser = CruiseExcelParser()
             orders = parser.parse_cruise_order_file(temp_file_path)
@@ -380,6 +387,8 @@ async def _create_order_from_cruise_data(db: Session, order_data: CruiseOrderHea
             db.add(order_item)
         
         db.commit()
+        # 新建的订单项目为待处理状态，使待处理订单列表缓存失效
+        pending_orders_cache.invalidate()
         return order.id
         
     except Exception as e:
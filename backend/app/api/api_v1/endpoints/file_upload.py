@@ -1,16 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from fastapi.responses import JSONResponse
+from sqlalchemy import func, insert, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterable
 import logging
 import pandas as pd
 import numpy as np
 import io
 import os
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
+from itertools import islice
 from difflib import SequenceMatcher
 import re
 
@@ -128,6 +131,52 @@ DUPLICATE_STRATEGIES = {
     "products": DuplicateHandlingStrategy.ERROR,    # 产品数据报错
 }
 
+# 批量导入每批提交的行数
+IMPORT_BATCH_SIZE = 500
+
+# bulk_save_objects 每次写入的对象数量
+BULK_SAVE_CHUNK_SIZE = 1000
+
+# 重复检查时每条 IN 查询最多携带的值数量
+EXISTENCE_PROBE_CHUNK_SIZE = 1000
+
+# 错误提示中最多列出的可选名称数量
+AVAILABLE_NAMES_HINT_LIMIT = 20
+
+# 各表对应的模型，行处理函数只返回字段值，由导入流程统一写入
+IMPORT_MODELS = {
+    "countries": Country,
+    "categories": Category,
+    "ports": Port,
+    "companies": Company,
+    "suppliers": Supplier,
+    "ships": Ship,
+    "products": Product,
+}
+
+# 各表导入时需要的外键表，预加载为 名称 -> ID 映射
+FOREIGN_KEY_TABLES = {
+    "ports": {"countries": Country},
+    "companies": {"countries": Country},
+    "suppliers": {"countries": Country},
+    "ships": {"companies": Company},
+    "products": {"countries": Country, "categories": Category, "suppliers": Supplier, "ports": Port},
+}
+
+# 外键映射缓存: 表名 -> (外键表版本, 映射)，版本变化时重新加载
+_FOREIGN_KEY_MAP_CACHE: Dict[str, Tuple[Tuple[Any, ...], Dict[str, Dict[str, int]]]] = {}
+
+# 各表需要做重复检查的唯一键列，导入前预加载为集合
+UNIQUE_KEY_COLUMNS = {
+    "countries": {"name": Country.name, "code": Country.code},
+    "categories": {"name": Category.name},
+    "ports": {"name": Port.name, "code": Port.code},
+    "companies": {"name": Company.name},
+    "suppliers": {"name": Supplier.name},
+    "ships": {"name": Ship.name},
+    "products": {"product_name_en": Product.product_name_en},
+}
+
 def validate_file_type(filename: str) -> bool:
     """验证文件类型"""
     return any(filename.lower().endswith(ext) for ext in ALLOWED_EXTENSIONS)
@@ -395,12 +444,11 @@ def quick_precheck_for_empty_db(table_name: str, df: pd.DataFrame, db: Session,
             foreign_key_cache['companies'] = {c.name: c.id for c in db.query(Company).all()}
 
     # 快速验证每行
-    for index, row in df.iterrows():
+    for index, row_dict in _iter_row_dicts(df):
         row_number = index + 2
-        row_dict = row.to_dict()
 
         # 只做基本验证
-        row_errors = validate_basic_fields_only(table_name, row, row_number, foreign_key_cache, rules)
+        row_errors = validate_basic_fields_only(table_name, row_dict, row_number, foreign_key_cache, rules)
 
         if row_errors:
             result.validation_errors.append({
@@ -438,12 +486,11 @@ def basic_precheck_with_existing_data(table_name: str, df: pd.DataFrame, db: Ses
             foreign_key_cache['companies'] = {c.name: c.id for c in db.query(Company).all()}
 
     # 基本验证每行
-    for index, row in df.iterrows():
+    for index, row_dict in _iter_row_dicts(df):
         row_number = index + 2
-        row_dict = row.to_dict()
 
         # 基本验证
-        row_errors = validate_basic_fields_only(table_name, row, row_number, foreign_key_cache, rules)
+        row_errors = validate_basic_fields_only(table_name, row_dict, row_number, foreign_key_cache, rules)
 
         if row_errors:
             result.validation_errors.append({
@@ -469,7 +516,7 @@ def basic_precheck_with_existing_data(table_name: str, df: pd.DataFrame, db: Ses
 
     return result
 
-def validate_basic_fields_only(table_name: str, row: pd.Series, row_number: int, foreign_key_cache: Dict, rules: Dict) -> List[str]:
+def validate_basic_fields_only(table_name: str, row: Dict[str, Any], row_number: int, foreign_key_cache: Dict, rules: Dict) -> List[str]:
     """只验证基本字段 - 简化版本"""
     errors = []
 
@@ -837,8 +884,8 @@ def validate_all_data_before_import(table_name: str, df: pd.DataFrame, db: Sessi
                 result.errors.append(f"缺少必填列: {col}")
                 return False, result
 
-        # 逐行验证数据
-        for index, row in df.iterrows():
+        # 逐行验证数据（行字典中 NaN 已转换为 None）
+        for index, row in _iter_row_dicts(df):
             row_errors = validate_single_row(table_name, row, index + 2, db, rules)
             result.errors.extend(row_errors)
             if row_errors:
@@ -931,7 +978,7 @@ def get_debug_info_from_cache(reference: str, cache: Dict) -> str:
     except Exception as e:
         return f"获取调试信息失败: {str(e)}"
 
-def validate_single_row(table_name: str, row: pd.Series, row_number: int, db: Session, rules: Dict) -> List[str]:
+def validate_single_row(table_name: str, row: Dict[str, Any], row_number: int, db: Session, rules: Dict) -> List[str]:
     """验证单行数据"""
     errors = []
 
@@ -1112,7 +1159,7 @@ def validate_foreign_key(column: str, value: str, reference: str, db: Session) -
     except Exception:
         return False
 
-def validate_product_specific_fields(row: pd.Series, row_number: int) -> List[str]:
+def validate_product_specific_fields(row: Dict[str, Any], row_number: int) -> List[str]:
     """验证产品特有字段"""
     errors = []
 
@@ -1182,8 +1229,17 @@ def validate_table_data(table_name: str, df: pd.DataFrame, db: Session) -> Dict[
         validation_result["errors"].append(f"缺少必填列: {', '.join(missing_columns)}")
         return validation_result
     
-    # 逐行验证数据
-    for index, row in df.iterrows():
+    # 🚀 性能优化：外键名称按文件中出现的值分块 IN 查询一次，循环中只做集合查找
+    existing_references = {}
+    fk_tables = FOREIGN_KEY_TABLES.get(table_name, {})
+    for name_col, map_key, _ in FOREIGN_KEY_COLUMNS.get(table_name, []):
+        if name_col in df.columns:
+            names = df[name_col].dropna().astype(str)
+            candidates = set(names) | set(names.str.strip())
+            existing_references[name_col] = probe_existing_values(db, fk_tables[map_key].name, candidates)
+
+    # 🚀 性能优化：逐行验证使用普通字典（NaN 已转换为 None），代替 iterrows 构造 pd.Series
+    for index, row in _iter_row_dicts(df):
         row_errors = []
         
         # 验证必填字段
@@ -1195,59 +1251,45 @@ def validate_table_data(table_name: str, df: pd.DataFrame, db: Session) -> Dict[
         if table_name == "ports" and "country_name" in row:
             if not pd.isna(row["country_name"]):
                 country_name = str(row["country_name"]).strip()  # 去除空格
-                country = db.query(Country).filter(Country.name == country_name).first()
-                if not country:
-                    # 获取所有可用的国家名称用于调试
-                    available_countries = [c.name for c in db.query(Country).all()]
+                if country_name not in existing_references["country_name"]:
                     logger.warning(f"港口验证失败 - 第{index+2}行: 国家名称 '{country_name}' 不存在")
-                    logger.warning(f"可用的国家: {available_countries}")
                     row_errors.append(f"第{index+2}行: 国家名称在系统中不存在")
                     row_errors.append(f"💡 建议：请检查国家名称拼写，或先导入国家数据")
         
         elif table_name == "companies" and "country_name" in row:
             if not pd.isna(row["country_name"]):
                 country_name = str(row["country_name"]).strip()  # 去除空格
-                country = db.query(Country).filter(Country.name == country_name).first()
-                if not country:
+                if country_name not in existing_references["country_name"]:
                     row_errors.append(f"第{index+2}行: 国家名称在系统中不存在")
                     row_errors.append(f"💡 建议：请检查国家名称拼写，或先导入国家数据")
         
         elif table_name == "suppliers" and "country_name" in row:
             if not pd.isna(row["country_name"]):
                 country_name = str(row["country_name"]).strip()  # 去除空格
-                country = db.query(Country).filter(Country.name == country_name).first()
-                if not country:
-                    # 调试信息：显示所有可用的国家
-                    all_countries = db.query(Country.name).all()
-                    available_countries = [c[0] for c in all_countries]
-                    row_errors.append(f"第{index+2}行: country_name '{country_name}' 不存在。可用国家: {available_countries}")
+                if country_name not in existing_references["country_name"]:
+                    row_errors.append(f"第{index+2}行: country_name '{country_name}' 不存在，请检查国家名称拼写，或先导入国家数据")
         
         elif table_name == "ships" and "company_name" in row:
             if not pd.isna(row["company_name"]):
-                company = db.query(Company).filter(Company.name == row["company_name"]).first()
-                if not company:
+                if row["company_name"] not in existing_references["company_name"]:
                     row_errors.append(f"第{index+2}行: 公司 '{row['company_name']}' 不存在")
         
         elif table_name == "products":
             # 验证产品的多个外键关系
             if "country_name" in row and not pd.isna(row["country_name"]):
-                country = db.query(Country).filter(Country.name == row["country_name"]).first()
-                if not country:
+                if row["country_name"] not in existing_references["country_name"]:
                     row_errors.append(f"第{index+2}行: 国家 '{row['country_name']}' 不存在")
             
             if "category_name" in row and not pd.isna(row["category_name"]):
-                category = db.query(Category).filter(Category.name == row["category_name"]).first()
-                if not category:
+                if row["category_name"] not in existing_references["category_name"]:
                     row_errors.append(f"第{index+2}行: 类别 '{row['category_name']}' 不存在")
             
             if "supplier_name" in row and not pd.isna(row["supplier_name"]):
-                supplier = db.query(Supplier).filter(Supplier.name == row["supplier_name"]).first()
-                if not supplier:
+                if row["supplier_name"] not in existing_references["supplier_name"]:
                     row_errors.append(f"第{index+2}行: 供应商 '{row['supplier_name']}' 不存在")
             
             if "port_name" in row and not pd.isna(row["port_name"]):
-                port = db.query(Port).filter(Port.name == row["port_name"]).first()
-                if not port:
+                if row["port_name"] not in existing_references["port_name"]:
                     row_errors.append(f"第{index+2}行: 港口 '{row['port_name']}' 不存在")
         
         if row_errors:
@@ -1258,12 +1300,8 @@ def validate_table_data(table_name: str, df: pd.DataFrame, db: Session) -> Dict[
         
         # 添加数据预览（前5行）
         if index < 5:
-            # 处理NaN值，转换为None以便JSON序列化
-            row_dict = row.to_dict()
-            for key, value in row_dict.items():
-                if pd.isna(value):
-                    row_dict[key] = None
-            validation_result["data_preview"].append(row_dict)
+            # 行字典中的 NaN 已转换为 None，可直接JSON序列化
+            validation_result["data_preview"].append(row)
     
     return validation_result
 
@@ -1461,6 +1499,8 @@ async def upload_data_internal(
 
         # 阶段2: 原子性批量导入
         import_result = import_table_data_atomic(table_name, df, db)
+        if import_result.success_count:
+            invalidate_foreign_key_cache()
 
         logger.info(f"导入完成: 成功 {import_result.success_count} 行，跳过 {import_result.skipped_count} 行")
 
@@ -1477,6 +1517,300 @@ async def upload_data_internal(
         # 不需要在这里回滚，import_table_data_atomic已经处理了
         raise HTTPException(status_code=500, detail=f"数据导入失败: {str(e)}")
 
+# 导入前需要统一去空格的字符串列
+STRING_COLUMNS = (
+    "name", "code", "unit", "currency", "unit_size", "pack_size", "brand", "country_of_origin",
+    "contact", "email", "phone", "location", "ship_type", "country_name", "category_name",
+    "supplier_name", "port_name", "company_name", "product_name_en", "product_name_jp",
+)
+DATE_COLUMNS = ("effective_from", "effective_to")
+# 未填写结束日期时，默认有效期为起始日期后的天数（约3个月）
+DEFAULT_EFFECTIVE_DAYS = 90
+# 外键名称列，取值重复度高
+FOREIGN_KEY_NAME_COLUMNS = ("country_name", "category_name", "supplier_name", "port_name", "company_name")
+# status 列中表示启用的常见取值，直接查表命中
+_STATUS_TRUE = frozenset({"true", "True", "TRUE"})
+
+
+def parse_status(value: Any) -> bool:
+    """
+    解析 status 字段，结果与 str(value).lower() == "true" 一致
+    🚀 性能优化：布尔值和常见字符串直接判断/查表，不再为每个单元格构造临时字符串
+    """
+    if value is True:
+        return True
+    if isinstance(value, str):
+        return value in _STATUS_TRUE or value.lower() == "true"
+    return isinstance(value, np.bool_) and bool(value)
+
+
+def safe_string_field(value: Any) -> Optional[str]:
+    """将单元格值转换为去除首尾空格的字符串，空值和空白字符串返回 None"""
+    if value is None or pd.isna(value):
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _clean_string_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    字符串列整列去除首尾空格，空字符串和 NaN 统一为 None，返回新的 DataFrame
+    🚀 性能优化：代替逐格 pd.isna / str(...).strip() 判断
+    """
+    df = df.copy()
+    for col in STRING_COLUMNS:
+        if col not in df.columns:
+            continue
+        original = df[col]
+        cleaned = original.astype("string").str.strip()
+        keep = original.notna() & cleaned.ne("").fillna(False).astype(bool)
+        df[col] = cleaned.astype(object).where(keep, None)
+    return df
+
+
+def _normalize_dataframe(df: pd.DataFrame, table_name: str) -> pd.DataFrame:
+    """
+    导入前按列统一清洗数据
+    🚀 性能优化：字符串去空格、日期和价格解析都按列向量化完成，行处理函数不再逐格调用 pd.isna / strip
+    - 字符串列：去除首尾空格，空字符串视为空值
+    - 日期列：解析为日期时间，无法解析的保留原值，由行处理函数报告格式错误
+    - price：转换为数值，无法转换的保留原值，由行处理函数报告格式错误
+    - 外键名称列：转为 category 类型
+    - status：解析为布尔值
+    """
+    df = _clean_string_columns(df)
+
+    for col in DATE_COLUMNS:
+        if col not in df.columns:
+            continue
+        original = df[col]
+        parsed = pd.to_datetime(original, errors="coerce")
+        df[col] = parsed.astype(object).where(parsed.notna(), original)
+
+    if "price" in df.columns:
+        original = df["price"]
+        numeric = pd.to_numeric(original, errors="coerce")
+        df["price"] = numeric.astype(object).where(numeric.notna(), original)
+
+    # 外键名称列转为 category，减少内存并加快外键解析时的 map
+    for col in FOREIGN_KEY_NAME_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    # status 一次性解析为布尔值
+    if "status" in df.columns:
+        df["status"] = df["status"].astype(str).str.lower().eq("true")
+
+    return df
+
+
+def _iter_row_dicts(df: pd.DataFrame):
+    """
+    逐行产出 (行索引, 行字典)
+    🚀 性能优化：用 itertuples 代替 iterrows，避免每行构造 pd.Series；
+    NaN 事先统一转换为 None，行处理函数中可直接用 is None 判断
+    """
+    columns = list(df.columns)
+    clean_df = df.astype(object).where(pd.notna(df), None)
+    for index, *values in clean_df.itertuples(index=True, name=None):
+        yield index, dict(zip(columns, values))
+
+
+# 各表的必填列：(列名, 为空时的错误说明)，按检查顺序排列
+REQUIRED_COLUMNS = {
+    "countries": [("name", "name"), ("code", "code")],
+    "categories": [("name", "name")],
+    "products": [
+        ("product_name_en", "product_name_en (产品英文名称)"),
+        ("effective_from", "effective_from (起始日期)"),
+        ("country_name", "country_name (国家名称)"),
+        ("category_name", "category_name (类别名称)"),
+    ],
+}
+
+
+def _required_field_errors(df: pd.DataFrame, table_name: str) -> Dict[Any, str]:
+    """
+    按列检查必填字段，返回 {行索引: 错误信息}，每行只报告第一个为空的必填列
+    🚀 性能优化：空值和空白字符串判断按列向量化完成，代替逐行 pd.isna / strip
+    """
+    required = REQUIRED_COLUMNS.get(table_name)
+    if not required:
+        return {}
+
+    conditions = []
+    for col, _ in required:
+        if col in df.columns:
+            values = df[col]
+            conditions.append(values.isna() | values.astype(str).str.strip().eq(""))
+        else:
+            conditions.append(pd.Series(True, index=df.index))
+    labels = [f"{label} 不能为空" for _, label in required]
+    messages = pd.Series(np.select(conditions, labels, default=""), index=df.index)
+    messages = messages[messages.ne("")]
+    return {index: f"第{index+2}行: {message}" for index, message in messages.items()}
+
+
+# 各表需要解析的外键：(名称列, 预加载映射表, ID列)
+FOREIGN_KEY_COLUMNS = {
+    "ports": [("country_name", "countries", "country_id")],
+    "companies": [("country_name", "countries", "country_id")],
+    "suppliers": [("country_name", "countries", "country_id")],
+    "ships": [("company_name", "companies", "company_id")],
+    "products": [
+        ("country_name", "countries", "country_id"),
+        ("category_name", "categories", "category_id"),
+        ("supplier_name", "suppliers", "supplier_id"),
+        ("port_name", "ports", "port_id"),
+    ],
+}
+
+
+def _resolve_foreign_keys(df: pd.DataFrame, table_name: str, foreign_key_maps: Dict[str, Any]) -> pd.DataFrame:
+    """
+    按列把外键名称解析为ID
+    🚀 性能优化：用 Series.map 一次解析整列，行处理函数直接读取 *_id 列，找不到的为空值
+    """
+    resolved = {}
+    for name_col, map_key, id_col in FOREIGN_KEY_COLUMNS.get(table_name, []):
+        if name_col in df.columns:
+            ids = df[name_col].map(foreign_key_maps.get(map_key, {}))
+        else:
+            ids = pd.Series(None, index=df.index, dtype=object)
+        resolved[id_col] = ids.astype("Int64")
+    return df.assign(**resolved) if resolved else df
+
+
+# 产品表写入的字段
+PRODUCT_VALUE_COLUMNS = (
+    "product_name_en", "product_name_jp", "code", "country_id", "category_id", "supplier_id", "port_id",
+    "unit", "price", "currency", "unit_size", "pack_size", "brand", "country_of_origin",
+    "effective_from", "effective_to", "status",
+)
+
+
+def _parse_date_column(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    解析日期列，返回 (解析结果, 格式错误掩码)
+    _normalize_dataframe 未能解析的字符串再按 %Y-%m-%d 尝试一次，与逐行处理的规则一致
+    """
+    present = values.notna()
+    is_text = values.map(lambda v: isinstance(v, str))
+    parsed = pd.to_datetime(values.where(~is_text), errors="coerce")
+    parsed = parsed.fillna(pd.to_datetime(values.where(is_text), format="%Y-%m-%d", errors="coerce"))
+    return parsed, present & parsed.isna()
+
+
+def _validate_products(df: pd.DataFrame, foreign_key_maps: Dict[str, Any], strategy: DuplicateHandlingStrategy) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    产品数据向量化校验，df 需已经过 _resolve_foreign_keys
+    🚀 性能优化：重复检查、价格和日期校验都按列一次完成，批量写入时不再逐行判断
+    检查顺序与 process_product_row_optimized 一致，每行只报告第一个错误
+    返回 (可直接写入的字段值, 被拒绝的行[row_number, status, message])
+    """
+    def column(name):
+        return df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+
+    countries = foreign_key_maps.get("countries", {})
+    categories = foreign_key_maps.get("categories", {})
+    country_id = df["country_id"]
+    category_id = df["category_id"]
+    supplier_name = column("supplier_name")
+    supplier_id = df["supplier_id"]
+    port_name = column("port_name")
+    port_id = df["port_id"]
+
+    fk_ok = country_id.notna() & category_id.notna()
+    fk_ok &= supplier_name.isna() | supplier_id.notna()
+    fk_ok &= port_name.isna() | port_id.notna()
+
+    raw_price = column("price")
+    price = pd.to_numeric(raw_price, errors="coerce")
+    has_price = raw_price.notna() & raw_price.ne(0) & raw_price.ne("")
+    price_bad_format = has_price & price.isna()
+    price_negative = has_price & (price < 0)
+
+    effective_from, from_bad = _parse_date_column(column("effective_from"))
+    effective_to, to_bad = _parse_date_column(column("effective_to"))
+    # 没有结束日期时按起始日期顺延默认天数，并整列检查日期范围
+    effective_to = effective_to.where(to_bad, effective_to.fillna(effective_from + pd.Timedelta(days=DEFAULT_EFFECTIVE_DAYS)))
+    date_range_bad = effective_to < effective_from
+
+    # 与已有数据重复；文件内重复只有在更早的同名行被成功导入时才算重复
+    names = column("product_name_en")
+    dup_existing = names.isin(foreign_key_maps.get("unique_keys", {}).get("product_name_en", set()))
+    row_ok = fk_ok & ~dup_existing & ~price_bad_format & ~price_negative & ~from_bad & ~to_bad & ~date_range_bad
+    position = pd.Series(np.arange(len(df)), index=df.index)
+    first_ok_position = position.where(row_ok).groupby(names).transform("min")
+    dup_in_file = fk_ok & ~dup_existing & (first_ok_position < position)
+
+    reasons = np.select(
+        [
+            country_id.isna(),
+            category_id.isna(),
+            supplier_name.notna() & supplier_id.isna(),
+            port_name.notna() & port_id.isna(),
+            dup_existing | dup_in_file,
+            price_bad_format,
+            price_negative,
+            from_bad,
+            to_bad,
+            date_range_bad,
+        ],
+        ["country", "category", "supplier", "port", "duplicate", "price_format", "price_negative", "effective_from", "effective_to", "date_range"],
+        default="",
+    )
+    reasons = pd.Series(reasons, index=df.index)
+    accepted = reasons.eq("")
+
+    # 只为被拒绝的行拼接错误信息
+    is_skip = strategy is DuplicateHandlingStrategy.SKIP
+    rejected_rows = []
+    for index, reason in reasons[~accepted].items():
+        row_number = index + 2
+        status = "error"
+        if reason == "country":
+            message = f"第{row_number}行: 国家 '{df.at[index, 'country_name']}' 不存在。可用国家: {available_names_hint(countries)}"
+        elif reason == "category":
+            message = f"第{row_number}行: 类别 '{df.at[index, 'category_name']}' 不存在。可用类别: {available_names_hint(categories)}"
+        elif reason == "supplier":
+            message = f"第{row_number}行: 供应商 '{supplier_name[index]}' 不存在"
+        elif reason == "port":
+            message = f"第{row_number}行: 港口 '{port_name[index]}' 不存在"
+        elif reason == "duplicate":
+            if is_skip:
+                status = "skipped"
+                message = f"第{row_number}行: 产品 '{names[index]}' 已存在，已跳过"
+            else:
+                message = f"第{row_number}行: 产品 '{names[index]}' 已存在"
+        elif reason == "price_format":
+            message = f"第{row_number}行: price (价格) 格式错误，必须为数字"
+        elif reason == "price_negative":
+            message = f"第{row_number}行: price (价格) 不能为负数"
+        elif reason == "date_range":
+            message = f"第{row_number}行: 结束日期不能早于起始日期"
+        else:
+            message = f"第{row_number}行: {reason} 日期格式错误"
+        rejected_rows.append((row_number, status, message))
+    rejected = pd.DataFrame(rejected_rows, columns=["row_number", "status", "message"])
+
+    values = pd.DataFrame({col: column(col) for col in PRODUCT_VALUE_COLUMNS if col in STRING_COLUMNS}, index=df.index)
+    values["country_id"] = country_id
+    values["category_id"] = category_id
+    values["supplier_id"] = supplier_id
+    values["port_id"] = port_id
+    values["price"] = price.where(has_price)
+    values["effective_from"] = effective_from
+    values["effective_to"] = effective_to
+    if "status" in df.columns:
+        values["status"] = df["status"]
+    else:
+        values["status"] = True
+    values = values[list(PRODUCT_VALUE_COLUMNS)][accepted]
+
+    return values, rejected
+
+
 def import_table_data_atomic(table_name: str, df: pd.DataFrame, db: Session, progress_callback=None) -> ImportResult:
     """
     原子性数据导入 - 逐行提交模式，避免批量INSERT问题
@@ -1486,32 +1820,40 @@ def import_table_data_atomic(table_name: str, df: pd.DataFrame, db: Session, pro
     try:
         # 获取重复数据处理策略
         strategy = DUPLICATE_STRATEGIES.get(table_name, DuplicateHandlingStrategy.ERROR)
+        is_error = strategy is DuplicateHandlingStrategy.ERROR
+
+        model = IMPORT_MODELS[table_name]
 
         logger.info(f"开始数据导入 {table_name}，策略: {strategy.value}，使用逐行提交模式")
 
+        df = _normalize_dataframe(df, table_name)
+
         # 🔥 性能优化：预加载所有外键数据
-        foreign_key_maps = preload_foreign_key_data(table_name, db)
+        foreign_key_maps = preload_foreign_key_data(table_name, db, df)
         logger.info(f"外键数据预加载完成，包含 {sum(len(v) for v in foreign_key_maps.values())} 条记录")
+        df = _resolve_foreign_keys(df, table_name, foreign_key_maps)
 
         # 逐行处理数据并立即提交
-        for index, row in df.iterrows():
+        for index, row in _iter_row_dicts(df):
             try:
                 row_result = process_single_row_atomic_optimized(table_name, row, index + 2, db, strategy, foreign_key_maps)
 
-                if row_result["status"] == "success":
+                row_status = row_result["status"]
+                if row_status == "success":
                     # 立即提交这一行的更改
+                    db.add(model(**row_result["values"]))
                     db.commit()
                     result.success_count += 1
                     logger.debug(f"第{index+2}行数据提交成功")
-                elif row_result["status"] == "skipped":
+                elif row_status == "skipped":
                     result.skipped_count += 1
                     result.skipped_items.append(row_result["message"])
-                elif row_result["status"] == "error":
+                elif row_status == "error":
                     result.error_count += 1
                     result.errors.append(row_result["message"])
 
                     # 如果策略是ERROR，立即抛出异常
-                    if strategy == DuplicateHandlingStrategy.ERROR:
+                    if is_error:
                         raise Exception(f"数据导入失败: {row_result['message']}")
 
             except Exception as e:
@@ -1520,7 +1862,7 @@ def import_table_data_atomic(table_name: str, df: pd.DataFrame, db: Session, pro
                 logger.error(f"处理第{index+2}行时发生错误: {e}")
 
                 # 如果是ERROR策略，停止处理并抛出异常
-                if strategy == DuplicateHandlingStrategy.ERROR:
+                if is_error:
                     result.errors.append(f"第{index+2}行导入失败，所有更改已回滚: {str(e)}")
                     result.error_count = len(df)
                     result.success_count = 0
@@ -1546,9 +1888,10 @@ def import_table_data_atomic(table_name: str, df: pd.DataFrame, db: Session, pro
     return result
 
 
-def import_table_data_batch(table_name: str, df: pd.DataFrame, db: Session, batch_size: int = 10) -> ImportResult:
+def import_table_data_batch(table_name: str, df: pd.DataFrame, db: Session, batch_size: int = IMPORT_BATCH_SIZE) -> ImportResult:
     """
-    批量数据导入 - 分批提交模式，避免大批量INSERT问题
+    批量数据导入 - 分批写入、整体一次提交
+    🚀 性能优化：每批使用 SAVEPOINT 隔离，只在最后提交一次事务
     """
     result = ImportResult()
 
@@ -1556,60 +1899,27 @@ def import_table_data_batch(table_name: str, df: pd.DataFrame, db: Session, batc
         # 获取重复数据处理策略
         strategy = DUPLICATE_STRATEGIES.get(table_name, DuplicateHandlingStrategy.ERROR)
 
+        # 同一条 INSERT 语句在所有批次间复用
+        insert_stmt = build_import_insert(db, IMPORT_MODELS[table_name], strategy)
+
         logger.info(f"开始数据导入 {table_name}，策略: {strategy.value}，批量大小: {batch_size}")
 
+        df = _normalize_dataframe(df, table_name)
+
         # 🔥 性能优化：预加载所有外键数据
-        foreign_key_maps = preload_foreign_key_data(table_name, db)
+        foreign_key_maps = preload_foreign_key_data(table_name, db, df)
         logger.info(f"外键数据预加载完成，包含 {sum(len(v) for v in foreign_key_maps.values())} 条记录")
 
-        # 分批处理数据
-        total_rows = len(df)
-        for batch_start in range(0, total_rows, batch_size):
-            batch_end = min(batch_start + batch_size, total_rows)
-            batch_df = df.iloc[batch_start:batch_end]
-
-            logger.info(f"处理批次 {batch_start//batch_size + 1}: 第{batch_start+1}-{batch_end}行")
-
-            try:
-                # 处理当前批次的所有行
-                batch_success = 0
-                for index, row in batch_df.iterrows():
-                    row_result = process_single_row_atomic_optimized(table_name, row, index + 2, db, strategy, foreign_key_maps)
-
-                    if row_result["status"] == "success":
-                        batch_success += 1
-                    elif row_result["status"] == "skipped":
-                        result.skipped_count += 1
-                        result.skipped_items.append(row_result["message"])
-                    elif row_result["status"] == "error":
-                        result.error_count += 1
-                        result.errors.append(row_result["message"])
-
-                        # 如果策略是ERROR，立即抛出异常回滚整个批次
-                        if strategy == DuplicateHandlingStrategy.ERROR:
-                            raise Exception(f"数据导入失败: {row_result['message']}")
-
-                # 提交当前批次
-                db.commit()
-                result.success_count += batch_success
-                logger.info(f"批次 {batch_start//batch_size + 1} 提交成功，处理 {batch_success} 行")
-
-            except Exception as e:
-                # 回滚当前批次
-                db.rollback()
-                logger.error(f"批次 {batch_start//batch_size + 1} 处理失败: {e}")
-
-                # 如果是ERROR策略，停止处理
-                if strategy == DuplicateHandlingStrategy.ERROR:
-                    result.errors.append(f"批次导入失败，所有更改已回滚: {str(e)}")
-                    result.error_count = len(df)
-                    result.success_count = 0
-                    result.skipped_count = 0
-                    raise e
+        if not import_frame_in_batches(table_name, df, db, strategy, foreign_key_maps, insert_stmt, result, batch_size):
+            db.rollback()
+            logger.warning(f"数据导入失败，所有更改已回滚: {result.errors[0]}")
+            return result
+        db.commit()
 
         logger.info(f"数据导入完成: 成功 {result.success_count} 行，跳过 {result.skipped_count} 行，错误 {result.error_count} 行")
 
     except Exception as e:
+        db.rollback()
         logger.error(f"数据导入失败: {e}")
         if not result.errors:
             result.errors.append(f"导入失败: {str(e)}")
@@ -1617,75 +1927,146 @@ def import_table_data_batch(table_name: str, df: pd.DataFrame, db: Session, batc
     return result
 
 
+def build_import_insert(db: Session, model, strategy: DuplicateHandlingStrategy):
+    """
+    构造批量导入使用的 INSERT 语句
+    🚀 性能优化：PostgreSQL 上 SKIP 策略附加 ON CONFLICT DO NOTHING，由唯一索引在数据库内完成冲突检查，
+    与其他请求并发写入的重复数据只会被跳过，不会导致整批回滚
+    """
+    if strategy is DuplicateHandlingStrategy.SKIP and db.get_bind().dialect.name == "postgresql":
+        return pg_insert(model).on_conflict_do_nothing().returning(model.id)
+    return insert(model)
 
 
-def preload_foreign_key_data(table_name: str, db: Session) -> Dict[str, Dict[str, int]]:
+def import_frame_in_batches(table_name: str, df: pd.DataFrame, db: Session, strategy: DuplicateHandlingStrategy,
+                            foreign_key_maps: Dict[str, Any], insert_stmt, result: ImportResult, batch_size: int) -> bool:
     """
-    预加载外键数据到内存映射表
-    🚀 性能优化：避免在循环中重复查询数据库
+    把已清洗的 DataFrame 分批写入数据库，结果累加到 result
+    每批在一个 SAVEPOINT 中执行，不提交外层事务，由调用方统一 commit
+    ERROR 策略遇到数据错误时返回 False，由调用方回滚整个导入；数据库异常仍然抛出
     """
-    foreign_key_maps = {}
+    is_error = strategy is DuplicateHandlingStrategy.ERROR
+    frame_rows = len(df)
+
+    df = _resolve_foreign_keys(df, table_name, foreign_key_maps)
+
+    # 🚀 性能优化：产品数据先做向量化校验，批次循环中只写入校验通过的行
+    prevalidated = table_name == "products"
+    if prevalidated:
+        df, rejected = _validate_products(df, foreign_key_maps, strategy)
+        for row_number, status, message in rejected.itertuples(index=False, name=None):
+            if status == "skipped":
+                result.skipped_count += 1
+                result.skipped_items.append(message)
+            else:
+                result.error_count += 1
+                result.errors.append(message)
 
-    try:
-        if table_name == "products":
-            # 预加载产品表需要的所有外键数据
-            logger.info("正在预加载产品外键数据...")
-
-            # 加载国家数据
-            countries_map = {}
-            for country in db.query(Country).all():
-                countries_map[country.name] = country.id
-            foreign_key_maps["countries"] = countries_map
-            logger.info(f"预加载国家数据: {len(countries_map)} 条")
-
-            # 加载类别数据
-            categories_map = {}
-            for category in db.query(Category).all():
-                categories_map[category.name] = category.id
-            foreign_key_maps["categories"] = categories_map
-            logger.info(f"预加载类别数据: {len(categories_map)} 条")
-
-            # 加载供应商数据
-            suppliers_map = {}
-            for supplier in db.query(Supplier).all():
-                suppliers_map[supplier.name] = supplier.id
-            foreign_key_maps["suppliers"] = suppliers_map
-            logger.info(f"预加载供应商数据: {len(suppliers_map)} 条")
-
-            # 加载港口数据
-            ports_map = {}
-            for port in db.query(Port).all():
-                ports_map[port.name] = port.id
-            foreign_key_maps["ports"] = ports_map
-            logger.info(f"预加载港口数据: {len(ports_map)} 条")
+        # 如果策略是ERROR，有任何错误都不导入，直接返回，不执行任何 INSERT
+        if is_error and result.errors:
+            result.error_count = frame_rows
+            result.success_count = 0
+            result.skipped_count = 0
+            return False
 
-        elif table_name == "suppliers":
-            # 供应商表只需要国家数据
-            countries_map = {}
-            for country in db.query(Country).all():
-                countries_map[country.name] = country.id
-            foreign_key_maps["countries"] = countries_map
+        remember_keys(foreign_key_maps, "product_name_en", df["product_name_en"])
 
-        elif table_name == "ports":
-            # 港口表只需要国家数据
-            countries_map = {}
-            for country in db.query(Country).all():
-                countries_map[country.name] = country.id
-            foreign_key_maps["countries"] = countries_map
+    # 分批处理数据
+    total_rows = len(df)
+    row_iter = _iter_row_dicts(df)
+    for batch_start in range(0, total_rows, batch_size):
+        batch_end = min(batch_start + batch_size, total_rows)
+        batch_rows = list(islice(row_iter, batch_end - batch_start))
 
-        elif table_name == "companies":
-            # 公司表只需要国家数据
-            countries_map = {}
-            for country in db.query(Country).all():
-                countries_map[country.name] = country.id
-            foreign_key_maps["countries"] = countries_map
+        logger.info(f"处理批次 {batch_start//batch_size + 1}: 第{batch_start+1}-{batch_end}行")
 
-        elif table_name == "ships":
-            # 船舶表只需要公司数据
-            companies_map = {}
-            for company in db.query(Company).all():
-                companies_map[company.name] = company.id
-            foreign_key_maps["companies"] = companies_map
+        # 🚀 性能优化：批次之间用 SAVEPOINT 代替 COMMIT，释放保存点不需要刷写 WAL
+        savepoint = db.begin_nested()
+        try:
+            # 处理当前批次的所有行，成功的行先收集起来
+            batch_values = []
+            for index, row in batch_rows:
+                if prevalidated:
+                    batch_values.append(row)
+                    continue
+
+                row_result = process_single_row_atomic_optimized(table_name, row, index + 2, db, strategy, foreign_key_maps)
+
+                row_status = row_result["status"]
+                if row_status == "success":
+                    batch_values.append(row_result["values"])
+                elif row_status == "skipped":
+                    result.skipped_count += 1
+                    result.skipped_items.append(row_result["message"])
+                elif row_status == "error":
+                    result.error_count += 1
+                    result.errors.append(row_result["message"])
+
+                    # 如果策略是ERROR，回滚当前批次并停止处理
+                    if is_error:
+                        savepoint.rollback()
+                        result.errors.append(f"批次导入失败，所有更改已回滚: 数据导入失败: {row_result['message']}")
+                        result.error_count = frame_rows
+                        result.success_count = 0
+                        result.skipped_count = 0
+                        return False
+
+            # 🚀 性能优化：整批一次性 INSERT，代替逐行 db.add
+            inserted = len(batch_values)
+            if batch_values:
+                inserted_rows = db.execute(insert_stmt, batch_values)
+                if insert_stmt.returning_column_descriptions:
+                    # ON CONFLICT DO NOTHING 时只有真正写入的行会返回
+                    inserted = len(inserted_rows.all())
+
+            # 释放当前批次的保存点
+            savepoint.commit()
+            result.success_count += inserted
+            if inserted < len(batch_values):
+                result.skipped_count += len(batch_values) - inserted
+                result.skipped_items.append(f"{len(batch_values) - inserted} 行与数据库中已有数据冲突，已跳过")
+            logger.info(f"批次 {batch_start//batch_size + 1} 写入成功，处理 {inserted} 行")
+
+        except Exception as e:
+            # 回滚到当前批次的保存点
+            savepoint.rollback()
+            logger.error(f"批次 {batch_start//batch_size + 1} 处理失败: {e}")
+
+            # 如果是ERROR策略，停止处理
+            if is_error:
+                result.errors.append(f"批次导入失败，所有更改已回滚: {str(e)}")
+                result.error_count = frame_rows
+                result.success_count = 0
+                result.skipped_count = 0
+                raise e
+
+    return True
+
+
+def preload_foreign_key_data(table_name: str, db: Session, df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """
+    预加载外键数据到内存映射表
+    🚀 性能优化：避免在循环中重复查询数据库；只查询名称和ID两列，不构造完整ORM对象
+    传入待导入的 df 时，唯一键只按文件中出现的值分块 IN 查询，不加载整张目标表
+    """
+    foreign_key_maps = {}
+
+    try:
+        # 🚀 性能优化：外键映射跨请求缓存，外键表没有变化时不再重新加载
+        for key, names_map in load_foreign_key_maps(table_name, db).items():
+            foreign_key_maps[key] = names_map
+            logger.info(f"预加载外键数据 {key}: {len(names_map)} 条")
+
+        # 🚀 性能优化：预加载目标表已有的唯一键，重复检查改为集合查找
+        # 传入 df 时只按文件中出现的值分块 IN 查询，否则加载整列
+        unique_keys = {}
+        for column_name, column in UNIQUE_KEY_COLUMNS.get(table_name, {}).items():
+            if df is not None and column_name in df.columns:
+                unique_keys[column_name] = probe_existing_values(db, column, df[column_name])
+            else:
+                unique_keys[column_name] = {value for (value,) in db.query(column) if value}
+        if unique_keys:
+            foreign_key_maps["unique_keys"] = unique_keys
 
         logger.info(f"外键数据预加载完成: {table_name}")
 
@@ -1696,110 +2077,173 @@ def preload_foreign_key_data(table_name: str, db: Session) -> Dict[str, Dict[str
 
     return foreign_key_maps
 
-def process_single_row_atomic_optimized(table_name: str, row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Dict[str, Dict[str, int]]) -> Dict[str, str]:
+def load_foreign_key_maps(table_name: str, db: Session) -> Dict[str, Dict[str, int]]:
+    """
+    返回导入 table_name 需要的外键映射，结果按外键表版本缓存
+    版本由各外键表的行数和最大 updated_at 组成，外键表有增删改时自动失效
+    返回的映射在请求间共享，调用方只能读取
+    """
+    fk_tables = FOREIGN_KEY_TABLES.get(table_name)
+    if not fk_tables:
+        return {}
+
+    version_stmt = union_all(*[
+        select(literal(key).label("source"), func.count(model.id), func.max(model.updated_at))
+        for key, model in fk_tables.items()
+    ])
+    version = tuple(sorted(tuple(row) for row in db.execute(version_stmt)))
+
+    cached = _FOREIGN_KEY_MAP_CACHE.get(table_name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    # 所有外键表用一次 UNION ALL 查询取回，按来源表分桶
+    stmt = union_all(*[
+        select(literal(key).label("source"), model.name, model.id)
+        for key, model in fk_tables.items()
+    ])
+    maps = {key: {} for key in fk_tables}
+    for source, name, id_ in db.execute(stmt):
+        maps[source][name] = id_
+
+    _FOREIGN_KEY_MAP_CACHE[table_name] = (version, maps)
+    return maps
+
+def invalidate_foreign_key_cache():
+    """外键表数据导入后清空外键映射缓存"""
+    _FOREIGN_KEY_MAP_CACHE.clear()
+
+def available_names_hint(names_map: Dict[str, Any], limit: int = AVAILABLE_NAMES_HINT_LIMIT) -> str:
+    """从预加载的映射表中截取前若干个名称作为错误提示，避免错误信息过长"""
+    names = list(islice(names_map, limit))
+    if len(names_map) > limit:
+        return f"{names} 等共 {len(names_map)} 个"
+    return str(names)
+
+def probe_existing_values(db: Session, column, values, chunk_size: int = EXISTENCE_PROBE_CHUNK_SIZE) -> set:
+    """按块执行 IN 查询，返回 values 中在数据库里已存在的值"""
+    candidates = list({v for v in values if v is not None and not pd.isna(v)})
+    existing = set()
+    for start in range(0, len(candidates), chunk_size):
+        chunk = candidates[start:start + chunk_size]
+        existing.update(v for (v,) in db.query(column).filter(column.in_(chunk)))
+    return existing
+
+def key_exists(foreign_key_maps: Dict[str, Any], column, value: Any, db: Session) -> bool:
+    """检查唯一键是否已存在，优先使用预加载的集合，未预加载时回退到数据库查询"""
+    existing = foreign_key_maps.get("unique_keys", {}).get(column.key)
+    if existing is None:
+        return db.query(column).filter(column == value).first() is not None
+    return value in existing
+
+def remember_key(foreign_key_maps: Dict[str, Any], column_name: str, value: Any):
+    """记录本次导入新增的唯一键，使后续行（包括同一批次内）也能检测到重复"""
+    existing = foreign_key_maps.get("unique_keys", {}).get(column_name)
+    if existing is not None and value:
+        existing.add(value)
+
+def remember_keys(foreign_key_maps: Dict[str, Any], column_name: str, values: Iterable[Any]):
+    """批量记录新增的唯一键"""
+    existing = foreign_key_maps.get("unique_keys", {}).get(column_name)
+    if existing is not None:
+        existing.update(values)
+
+def process_single_row_atomic_optimized(table_name: str, row: Dict[str, Any], row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
     """处理单行数据的原子性操作 - 优化版本，使用预加载的外键数据"""
 
-    try:
-        if table_name == "countries":
-            return process_country_row(row, row_number, db, strategy)
-        elif table_name == "categories":
-            return process_category_row(row, row_number, db, strategy)
-        elif table_name == "ports":
-            return process_port_row_optimized(row, row_number, db, strategy, foreign_key_maps)
-        elif table_name == "companies":
-            return process_company_row_optimized(row, row_number, db, strategy, foreign_key_maps)
-        elif table_name == "suppliers":
-            return process_supplier_row_optimized(row, row_number, db, strategy, foreign_key_maps)
-        elif table_name == "ships":
-            return process_ship_row_optimized(row, row_number, db, strategy, foreign_key_maps)
-        elif table_name == "products":
-            return process_product_row_optimized(row, row_number, db, strategy, foreign_key_maps)
-        else:
-            return {"status": "error", "message": f"不支持的表类型: {table_name}"}
+    process_row = ROW_PROCESSORS_OPT.get(table_name)
+    if process_row is None:
+        return {"status": "error", "message": f"不支持的表类型: {table_name}"}
 
+    try:
+        return process_row(row, row_number, db, strategy, foreign_key_maps)
     except Exception as e:
         return {"status": "error", "message": f"第{row_number}行: 处理失败 - {str(e)}"}
 
-def process_single_row_atomic(table_name: str, row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, str]:
+def process_single_row_atomic(table_name: str, row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, Any]:
     """处理单行数据的原子性操作"""
 
     try:
         if table_name == "countries":
-            return process_country_row(row, row_number, db, strategy)
+            result = process_country_row(row, row_number, db, strategy)
         elif table_name == "categories":
-            return process_category_row(row, row_number, db, strategy)
+            result = process_category_row(row, row_number, db, strategy)
         elif table_name == "ports":
-            return process_port_row(row, row_number, db, strategy)
+            result = process_port_row(row, row_number, db, strategy)
         elif table_name == "companies":
-            return process_company_row(row, row_number, db, strategy)
+            result = process_company_row(row, row_number, db, strategy)
         elif table_name == "suppliers":
-            return process_supplier_row(row, row_number, db, strategy)
+            result = process_supplier_row(row, row_number, db, strategy)
         elif table_name == "ships":
-            return process_ship_row(row, row_number, db, strategy)
+            result = process_ship_row(row, row_number, db, strategy)
         elif table_name == "products":
-            return process_product_row(row, row_number, db, strategy)
+            result = process_product_row(row, row_number, db, strategy)
         else:
             return {"status": "error", "message": f"不支持的表类型: {table_name}"}
 
+        # 行处理函数只返回字段值，由这里创建记录
+        if result["status"] == "success":
+            db.add(IMPORT_MODELS[table_name](**result["values"]))
+        return result
+
     except Exception as e:
         return {"status": "error", "message": f"第{row_number}行处理失败: {str(e)}"}
 
-def process_country_row(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, str]:
-    """处理国家数据行"""
+def process_country_row(row: Dict[str, Any], row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """处理国家数据行，传入 foreign_key_maps 时使用预加载的唯一键集合检查重复"""
+    foreign_key_maps = foreign_key_maps or {}
     # 检查是否已存在
-    existing = db.query(Country).filter(
-        (Country.name == row["name"]) | (Country.code == row["code"])
-    ).first()
+    existing = (key_exists(foreign_key_maps, Country.name, row["name"], db)
+                or key_exists(foreign_key_maps, Country.code, row["code"], db))
 
     if existing:
-        if strategy == DuplicateHandlingStrategy.SKIP:
+        if strategy is DuplicateHandlingStrategy.SKIP:
             return {"status": "skipped", "message": f"第{row_number}行: 国家 '{row['name']}' 或代码 '{row['code']}' 已存在，已跳过"}
         else:
             return {"status": "error", "message": f"第{row_number}行: 国家 '{row['name']}' 或代码 '{row['code']}' 已存在"}
 
     # 创建新记录
-    country = Country(
+    values = dict(
         name=row["name"],
         code=row["code"],
-        status=str(row.get("status", "true")).lower() == "true"
+        status=parse_status(row.get("status", True))
     )
-    db.add(country)
-    return {"status": "success", "message": f"第{row_number}行: 国家 '{row['name']}' 创建成功"}
+    remember_key(foreign_key_maps, "name", row["name"])
+    remember_key(foreign_key_maps, "code", row["code"])
+    return {"status": "success", "message": f"第{row_number}行: 国家 '{row['name']}' 创建成功", "values": values}
 
-def process_category_row(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, str]:
-    """处理类别数据行"""
-    existing = db.query(Category).filter(Category.name == row["name"]).first()
+def process_category_row(row: Dict[str, Any], row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """处理类别数据行，传入 foreign_key_maps 时使用预加载的唯一键集合检查重复"""
+    foreign_key_maps = foreign_key_maps or {}
+    existing = key_exists(foreign_key_maps, Category.name, row["name"], db)
 
     if existing:
-        if strategy == DuplicateHandlingStrategy.SKIP:
+        if strategy is DuplicateHandlingStrategy.SKIP:
             return {"status": "skipped", "message": f"第{row_number}行: 类别 '{row['name']}' 已存在，已跳过"}
         else:
             return {"status": "error", "message": f"第{row_number}行: 类别 '{row['name']}' 已存在"}
 
-    category = Category(
+    values = dict(
         name=row["name"],
-        code=row.get("code") if not pd.isna(row.get("code")) else None,
-        description=row.get("description") if not pd.isna(row.get("description")) else None,
-        status=str(row.get("status", "true")).lower() == "true"
+        code=row.get("code"),
+        description=row.get("description"),
+        status=parse_status(row.get("status", True))
     )
-    db.add(category)
-    return {"status": "success", "message": f"第{row_number}行: 类别 '{row['name']}' 创建成功"}
+    remember_key(foreign_key_maps, "name", row["name"])
+    return {"status": "success", "message": f"第{row_number}行: 类别 '{row['name']}' 创建成功", "values": values}
 
-def process_port_row(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, str]:
+def process_port_row(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, Any]:
     """处理港口数据行"""
     # 查找国家
     country_name = str(row["country_name"]).strip()
     country = db.query(Country).filter(Country.name == country_name).first()
     if not country:
-        # 获取调试信息
-        all_countries = db.query(Country.name).all()
-        available_countries = [c[0] for c in all_countries]
-        return {"status": "error", "message": f"第{row_number}行: 国家 '{country_name}' 不存在。可用国家: {available_countries}"}
+        return {"status": "error", "message": f"第{row_number}行: 国家 '{country_name}' 不存在，请检查国家名称拼写，或先导入国家数据"}
 
     # 检查港口名称是否已存在
     existing = db.query(Port).filter(Port.name == row["name"]).first()
     if existing:
-        if strategy == DuplicateHandlingStrategy.SKIP:
+        if strategy is DuplicateHandlingStrategy.SKIP:
             return {"status": "skipped", "message": f"第{row_number}行: 港口 '{row['name']}' 已存在，已跳过"}
         else:
             return {"status": "error", "message": f"第{row_number}行: 港口 '{row['name']}' 已存在"}
@@ -1811,102 +2255,83 @@ def process_port_row(row: pd.Series, row_number: int, db: Session, strategy: Dup
         # 检查code是否已存在
         existing_code = db.query(Port).filter(Port.code == port_code).first()
         if existing_code:
-            if strategy == DuplicateHandlingStrategy.SKIP:
+            if strategy is DuplicateHandlingStrategy.SKIP:
                 return {"status": "skipped", "message": f"第{row_number}行: 港口代码 '{port_code}' 已存在，已跳过"}
             else:
                 return {"status": "error", "message": f"第{row_number}行: 港口代码 '{port_code}' 已存在"}
     else:
         port_code = None  # 确保空值为None
 
-    port = Port(
+    values = dict(
         name=row["name"],
         code=port_code,
         country_id=country.id,
         location=row.get("location"),
-        status=str(row.get("status", "true")).lower() == "true"
+        status=parse_status(row.get("status", True))
     )
-    db.add(port)
-    return {"status": "success", "message": f"第{row_number}行: 港口 '{row['name']}' 创建成功"}
+    return {"status": "success", "message": f"第{row_number}行: 港口 '{row['name']}' 创建成功", "values": values}
 
-def process_company_row(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, str]:
+def process_company_row(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, Any]:
     """处理公司数据行"""
     # 查找国家
     country_name = str(row["country_name"]).strip()
     country = db.query(Country).filter(Country.name == country_name).first()
     if not country:
-        # 获取调试信息
-        all_countries = db.query(Country.name).all()
-        available_countries = [c[0] for c in all_countries]
-        return {"status": "error", "message": f"第{row_number}行: 国家 '{country_name}' 不存在。可用国家: {available_countries}"}
+        return {"status": "error", "message": f"第{row_number}行: 国家 '{country_name}' 不存在，请检查国家名称拼写，或先导入国家数据"}
 
     existing = db.query(Company).filter(Company.name == row["name"]).first()
     if existing:
-        if strategy == DuplicateHandlingStrategy.SKIP:
+        if strategy is DuplicateHandlingStrategy.SKIP:
             return {"status": "skipped", "message": f"第{row_number}行: 公司 '{row['name']}' 已存在，已跳过"}
         else:
             return {"status": "error", "message": f"第{row_number}行: 公司 '{row['name']}' 已存在"}
 
     # 安全处理所有字符串字段
-    def safe_string_field(value):
-        if value is None or pd.isna(value):
-            return None
-        return str(value).strip() if str(value).strip() else None
-
     contact_value = safe_string_field(row.get("contact"))
     email_value = safe_string_field(row.get("email"))
     phone_value = safe_string_field(row.get("phone"))
 
-    company = Company(
+    values = dict(
         name=row["name"],
         country_id=country.id,
         contact=contact_value,
         email=email_value,
         phone=phone_value,
-        status=str(row.get("status", "true")).lower() == "true"
+        status=parse_status(row.get("status", True))
     )
-    db.add(company)
-    return {"status": "success", "message": f"第{row_number}行: 公司 '{row['name']}' 创建成功"}
+    return {"status": "success", "message": f"第{row_number}行: 公司 '{row['name']}' 创建成功", "values": values}
 
-def process_supplier_row(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, str]:
+def process_supplier_row(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, Any]:
     """处理供应商数据行"""
     # 查找国家
     country_name = str(row["country_name"]).strip()  # 去除空格
     country = db.query(Country).filter(Country.name == country_name).first()
     if not country:
-        # 调试信息：显示所有可用的国家
-        all_countries = db.query(Country.name).all()
-        available_countries = [c[0] for c in all_countries]
-        return {"status": "error", "message": f"第{row_number}行: 国家 '{country_name}' 不存在。可用国家: {available_countries}"}
+        return {"status": "error", "message": f"第{row_number}行: 国家 '{country_name}' 不存在，请检查国家名称拼写，或先导入国家数据"}
 
     existing = db.query(Supplier).filter(Supplier.name == row["name"]).first()
     if existing:
-        if strategy == DuplicateHandlingStrategy.SKIP:
+        if strategy is DuplicateHandlingStrategy.SKIP:
             return {"status": "skipped", "message": f"第{row_number}行: 供应商 '{row['name']}' 已存在，已跳过"}
         else:
             return {"status": "error", "message": f"第{row_number}行: 供应商 '{row['name']}' 已存在"}
 
     # 安全处理所有字符串字段
-    def safe_string_field(value):
-        if value is None or pd.isna(value):
-            return None
-        return str(value).strip() if str(value).strip() else None
-
     contact_value = safe_string_field(row.get("contact"))
     email_value = safe_string_field(row.get("email"))
     phone_value = safe_string_field(row.get("phone"))
 
-    supplier = Supplier(
+    values = dict(
         name=row["name"],
         country_id=country.id,
         contact=contact_value,
         email=email_value,
         phone=phone_value,
-        status=str(row.get("status", "true")).lower() == "true"
+        status=parse_status(row.get("status", True))
     )
-    db.add(supplier)
-    return {"status": "success", "message": f"第{row_number}行: 供应商 '{row['name']}' 创建成功"}
+    return {"status": "success", "message": f"第{row_number}行: 供应商 '{row['name']}' 创建成功", "values": values}
 
-def process_ship_row(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, str]:
+def process_ship_row(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, Any]:
     """处理船舶数据行"""
     # 查找公司
     company = db.query(Company).filter(Company.name == row["company_name"]).first()
@@ -1915,43 +2340,72 @@ def process_ship_row(row: pd.Series, row_number: int, db: Session, strategy: Dup
 
     existing = db.query(Ship).filter(Ship.name == row["name"]).first()
     if existing:
-        if strategy == DuplicateHandlingStrategy.SKIP:
+        if strategy is DuplicateHandlingStrategy.SKIP:
             return {"status": "skipped", "message": f"第{row_number}行: 船舶 '{row['name']}' 已存在，已跳过"}
         else:
             return {"status": "error", "message": f"第{row_number}行: 船舶 '{row['name']}' 已存在"}
 
-    ship = Ship(
+    values = dict(
         name=row["name"],
         company_id=company.id,
         ship_type=row.get("ship_type"),
         capacity=int(row["capacity"]) if row.get("capacity") else None,
-        status=str(row.get("status", "true")).lower() == "true"
+        status=parse_status(row.get("status", True))
     )
-    db.add(ship)
-    return {"status": "success", "message": f"第{row_number}行: 船舶 '{row['name']}' 创建成功"}
+    return {"status": "success", "message": f"第{row_number}行: 船舶 '{row['name']}' 创建成功", "values": values}
 
-def process_product_row(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, str]:
+def process_product_row(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy) -> Dict[str, Any]:
     """处理产品数据行 - 完整版本"""
     try:
+        # 先做只依赖本行数据的检查（价格、日期），再做数据库查询，格式错误的行不再产生查询
+        price_value = None
+        if row.get("price") and not pd.isna(row["price"]):
+            try:
+                price_value = float(row["price"])
+                if price_value < 0:
+                    return {"status": "error", "message": f"第{row_number}行: price (价格) 不能为负数"}
+            except (ValueError, TypeError):
+                return {"status": "error", "message": f"第{row_number}行: price (价格) 格式错误，必须为数字"}
+
+        # 处理日期字段
+        effective_from_value = None
+        effective_to_value = None
+
+        if row.get("effective_from") and not pd.isna(row["effective_from"]):
+            try:
+                effective_from_value = pd.to_datetime(row["effective_from"]).to_pydatetime()
+            except Exception as e:
+                return {"status": "error", "message": f"第{row_number}行: 起始日期格式错误 - {str(e)}"}
+
+        if row.get("effective_to") and not pd.isna(row["effective_to"]):
+            try:
+                effective_to_value = pd.to_datetime(row["effective_to"]).to_pydatetime()
+            except Exception as e:
+                return {"status": "error", "message": f"第{row_number}行: 结束日期格式错误 - {str(e)}"}
+        elif effective_from_value:
+            # 如果没有结束日期，自动设置为起始日期+3个月
+            effective_to_value = effective_from_value + timedelta(days=90)
+
+        # 验证日期范围
+        if effective_from_value and effective_to_value:
+            if effective_to_value < effective_from_value:
+                return {"status": "error", "message": f"第{row_number}行: 结束日期不能早于起始日期"}
+
         # 查找必要的外键
         country_name = str(row["country_name"]).strip()
         country = db.query(Country).filter(Country.name == country_name).first()
         if not country:
-            all_countries = db.query(Country.name).all()
-            available_countries = [c[0] for c in all_countries]
-            return {"status": "error", "message": f"第{row_number}行: 国家 '{country_name}' 不存在。可用国家: {available_countries}"}
+            return {"status": "error", "message": f"第{row_number}行: 国家 '{country_name}' 不存在，请检查国家名称拼写，或先导入国家数据"}
 
         category_name = str(row["category_name"]).strip()
         category = db.query(Category).filter(Category.name == category_name).first()
         if not category:
-            all_categories = db.query(Category.name).all()
-            available_categories = [c[0] for c in all_categories]
-            return {"status": "error", "message": f"第{row_number}行: 类别 '{category_name}' 不存在。可用类别: {available_categories}"}
+            return {"status": "error", "message": f"第{row_number}行: 类别 '{category_name}' 不存在，请检查类别名称拼写，或先导入类别数据"}
 
         # 检查产品是否已存在
         existing = db.query(Product).filter(Product.product_name_en == row["product_name_en"]).first()
         if existing:
-            if strategy == DuplicateHandlingStrategy.SKIP:
+            if strategy is DuplicateHandlingStrategy.SKIP:
                 return {"status": "skipped", "message": f"第{row_number}行: 产品 '{row['product_name_en']}' 已存在，已跳过"}
             else:
                 return {"status": "error", "message": f"第{row_number}行: 产品 '{row['product_name_en']}' 已存在"}
@@ -1976,11 +2430,6 @@ def process_product_row(row: pd.Series, row_number: int, db: Session, strategy:
                 return {"status": "error", "message": f"第{row_number}行: 港口 '{port_name}' 不存在"}
 
         # 安全处理字符串字段
-        def safe_string_field(value):
-            if value is None or pd.isna(value):
-                return None
-            return str(value).strip() if str(value).strip() else None
-
         code_value = safe_string_field(row.get("code"))
         unit_value = safe_string_field(row.get("unit"))
         currency_value = safe_string_field(row.get("currency"))
@@ -1994,42 +2443,8 @@ def process_product_row(row: pd.Series, row_number: int, db: Session, strategy:
             # pack_size 现在支持字符串格式，直接使用字符串值
             pack_size_value = str(row["pack_size"]).strip()
 
-        price_value = None
-        if row.get("price") and not pd.isna(row["price"]):
-            try:
-                price_value = float(row["price"])
-                if price_value < 0:
-                    return {"status": "error", "message": f"第{row_number}行: price (价格) 不能为负数"}
-            except (ValueError, TypeError):
-                return {"status": "error", "message": f"第{row_number}行: price (价格) 格式错误，必须为数字"}
-
-        # 处理日期字段
-        from datetime import datetime, timedelta
-        effective_from_value = None
-        effective_to_value = None
-
-        if row.get("effective_from") and not pd.isna(row["effective_from"]):
-            try:
-                effective_from_value = pd.to_datetime(row["effective_from"]).to_pydatetime()
-            except Exception as e:
-                return {"status": "error", "message": f"第{row_number}行: 起始日期格式错误 - {str(e)}"}
-
-        if row.get("effective_to") and not pd.isna(row["effective_to"]):
-            try:
-                effective_to_value = pd.to_datetime(row["effective_to"]).to_pydatetime()
-            except Exception as e:
-                return {"status": "error", "message": f"第{row_number}行: 结束日期格式错误 - {str(e)}"}
-        elif effective_from_value:
-            # 如果没有结束日期，自动设置为起始日期+3个月
-            effective_to_value = effective_from_value + timedelta(days=90)
-
-        # 验证日期范围
-        if effective_from_value and effective_to_value:
-            if effective_to_value < effective_from_value:
-                return {"status": "error", "message": f"第{row_number}行: 结束日期不能早于起始日期"}
-
         # 创建产品
-        product = Product(
+        values = dict(
             product_name_en=row["product_name_en"],
             product_name_jp=row.get("product_name_jp"),
             code=code_value,
@@ -2046,67 +2461,65 @@ def process_product_row(row: pd.Series, row_number: int, db: Session, strategy:
             country_of_origin=country_of_origin_value,
             effective_from=effective_from_value,
             effective_to=effective_to_value,
-            status=str(row.get("status", "true")).lower() == "true"
+            status=parse_status(row.get("status", True))
         )
-        db.add(product)
-        return {"status": "success", "message": f"第{row_number}行: 产品 '{row['product_name_en']}' 创建成功"}
+        return {"status": "success", "message": f"第{row_number}行: 产品 '{row['product_name_en']}' 创建成功", "values": values}
 
     except Exception as e:
         return {"status": "error", "message": f"第{row_number}行: 处理失败 - {str(e)}"}
 
-def process_product_row_optimized(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Dict[str, Dict[str, int]]) -> Dict[str, str]:
+def process_product_row_optimized(row: Dict[str, Any], row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
     """处理产品数据行 - 优化版本，使用预加载的外键数据"""
 
     try:
-        # 🔥 性能优化：使用预加载的映射表，避免数据库查询
+        # 🔥 性能优化：外键ID已由 _resolve_foreign_keys 按列解析，避免数据库查询
 
-        # 查找国家ID（从内存映射表）
-        country_id = foreign_key_maps.get("countries", {}).get(row["country_name"])
+        # 查找国家ID（已解析）
+        country_id = row.get("country_id")
         if not country_id:
-            return {"status": "error", "message": f"第{row_number}行: 国家 '{row['country_name']}' 不存在"}
+            return {"status": "error", "message": f"第{row_number}行: 国家 '{row['country_name']}' 不存在。可用国家: {available_names_hint(foreign_key_maps.get('countries', {}))}"}
 
-        # 查找类别ID（从内存映射表）
-        category_id = foreign_key_maps.get("categories", {}).get(row["category_name"])
+        # 查找类别ID（已解析）
+        category_id = row.get("category_id")
         if not category_id:
-            return {"status": "error", "message": f"第{row_number}行: 类别 '{row['category_name']}' 不存在"}
+            return {"status": "error", "message": f"第{row_number}行: 类别 '{row['category_name']}' 不存在。可用类别: {available_names_hint(foreign_key_maps.get('categories', {}))}"}
 
-        # 查找供应商ID（从内存映射表，可选）
+        # 查找供应商ID（已解析，可选）
         supplier_id = None
-        if row.get("supplier_name") and not pd.isna(row["supplier_name"]):
-            supplier_id = foreign_key_maps.get("suppliers", {}).get(row["supplier_name"])
+        supplier_name = row.get("supplier_name")
+        if supplier_name:
+            supplier_id = row.get("supplier_id")
             if not supplier_id:
-                return {"status": "error", "message": f"第{row_number}行: 供应商 '{row['supplier_name']}' 不存在"}
+                return {"status": "error", "message": f"第{row_number}行: 供应商 '{supplier_name}' 不存在"}
 
-        # 查找港口ID（从内存映射表，可选）
+        # 查找港口ID（已解析，可选）
         port_id = None
-        if row.get("port_name") and not pd.isna(row["port_name"]):
-            port_id = foreign_key_maps.get("ports", {}).get(row["port_name"])
+        port_name = row.get("port_name")
+        if port_name:
+            port_id = row.get("port_id")
             if not port_id:
-                return {"status": "error", "message": f"第{row_number}行: 港口 '{row['port_name']}' 不存在"}
+                return {"status": "error", "message": f"第{row_number}行: 港口 '{port_name}' 不存在"}
 
         # 检查产品是否已存在
-        existing = db.query(Product).filter(Product.product_name_en == row["product_name_en"]).first()
-        if existing:
-            if strategy == DuplicateHandlingStrategy.SKIP:
-                return {"status": "skipped", "message": f"第{row_number}行: 产品 '{row['product_name_en']}' 已存在，已跳过"}
+        product_name_en = row["product_name_en"]
+        if key_exists(foreign_key_maps, Product.product_name_en, product_name_en, db):
+            if strategy is DuplicateHandlingStrategy.SKIP:
+                return {"status": "skipped", "message": f"第{row_number}行: 产品 '{product_name_en}' 已存在，已跳过"}
             else:
-                return {"status": "error", "message": f"第{row_number}行: 产品 '{row['product_name_en']}' 已存在"}
+                return {"status": "error", "message": f"第{row_number}行: 产品 '{product_name_en}' 已存在"}
 
-        # 处理其他字段
+        # 字符串字段已在 _normalize_dataframe 中统一清洗
         code_value = row.get("code")
-        if code_value and not pd.isna(code_value):
-            code_value = str(code_value).strip()
-        else:
-            code_value = None
-
         unit_value = row.get("unit")
-        if unit_value and not pd.isna(unit_value):
-            unit_value = str(unit_value).strip()
-        else:
-            unit_value = None
+        currency_value = row.get("currency")
+        unit_size_value = row.get("unit_size")
+        pack_size_value = row.get("pack_size")
+        brand_value = row.get("brand")
+        country_of_origin_value = row.get("country_of_origin")
 
+        # 价格为空或为 0 时不写入价格，与 _validate_products 一致
         price_value = None
-        if row.get("price") and not pd.isna(row["price"]):
+        if row.get("price"):
             try:
                 price_value = float(row["price"])
                 if price_value < 0:
@@ -2114,59 +2527,36 @@ def process_product_row_optimized(row: pd.Series, row_number: int, db: Session,
             except (ValueError, TypeError):
                 return {"status": "error", "message": f"第{row_number}行: price (价格) 格式错误，必须为数字"}
 
-        currency_value = row.get("currency")
-        if currency_value and not pd.isna(currency_value):
-            currency_value = str(currency_value).strip()
-        else:
-            currency_value = None
-
-        unit_size_value = row.get("unit_size")
-        if unit_size_value and not pd.isna(unit_size_value):
-            unit_size_value = str(unit_size_value).strip()
-        else:
-            unit_size_value = None
-
-        # pack_size 现在支持字符串格式
-        pack_size_value = None
-        if row.get("pack_size") and not pd.isna(row["pack_size"]):
-            pack_size_value = str(row["pack_size"]).strip()
-
-        brand_value = row.get("brand")
-        if brand_value and not pd.isna(brand_value):
-            brand_value = str(brand_value).strip()
-        else:
-            brand_value = None
-
-        country_of_origin_value = row.get("country_of_origin")
-        if country_of_origin_value and not pd.isna(country_of_origin_value):
-            country_of_origin_value = str(country_of_origin_value).strip()
-        else:
-            country_of_origin_value = None
-
-        # 处理日期字段
-        effective_from_value = None
-        if row.get("effective_from") and not pd.isna(row["effective_from"]):
+        # 处理日期字段（_normalize_dataframe 未能解析的字符串再按 %Y-%m-%d 尝试）
+        effective_from_value = row.get("effective_from") or None
+        if isinstance(effective_from_value, str):
             try:
-                if isinstance(row["effective_from"], str):
-                    effective_from_value = datetime.strptime(row["effective_from"], "%Y-%m-%d").date()
-                else:
-                    effective_from_value = row["effective_from"]
-            except (ValueError, TypeError):
+                effective_from_value = datetime.strptime(effective_from_value, "%Y-%m-%d").date()
+            except ValueError:
                 return {"status": "error", "message": f"第{row_number}行: effective_from 日期格式错误"}
 
-        effective_to_value = None
-        if row.get("effective_to") and not pd.isna(row["effective_to"]):
+        effective_to_value = row.get("effective_to") or None
+        if isinstance(effective_to_value, str):
             try:
-                if isinstance(row["effective_to"], str):
-                    effective_to_value = datetime.strptime(row["effective_to"], "%Y-%m-%d").date()
-                else:
-                    effective_to_value = row["effective_to"]
-            except (ValueError, TypeError):
+                effective_to_value = datetime.strptime(effective_to_value, "%Y-%m-%d").date()
+            except ValueError:
                 return {"status": "error", "message": f"第{row_number}行: effective_to 日期格式错误"}
 
+        # 同一列可能混有 pandas 解析出的 Timestamp 和回退解析出的 date，统一为 Timestamp 后再计算和比较
+        if effective_from_value is not None:
+            effective_from_value = pd.Timestamp(effective_from_value)
+        if effective_to_value is not None:
+            effective_to_value = pd.Timestamp(effective_to_value)
+        if effective_to_value is None and effective_from_value is not None:
+            # 如果没有结束日期，自动设置为起始日期+3个月
+            effective_to_value = effective_from_value + timedelta(days=DEFAULT_EFFECTIVE_DAYS)
+
+        if effective_from_value is not None and effective_to_value is not None and effective_to_value < effective_from_value:
+            return {"status": "error", "message": f"第{row_number}行: 结束日期不能早于起始日期"}
+
         # 创建产品
-        product = Product(
-            product_name_en=row["product_name_en"],
+        values = dict(
+            product_name_en=product_name_en,
             product_name_jp=row.get("product_name_jp"),
             code=code_value,
             country_id=country_id,
@@ -2182,124 +2572,369 @@ def process_product_row_optimized(row: pd.Series, row_number: int, db: Session,
             country_of_origin=country_of_origin_value,
             effective_from=effective_from_value,
             effective_to=effective_to_value,
-            status=str(row.get("status", "true")).lower() == "true"
+            status=row.get("status", True)
         )
-        db.add(product)
-        return {"status": "success", "message": f"第{row_number}行: 产品 '{row['product_name_en']}' 创建成功"}
+        remember_key(foreign_key_maps, "product_name_en", product_name_en)
+        return {"status": "success", "message": f"第{row_number}行: 产品 '{product_name_en}' 创建成功", "values": values}
 
     except Exception as e:
         return {"status": "error", "message": f"第{row_number}行: 处理失败 - {str(e)}"}
 
-def process_port_row_optimized(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Dict[str, Dict[str, int]]) -> Dict[str, str]:
+def process_port_row_optimized(row: Dict[str, Any], row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
     """处理港口数据行 - 优化版本"""
-    # 使用预加载的国家数据
-    country_id = foreign_key_maps.get("countries", {}).get(row["country_name"])
+    # 国家ID已由 _resolve_foreign_keys 按列解析
+    country_id = row.get("country_id")
     if not country_id:
-        return {"status": "error", "message": f"第{row_number}行: 国家 '{row['country_name']}' 不存在"}
+        return {"status": "error", "message": f"第{row_number}行: 国家 '{row['country_name']}' 不存在。可用国家: {available_names_hint(foreign_key_maps.get('countries', {}))}"}
 
-    existing = db.query(Port).filter(Port.name == row["name"]).first()
-    if existing:
-        if strategy == DuplicateHandlingStrategy.SKIP:
+    if key_exists(foreign_key_maps, Port.name, row["name"], db):
+        if strategy is DuplicateHandlingStrategy.SKIP:
             return {"status": "skipped", "message": f"第{row_number}行: 港口 '{row['name']}' 已存在，已跳过"}
         else:
             return {"status": "error", "message": f"第{row_number}行: 港口 '{row['name']}' 已存在"}
 
     port_code = row.get("code")
-    if port_code and str(port_code).strip():
-        port_code = str(port_code).strip()
-        existing_code = db.query(Port).filter(Port.code == port_code).first()
-        if existing_code:
-            if strategy == DuplicateHandlingStrategy.SKIP:
+    if port_code:
+        if key_exists(foreign_key_maps, Port.code, port_code, db):
+            if strategy is DuplicateHandlingStrategy.SKIP:
                 return {"status": "skipped", "message": f"第{row_number}行: 港口代码 '{port_code}' 已存在，已跳过"}
             else:
                 return {"status": "error", "message": f"第{row_number}行: 港口代码 '{port_code}' 已存在"}
-    else:
-        port_code = None
 
-    port = Port(
+    values = dict(
         name=row["name"],
         code=port_code,
         country_id=country_id,
         location=row.get("location"),
-        status=str(row.get("status", "true")).lower() == "true"
+        status=row.get("status", True)
     )
-    db.add(port)
-    return {"status": "success", "message": f"第{row_number}行: 港口 '{row['name']}' 创建成功"}
+    remember_key(foreign_key_maps, "name", row["name"])
+    remember_key(foreign_key_maps, "code", port_code)
+    return {"status": "success", "message": f"第{row_number}行: 港口 '{row['name']}' 创建成功", "values": values}
 
-def process_company_row_optimized(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Dict[str, Dict[str, int]]) -> Dict[str, str]:
+def process_company_row_optimized(row: Dict[str, Any], row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
     """处理公司数据行 - 优化版本"""
-    # 使用预加载的国家数据
-    country_id = foreign_key_maps.get("countries", {}).get(row["country_name"])
+    # 国家ID已由 _resolve_foreign_keys 按列解析
+    country_id = row.get("country_id")
     if not country_id:
-        return {"status": "error", "message": f"第{row_number}行: 国家 '{row['country_name']}' 不存在"}
+        return {"status": "error", "message": f"第{row_number}行: 国家 '{row['country_name']}' 不存在。可用国家: {available_names_hint(foreign_key_maps.get('countries', {}))}"}
 
-    existing = db.query(Company).filter(Company.name == row["name"]).first()
-    if existing:
-        if strategy == DuplicateHandlingStrategy.SKIP:
+    if key_exists(foreign_key_maps, Company.name, row["name"], db):
+        if strategy is DuplicateHandlingStrategy.SKIP:
             return {"status": "skipped", "message": f"第{row_number}行: 公司 '{row['name']}' 已存在，已跳过"}
         else:
             return {"status": "error", "message": f"第{row_number}行: 公司 '{row['name']}' 已存在"}
 
-    company = Company(
+    values = dict(
         name=row["name"],
         country_id=country_id,
-        status=str(row.get("status", "true")).lower() == "true"
+        status=row.get("status", True)
     )
-    db.add(company)
-    return {"status": "success", "message": f"第{row_number}行: 公司 '{row['name']}' 创建成功"}
+    remember_key(foreign_key_maps, "name", row["name"])
+    return {"status": "success", "message": f"第{row_number}行: 公司 '{row['name']}' 创建成功", "values": values}
 
-def process_supplier_row_optimized(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Dict[str, Dict[str, int]]) -> Dict[str, str]:
+def process_supplier_row_optimized(row: Dict[str, Any], row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
     """处理供应商数据行 - 优化版本"""
-    # 使用预加载的国家数据
-    country_id = foreign_key_maps.get("countries", {}).get(row["country_name"])
+    # 国家ID已由 _resolve_foreign_keys 按列解析
+    country_id = row.get("country_id")
     if not country_id:
-        return {"status": "error", "message": f"第{row_number}行: 国家 '{row['country_name']}' 不存在"}
+        return {"status": "error", "message": f"第{row_number}行: 国家 '{row['country_name']}' 不存在。可用国家: {available_names_hint(foreign_key_maps.get('countries', {}))}"}
 
-    existing = db.query(Supplier).filter(Supplier.name == row["name"]).first()
-    if existing:
-        if strategy == DuplicateHandlingStrategy.SKIP:
+    if key_exists(foreign_key_maps, Supplier.name, row["name"], db):
+        if strategy is DuplicateHandlingStrategy.SKIP:
             return {"status": "skipped", "message": f"第{row_number}行: 供应商 '{row['name']}' 已存在，已跳过"}
         else:
             return {"status": "error", "message": f"第{row_number}行: 供应商 '{row['name']}' 已存在"}
 
-    phone_value = row.get("phone")
-    if phone_value is not None and not pd.isna(phone_value):
-        phone_value = str(phone_value)
-    else:
-        phone_value = None
-
-    supplier = Supplier(
+    values = dict(
         name=row["name"],
         country_id=country_id,
         contact=row.get("contact"),
         email=row.get("email"),
-        phone=phone_value,
-        status=str(row.get("status", "true")).lower() == "true"
+        phone=row.get("phone"),
+        status=row.get("status", True)
     )
-    db.add(supplier)
-    return {"status": "success", "message": f"第{row_number}行: 供应商 '{row['name']}' 创建成功"}
+    remember_key(foreign_key_maps, "name", row["name"])
+    return {"status": "success", "message": f"第{row_number}行: 供应商 '{row['name']}' 创建成功", "values": values}
 
-def process_ship_row_optimized(row: pd.Series, row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Dict[str, Dict[str, int]]) -> Dict[str, str]:
+def process_ship_row_optimized(row: Dict[str, Any], row_number: int, db: Session, strategy: DuplicateHandlingStrategy, foreign_key_maps: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
     """处理船舶数据行 - 优化版本"""
-    # 使用预加载的公司数据
-    company_id = foreign_key_maps.get("companies", {}).get(row["company_name"])
+    # 公司ID已由 _resolve_foreign_keys 按列解析
+    company_id = row.get("company_id")
     if not company_id:
         return {"status": "error", "message": f"第{row_number}行: 公司 '{row['company_name']}' 不存在"}
 
-    existing = db.query(Ship).filter(Ship.name == row["name"]).first()
-    if existing:
-        if strategy == DuplicateHandlingStrategy.SKIP:
+    if key_exists(foreign_key_maps, Ship.name, row["name"], db):
+        if strategy is DuplicateHandlingStrategy.SKIP:
             return {"status": "skipped", "message": f"第{row_number}行: 船舶 '{row['name']}' 已存在，已跳过"}
         else:
             return {"status": "error", "message": f"第{row_number}行: 船舶 '{row['name']}' 已存在"}
 
+    values = dict(
+        name=row["name"],
+        company_id=company_id,
+        status=row.get("status", True)
+    )
+    remember_key(foreign_key_maps, "name", row["name"])
+    return {"status": "success", "message": f"第{row_number}行: 船舶 '{row['name']}' 创建成功", "values": values}
+
+
+# 🚀 性能优化：按表名直接查找行处理函数，代替逐行 if/elif 判断
+ROW_PROCESSORS_OPT = {
+    "countries": process_country_row,
+    "categories": process_category_row,
+    "ports": process_port_row_optimized,
+    "companies": process_company_row_optimized,
+    "suppliers": process_supplier_row_optimized,
+    "ships": process_ship_row_optimized,
+    "products": process_product_row_optimized,
+}
+
+def _legacy_country_row(index: Any, row: Dict[str, Any], db: Session, foreign_key_maps: Dict[str, Any], context: Dict[str, Any]) -> Tuple[str, Any]:
+    """导入国家数据行，已存在时跳过"""
+    existing = (key_exists(foreign_key_maps, Country.name, row["name"], db)
+                or key_exists(foreign_key_maps, Country.code, row["code"], db))
+    if existing:
+        # 重复数据跳过，不再作为错误
+        return "skipped", f"第{index+2}行: 国家 '{row['name']}' 或代码 '{row['code']}' 已存在，已跳过"
+
+    country = Country(
+        name=row["name"],
+        code=row["code"],
+        status=parse_status(row.get("status", True))
+    )
+    remember_key(foreign_key_maps, "name", row["name"])
+    remember_key(foreign_key_maps, "code", row["code"])
+    return "success", country
+
+
+def _legacy_category_row(index: Any, row: Dict[str, Any], db: Session, foreign_key_maps: Dict[str, Any], context: Dict[str, Any]) -> Tuple[str, Any]:
+    """导入类别数据行"""
+    if key_exists(foreign_key_maps, Category.name, row["name"], db):
+        return "error", f"第{index+2}行: 类别 '{row['name']}' 已存在"
+
+    category = Category(
+        name=row["name"],
+        code=row.get("code"),
+        description=row.get("description"),
+        status=parse_status(row.get("status", True))
+    )
+    remember_key(foreign_key_maps, "name", row["name"])
+    return "success", category
+
+
+def _legacy_port_row(index: Any, row: Dict[str, Any], db: Session, foreign_key_maps: Dict[str, Any], context: Dict[str, Any]) -> Tuple[str, Any]:
+    """导入港口数据行"""
+    # 查找国家
+    countries_map = foreign_key_maps.get("countries", {})
+    country_name = row["country_name"]
+    country_id = countries_map.get(country_name)
+    if not country_id:
+        return "error", f"第{index+2}行: 国家 '{country_name}' 不存在。可用国家: {available_names_hint(countries_map)}"
+
+    # 检查港口是否已存在
+    if key_exists(foreign_key_maps, Port.name, row["name"], db):
+        return "error", f"第{index+2}行: 港口 '{row['name']}' 已存在"
+
+    # 处理code字段 - 检查唯一性
+    port_code = row.get("code")
+    if port_code and key_exists(foreign_key_maps, Port.code, port_code, db):
+        return "error", f"第{index+2}行: 港口代码 '{port_code}' 已存在"
+
+    port = Port(
+        name=row["name"],
+        code=port_code,
+        country_id=country_id,
+        location=row.get("location"),
+        status=parse_status(row.get("status", True))
+    )
+    remember_key(foreign_key_maps, "name", row["name"])
+    remember_key(foreign_key_maps, "code", port_code)
+    return "success", port
+
+
+def _legacy_company_row(index: Any, row: Dict[str, Any], db: Session, foreign_key_maps: Dict[str, Any], context: Dict[str, Any]) -> Tuple[str, Any]:
+    """导入公司数据行"""
+    # 查找国家
+    countries_map = foreign_key_maps.get("countries", {})
+    country_name = row["country_name"]
+    country_id = countries_map.get(country_name)
+    if not country_id:
+        return "error", f"第{index+2}行: 国家 '{country_name}' 不存在。可用国家: {available_names_hint(countries_map)}"
+
+    # 检查公司是否已存在
+    if key_exists(foreign_key_maps, Company.name, row["name"], db):
+        return "error", f"第{index+2}行: 公司 '{row['name']}' 已存在"
+
+    company = Company(
+        name=row["name"],
+        country_id=country_id,
+        contact=safe_string_field(row.get("contact")),
+        email=safe_string_field(row.get("email")),
+        phone=safe_string_field(row.get("phone")),
+        status=parse_status(row.get("status", True))
+    )
+    remember_key(foreign_key_maps, "name", row["name"])
+    return "success", company
+
+
+def _legacy_supplier_row(index: Any, row: Dict[str, Any], db: Session, foreign_key_maps: Dict[str, Any], context: Dict[str, Any]) -> Tuple[str, Any]:
+    """导入供应商数据行"""
+    # 查找国家
+    countries_map = foreign_key_maps.get("countries", {})
+    country_name = row["country_name"]
+    country_id = countries_map.get(country_name)
+    if not country_id:
+        return "error", f"第{index+2}行: 国家 '{country_name}' 不存在。可用国家: {available_names_hint(countries_map)}"
+
+    # 检查供应商是否已存在
+    if key_exists(foreign_key_maps, Supplier.name, row["name"], db):
+        return "error", f"第{index+2}行: 供应商 '{row['name']}' 已存在"
+
+    supplier = Supplier(
+        name=row["name"],
+        country_id=country_id,
+        contact=safe_string_field(row.get("contact")),
+        email=safe_string_field(row.get("email")),
+        phone=safe_string_field(row.get("phone")),
+        status=parse_status(row.get("status", True))
+    )
+    remember_key(foreign_key_maps, "name", row["name"])
+    return "success", supplier
+
+
+def _legacy_ship_row(index: Any, row: Dict[str, Any], db: Session, foreign_key_maps: Dict[str, Any], context: Dict[str, Any]) -> Tuple[str, Any]:
+    """导入船舶数据行"""
+    # 查找公司
+    company_id = foreign_key_maps.get("companies", {}).get(row["company_name"])
+    if not company_id:
+        return "error", f"第{index+2}行: 公司 '{row['company_name']}' 不存在"
+
+    # 检查船舶是否已存在
+    if key_exists(foreign_key_maps, Ship.name, row["name"], db):
+        return "error", f"第{index+2}行: 船舶 '{row['name']}' 已存在"
+
     ship = Ship(
         name=row["name"],
         company_id=company_id,
-        status=str(row.get("status", "true")).lower() == "true"
+        ship_type=row.get("ship_type"),
+        capacity=int(row["capacity"]) if row.get("capacity") else None,
+        status=parse_status(row.get("status", True))
     )
-    db.add(ship)
-    return {"status": "success", "message": f"第{row_number}行: 船舶 '{row['name']}' 创建成功"}
+    remember_key(foreign_key_maps, "name", row["name"])
+    return "success", ship
+
+
+def _legacy_product_dates(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    产品日期列整列解析一次，结束日期为空时整列顺延默认天数
+    🚀 性能优化：代替逐行 pd.to_datetime
+    """
+    def date_column(name):
+        values = df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+        present = values.notna() & values.astype(str).str.strip().ne("")
+        parsed = pd.to_datetime(values.where(present), errors="coerce", format="mixed")
+        return parsed, present & parsed.isna()
+
+    effective_from_col, effective_from_bad = date_column("effective_from")
+    effective_to_col, effective_to_bad = date_column("effective_to")
+    effective_to_col = effective_to_col.fillna(effective_from_col + pd.Timedelta(days=DEFAULT_EFFECTIVE_DAYS))
+    date_range_bad = effective_to_col < effective_from_col
+    # Timestamp 是 datetime 的子类，转成 object 列后可直接交给数据库驱动
+    return {
+        "effective_from": effective_from_col.astype(object).where(effective_from_col.notna(), None),
+        "effective_to": effective_to_col.astype(object).where(effective_to_col.notna(), None),
+        "effective_from_bad": effective_from_bad,
+        "effective_to_bad": effective_to_bad,
+        "date_range_bad": date_range_bad,
+    }
+
+
+def _legacy_product_row(index: Any, row: Dict[str, Any], db: Session, foreign_key_maps: Dict[str, Any], context: Dict[str, Any]) -> Tuple[str, Any]:
+    """导入产品数据行，成功时返回待插入的字段字典"""
+    # 查找国家
+    country_id = foreign_key_maps.get("countries", {}).get(row["country_name"])
+    if not country_id:
+        return "error", f"第{index+2}行: 国家 '{row['country_name']}' 不存在"
+
+    # 查找类别
+    category_id = foreign_key_maps.get("categories", {}).get(row["category_name"])
+    if not category_id:
+        return "error", f"第{index+2}行: 类别 '{row['category_name']}' 不存在"
+
+    # 查找供应商（可选）
+    supplier_id = None
+    if row.get("supplier_name"):
+        supplier_id = foreign_key_maps.get("suppliers", {}).get(row["supplier_name"])
+        if not supplier_id:
+            return "error", f"第{index+2}行: 供应商 '{row['supplier_name']}' 不存在"
+
+    # 查找港口（可选）
+    port_id = None
+    if row.get("port_name"):
+        port_id = foreign_key_maps.get("ports", {}).get(row["port_name"])
+        if not port_id:
+            return "error", f"第{index+2}行: 港口 '{row['port_name']}' 不存在"
+
+    # 检查产品是否已存在
+    if key_exists(foreign_key_maps, Product.product_name_en, row["product_name_en"], db):
+        return "error", f"第{index+2}行: 产品 '{row['product_name_en']}' 已存在"
+
+    # 处理价格字段
+    price_value = None
+    if row.get("price") and not pd.isna(row["price"]):
+        try:
+            price_value = float(row["price"])
+        except (ValueError, TypeError):
+            return "error", f"第{index+2}行: price (价格) 格式错误，必须为数字"
+        if price_value < 0:
+            return "error", f"第{index+2}行: price (价格) 不能为负数"
+
+    # 日期字段已在循环前整列解析（结束日期为空时已设置为起始日期+3个月）
+    if context["effective_from_bad"][index]:
+        return "error", f"第{index+2}行: 起始日期格式错误"
+
+    if context["effective_to_bad"][index]:
+        return "error", f"第{index+2}行: 结束日期格式错误"
+
+    # 验证日期范围
+    if context["date_range_bad"][index]:
+        return "error", f"第{index+2}行: 结束日期不能早于起始日期"
+
+    product = dict(
+        product_name_en=row["product_name_en"],
+        product_name_jp=row.get("product_name_jp"),
+        code=safe_string_field(row.get("code")),
+        country_id=country_id,
+        category_id=category_id,
+        supplier_id=supplier_id,
+        port_id=port_id,
+        unit=safe_string_field(row.get("unit")),
+        price=price_value,
+        currency=safe_string_field(row.get("currency")),
+        unit_size=safe_string_field(row.get("unit_size")),
+        pack_size=row.get("pack_size"),
+        brand=safe_string_field(row.get("brand")),
+        country_of_origin=safe_string_field(row.get("country_of_origin")),
+        effective_from=context["effective_from"][index],
+        effective_to=context["effective_to"][index],
+        status=parse_status(row.get("status", True))
+    )
+    remember_key(foreign_key_maps, "product_name_en", row["product_name_en"])
+    return "success", product
+
+
+# 🚀 性能优化：导入前按表名选定行处理函数，循环中不再逐行比较表名
+LEGACY_ROW_HANDLERS = {
+    "countries": _legacy_country_row,
+    "categories": _legacy_category_row,
+    "ports": _legacy_port_row,
+    "companies": _legacy_company_row,
+    "suppliers": _legacy_supplier_row,
+    "ships": _legacy_ship_row,
+    "products": _legacy_product_row,
+}
+
 
 async def import_table_data(table_name: str, df: pd.DataFrame, db: Session) -> Dict[str, Any]:
     """导入数据到指定表"""
@@ -2309,403 +2944,74 @@ async def import_table_data(table_name: str, df: pd.DataFrame, db: Session) -> D
     skipped_count = 0  # 跳过的重复数据计数
     errors = []
     skipped_items = []  # 跳过的项目列表
-    
-    try:
-        for index, row in df.iterrows():
-            try:
-                if table_name == "countries":
-                    # 检查必填字段
-                    if pd.isna(row["name"]) or str(row["name"]).strip() == "":
-                        errors.append(f"第{index+2}行: name 不能为空")
-                        error_count += 1
-                        continue
-
-                    if pd.isna(row["code"]) or str(row["code"]).strip() == "":
-                        errors.append(f"第{index+2}行: code 不能为空")
-                        error_count += 1
-                        continue
-
-                    # 检查是否已存在
-                    existing = db.query(Country).filter(
-                        (Country.name == row["name"]) | (Country.code == row["code"])
-                    ).first()
-
-                    if not existing:
-                        country = Country(
-                            name=row["name"],
-                            code=row["code"],
-                            status=str(row.get("status", "true")).lower() == "true"
-                        )
-                        db.add(country)
-                        success_count += 1
-                    else:
-                        # 重复数据跳过，不再作为错误
-                        skipped_count += 1
-                        skipped_items.append(f"第{index+2}行: 国家 '{row['name']}' 或代码 '{row['code']}' 已存在，已跳过")
-                
-                elif table_name == "categories":
-                    # 检查必填字段
-                    if pd.isna(row["name"]) or str(row["name"]).strip() == "":
-                        errors.append(f"第{index+2}行: name 不能为空")
-                        error_count += 1
-                        continue
-
-                    existing = db.query(Category).filter(Category.name == row["name"]).first()
-
-                    if not existing:
-                        category = Category(
-                            name=row["name"],
-                            code=row.get("code") if not pd.isna(row.get("code")) else None,
-                            description=row.get("description") if not pd.isna(row.get("description")) else None,
-                            status=str(row.get("status", "true")).lower() == "true"
-                        )
-                        db.add(category)
-                        success_count += 1
-                    else:
-                        errors.append(f"第{index+2}行: 类别 '{row['name']}' 已存在")
-                        error_count += 1
-
-                elif table_name == "ports":
-                    # 查找国家
-                    country_name = str(row["country_name"]).strip()
-                    country = db.query(Country).filter(Country.name == country_name).first()
-                    if not country:
-                        all_countries = db.query(Country.name).all()
-                        available_countries = [c[0] for c in all_countries]
-                        errors.append(f"第{index+2}行: 国家 '{country_name}' 不存在。可用国家: {available_countries}")
-                        error_count += 1
-                        continue
-
-                    # 检查港口是否已存在
-                    existing = db.query(Port).filter(Port.name == row["name"]).first()
-                    if existing:
-                        errors.append(f"第{index+2}行: 港口 '{row['name']}' 已存在")
-                        error_count += 1
-                        continue
-
-                    # 处理code字段 - 检查唯一性
-                    port_code = row.get("code")
-                    if port_code and str(port_code).strip():
-                        port_code = str(port_code).strip()
-                        # 检查code是否已存在
-                        existing_code = db.query(Port).filter(Port.code == port_code).first()
-                        if existing_code:
-                            errors.append(f"第{index+2}行: 港口代码 '{port_code}' 已存在")
-                            error_count += 1
-                            continue
-                    else:
-                        port_code = None  # 确保空值为None
-
-                    port = Port(
-                        name=row["name"],
-                        code=port_code,
-                        country_id=country.id,
-                        location=row.get("location"),
-                        status=str(row.get("status", "true")).lower() == "true"
-                    )
-                    db.add(port)
-                    success_count += 1
 
-                elif table_name == "companies":
-                    # 查找国家
-                    country_name = str(row["country_name"]).strip()
-                    country = db.query(Country).filter(Country.name == country_name).first()
-                    if not country:
-                        all_countries = db.query(Country.name).all()
-                        available_countries = [c[0] for c in all_countries]
-                        errors.append(f"第{index+2}行: 国家 '{country_name}' 不存在。可用国家: {available_countries}")
-                        error_count += 1
-                        continue
-
-                    # 检查公司是否已存在
-                    existing = db.query(Company).filter(Company.name == row["name"]).first()
-                    if existing:
-                        errors.append(f"第{index+2}行: 公司 '{row['name']}' 已存在")
-                        error_count += 1
-                        continue
-
-                    # 安全处理所有字符串字段
-                    def safe_string_field(value):
-                        if value is None or pd.isna(value):
-                            return None
-                        return str(value).strip() if str(value).strip() else None
-
-                    contact_value = safe_string_field(row.get("contact"))
-                    email_value = safe_string_field(row.get("email"))
-                    phone_value = safe_string_field(row.get("phone"))
-
-                    company = Company(
-                        name=row["name"],
-                        country_id=country.id,
-                        contact=contact_value,
-                        email=email_value,
-                        phone=phone_value,
-                        status=str(row.get("status", "true")).lower() == "true"
-                    )
-                    db.add(company)
-                    success_count += 1
+    handler = LEGACY_ROW_HANDLERS.get(table_name)
+    if handler is None:
+        return {
+            "success_count": 0,
+            "error_count": len(df),
+            "skipped_count": 0,
+            "errors": [f"不支持的表类型 '{table_name}'"],
+            "skipped_items": []
+        }
+
+    # 字符串列整列清洗一次，循环中直接使用清洗后的值
+    df = _clean_string_columns(df)
+
+    # 🚀 性能优化：循环前一次性预加载外键映射和目标表已有的唯一键，循环中只做字典/集合查找
+    foreign_key_maps = preload_foreign_key_data(table_name, db, df)
+    # 必填字段整列检查一次，循环中只查表
+    required_errors = _required_field_errors(df, table_name)
+    context = _legacy_product_dates(df) if table_name == "products" else {}
 
-                elif table_name == "suppliers":
-                    # 查找国家
-                    country_name = str(row["country_name"]).strip()  # 去除空格
-                    country = db.query(Country).filter(Country.name == country_name).first()
-                    if not country:
-                        # 调试信息：显示所有可用的国家
-                        all_countries = db.query(Country.name).all()
-                        available_countries = [c[0] for c in all_countries]
-                        errors.append(f"第{index+2}行: 国家 '{country_name}' 不存在。可用国家: {available_countries}")
-                        error_count += 1
-                        continue
-
-                    # 检查供应商是否已存在
-                    existing = db.query(Supplier).filter(Supplier.name == row["name"]).first()
-                    if not existing:
-                        # 确保phone字段被正确处理为字符串
-                        phone_value = row.get("phone")
-                        if phone_value is not None and not pd.isna(phone_value):
-                            phone_value = str(phone_value)
-                        else:
-                            phone_value = None
-
-                        supplier = Supplier(
-                            name=row["name"],
-                            country_id=country.id,
-                            contact=row.get("contact"),
-                            email=row.get("email"),
-                            phone=phone_value,
-                            status=str(row.get("status", "true")).lower() == "true"
-                        )
-                        db.add(supplier)
-                        success_count += 1
-                    else:
-                        errors.append(f"第{index+2}行: 供应商 '{row['name']}' 已存在")
-                        error_count += 1
-
-                elif table_name == "ships":
-                    # 查找公司
-                    company = db.query(Company).filter(Company.name == row["company_name"]).first()
-                    if not company:
-                        errors.append(f"第{index+2}行: 公司 '{row['company_name']}' 不存在")
-                        error_count += 1
-                        continue
-
-                    # 检查船舶是否已存在
-                    existing = db.query(Ship).filter(Ship.name == row["name"]).first()
-                    if not existing:
-                        ship = Ship(
-                            name=row["name"],
-                            company_id=company.id,
-                            ship_type=row.get("ship_type"),
-                            capacity=int(row["capacity"]) if row.get("capacity") else None,
-                            status=str(row.get("status", "true")).lower() == "true"
-                        )
-                        db.add(ship)
-                        success_count += 1
-                    else:
-                        errors.append(f"第{index+2}行: 船舶 '{row['name']}' 已存在")
-                        error_count += 1
-
-                elif table_name == "products":
-                    # 检查必填字段：产品英文名称
-                    if pd.isna(row.get("product_name_en")) or str(row.get("product_name_en", "")).strip() == "":
-                        errors.append(f"第{index+2}行: product_name_en (产品英文名称) 不能为空")
-                        error_count += 1
-                        continue
-
-                    # 检查必填字段：起始日期
-                    if pd.isna(row.get("effective_from")) or str(row.get("effective_from", "")).strip() == "":
-                        errors.append(f"第{index+2}行: effective_from (起始日期) 不能为空")
-                        error_count += 1
-                        continue
-
-                    # 检查必填字段：国家名称
-                    if pd.isna(row.get("country_name")) or str(row.get("country_name", "")).strip() == "":
-                        errors.append(f"第{index+2}行: country_name (国家名称) 不能为空")
-                        error_count += 1
-                        continue
-
-                    # 检查必填字段：类别名称
-                    if pd.isna(row.get("category_name")) or str(row.get("category_name", "")).strip() == "":
-                        errors.append(f"第{index+2}行: category_name (类别名称) 不能为空")
-                        error_count += 1
-                        continue
-
-                    # 查找国家
-                    country = db.query(Country).filter(Country.name == row["country_name"]).first()
-                    if not country:
-                        errors.append(f"第{index+2}行: 国家 '{row['country_name']}' 不存在")
-                        error_count += 1
-                        continue
-
-                    # 查找类别
-                    category = db.query(Category).filter(Category.name == row["category_name"]).first()
-                    if not category:
-                        errors.append(f"第{index+2}行: 类别 '{row['category_name']}' 不存在")
-                        error_count += 1
-                        continue
-
-                    # 查找供应商（可选）
-                    supplier_id = None
-                    if row.get("supplier_name") and not pd.isna(row["supplier_name"]):
-                        supplier = db.query(Supplier).filter(Supplier.name == row["supplier_name"]).first()
-                        if supplier:
-                            supplier_id = supplier.id
-                        else:
-                            errors.append(f"第{index+2}行: 供应商 '{row['supplier_name']}' 不存在")
-                            error_count += 1
-                            continue
-
-                    # 查找港口（可选）
-                    port_id = None
-                    if row.get("port_name") and not pd.isna(row["port_name"]):
-                        port = db.query(Port).filter(Port.name == row["port_name"]).first()
-                        if port:
-                            port_id = port.id
-                        else:
-                            errors.append(f"第{index+2}行: 港口 '{row['port_name']}' 不存在")
-                            error_count += 1
-                            continue
-
-                    # 检查产品是否已存在
-                    existing = db.query(Product).filter(Product.product_name_en == row["product_name_en"]).first()
-                    if not existing:
-                        # 处理字符串字段，确保类型正确
-                        code_value = row.get("code")
-                        if code_value is not None and not pd.isna(code_value):
-                            code_value = str(code_value)
-                        else:
-                            code_value = None
-
-                        unit_value = row.get("unit")
-                        if unit_value is not None and not pd.isna(unit_value):
-                            unit_value = str(unit_value)
-                        else:
-                            unit_value = None
-
-                        currency_value = row.get("currency")
-                        if currency_value is not None and not pd.isna(currency_value):
-                            currency_value = str(currency_value)
-                        else:
-                            currency_value = None
-
-                        unit_size_value = row.get("unit_size")
-                        if unit_size_value is not None and not pd.isna(unit_size_value):
-                            unit_size_value = str(unit_size_value)
-                        else:
-                            unit_size_value = None
-
-                        brand_value = row.get("brand")
-                        if brand_value is not None and not pd.isna(brand_value):
-                            brand_value = str(brand_value)
-                        else:
-                            brand_value = None
-
-                        country_of_origin_value = row.get("country_of_origin")
-                        if country_of_origin_value is not None and not pd.isna(country_of_origin_value):
-                            country_of_origin_value = str(country_of_origin_value)
-                        else:
-                            country_of_origin_value = None
-
-                        # 处理字段
-                        pack_size_value = row.get("pack_size")
-                        if pack_size_value is not None and not pd.isna(pack_size_value):
-                            # pack_size 现在支持字符串格式，直接使用字符串值
-                            pack_size_value = str(pack_size_value).strip()
-                        else:
-                            pack_size_value = None
-
-                        # 处理价格字段
-                        price_value = None
-                        if row.get("price") and not pd.isna(row["price"]):
-                            try:
-                                price_value = float(row["price"])
-                                if price_value < 0:
-                                    errors.append(f"第{index+2}行: price (价格) 不能为负数")
-                                    error_count += 1
-                                    continue
-                            except (ValueError, TypeError):
-                                errors.append(f"第{index+2}行: price (价格) 格式错误，必须为数字")
-                                error_count += 1
-                                continue
-
-                        # 处理日期字段
-                        from datetime import datetime, timedelta
-                        import pandas as pd
-
-                        # 处理起始日期（必填）
-                        effective_from_value = None
-                        try:
-                            if row.get("effective_from") and not pd.isna(row["effective_from"]):
-                                if isinstance(row["effective_from"], str):
-                                    # 尝试解析字符串日期
-                                    effective_from_value = pd.to_datetime(row["effective_from"]).to_pydatetime()
-                                else:
-                                    # 已经是datetime对象
-                                    effective_from_value = pd.to_datetime(row["effective_from"]).to_pydatetime()
-                        except Exception as e:
-                            errors.append(f"第{index+2}行: 起始日期格式错误 - {str(e)}")
-                            error_count += 1
-                            continue
-
-                        # 处理结束日期（可选，如果没有则自动设置为起始日期+3个月）
-                        effective_to_value = None
-                        if row.get("effective_to") and not pd.isna(row["effective_to"]):
-                            try:
-                                if isinstance(row["effective_to"], str):
-                                    effective_to_value = pd.to_datetime(row["effective_to"]).to_pydatetime()
-                                else:
-                                    effective_to_value = pd.to_datetime(row["effective_to"]).to_pydatetime()
-                            except Exception as e:
-                                errors.append(f"第{index+2}行: 结束日期格式错误 - {str(e)}")
-                                error_count += 1
-                                continue
-                        else:
-                            # 如果没有结束日期，自动设置为起始日期+3个月
-                            if effective_from_value:
-                                effective_to_value = effective_from_value + timedelta(days=90)  # 约3个月
-
-                        # 验证日期范围
-                        if effective_from_value and effective_to_value:
-                            if effective_to_value < effective_from_value:
-                                errors.append(f"第{index+2}行: 结束日期不能早于起始日期")
-                                error_count += 1
-                                continue
-
-                        product = Product(
-                            product_name_en=row["product_name_en"],
-                            product_name_jp=row.get("product_name_jp"),
-                            code=code_value,
-                            country_id=country.id,
-                            category_id=category.id,
-                            supplier_id=supplier_id,
-                            port_id=port_id,
-                            unit=unit_value,
-                            price=price_value,
-                            currency=currency_value,
-                            unit_size=unit_size_value,
-                            pack_size=pack_size_value,
-                            brand=brand_value,
-                            country_of_origin=country_of_origin_value,
-                            effective_from=effective_from_value,
-                            effective_to=effective_to_value,
-                            status=str(row.get("status", "true")).lower() == "true"
-                        )
-                        db.add(product)
-                        success_count += 1
-                    else:
-                        errors.append(f"第{index+2}行: 产品 '{row['product_name_en']}' 已存在")
-                        error_count += 1
+    # 校验通过的对象先收集起来，循环结束后批量写入；
+    # 产品行数多、字段多，直接收集字段字典，用 Core INSERT 写入，不构造 ORM 对象
+    to_insert = []
+    product_rows = []
+    collected = product_rows if table_name == "products" else to_insert
 
+    try:
+        # 循环中存在外键/唯一键查询，关闭自动 flush，避免每次查询前都同步会话中的待写入对象
+        with db.no_autoflush:
+            # 🚀 性能优化：逐行字典由 itertuples 生成，代替 iterrows 每行构造 pd.Series
+            for index, row in _iter_row_dicts(df):
+                required_error = required_errors.get(index)
+                if required_error:
+                    errors.append(required_error)
+                    error_count += 1
+                    continue
+
+                try:
+                    status, payload = handler(index, row, db, foreign_key_maps, context)
+                except Exception as e:
+                    error_count += 1
+                    errors.append(f"第{index+2}行: {str(e)}")
+                    continue
+
+                if status == "success":
+                    collected.append(payload)
+                    success_count += 1
+                elif status == "skipped":
+                    skipped_items.append(payload)
+                    skipped_count += 1
                 else:
-                    errors.append(f"第{index+2}行: 不支持的表类型 '{table_name}'")
+                    errors.append(payload)
                     error_count += 1
-                
-            except Exception as e:
-                error_count += 1
-                errors.append(f"第{index+2}行: {str(e)}")
-        
-        # 提交事务
-        if success_count > 0:
+
+        # 🚀 性能优化：按块 bulk_save_objects 批量写入，代替逐个 db.add 后逐条 INSERT
+        if to_insert:
+            objects = iter(to_insert)
+            while True:
+                chunk = list(islice(objects, BULK_SAVE_CHUNK_SIZE))
+                if not chunk:
+                    break
+                db.bulk_save_objects(chunk)
+
+        # 🚀 性能优化：产品数据按块执行多行 INSERT，绕过 ORM 的属性监测和工作单元
+        for start in range(0, len(product_rows), BULK_SAVE_CHUNK_SIZE):
+            db.execute(insert(Product), product_rows[start:start + BULK_SAVE_CHUNK_SIZE])
+
+        if to_insert or product_rows:
             db.commit()
         
         return {
@@ -2,15 +2,21 @@
 订单处理相关API端点
 """
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import Float, case, cast, func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
 from typing import List, Optional
+import asyncio
 import os
 import uuid
-from datetime import datetime
-import shutil
+from datetime import datetime, timezone
+import anyio
+import orjson
 
 from app.api import deps
 from app.core.config import settings
+from app.db.session import SessionLocal, get_async_session_factory
 from app.models.models import User, Order, OrderItem
 # from app.services.order_parser import OrderExcelParser
 # from app.services.product_matcher import ProductMatcher
@@ -21,6 +27,28 @@ router = APIRouter()
 UPLOAD_DIR = "uploads/orders"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# 上传文件分块写入磁盘时每块的大小
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def copy_rolled_upload(source, file_path: str) -> int:
+    """
+    将已落盘的上传临时文件通过 os.sendfile 在内核中直接复制到目标路径，返回写入的字节数
+    🚀 性能优化：零拷贝，数据不经过 Python 缓冲区
+    """
+    source.seek(0)
+    in_fd = source.fileno()
+    size = os.fstat(in_fd).st_size
+    offset = 0
+    with open(file_path, "wb") as out:
+        out_fd = out.fileno()
+        while offset < size:
+            sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    return offset
+
 @router.post("/upload-order-file")
 async def upload_order_file(
     file: UploadFile = File(...),
@@ -42,11 +70,17 @@ async def upload_order_file(
         unique_filename = f"{uuid.uuid4()}{file_extension}"
         file_path = os.path.join(UPLOAD_DIR, unique_filename)
 
-        # 保存文件
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        file_size = os.path.getsize(file_path)
+        if hasattr(os, "sendfile") and getattr(file.file, "_rolled", False):
+            # 大文件已由 SpooledTemporaryFile 写入磁盘临时文件，在线程中用 sendfile 零拷贝复制
+            file_size = await anyio.to_thread.run_sync(copy_rolled_upload, file.file, file_path)
+        else:
+            # 🚀 性能优化：异步分块写入磁盘，不阻塞事件循环，内存占用与文件大小无关；
+            # 写入时累计文件大小，省去额外的 stat 调用
+            file_size = 0
+            async with await anyio.open_file(file_path, "wb") as buffer:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    await buffer.write(chunk)
+                    file_size += len(chunk)
 
         # 创建文件上传记录
         file_upload = OrderFileUpload(
@@ -119,6 +153,8 @@ async def parse_order_file(
         # 保存解析结果到数据库
         product_matcher = ProductMatcher(db)
 
+        # 先创建全部订单记录，一次 flush 取得所有订单ID
+        parsed_orders = []
         for order_data in parse_result["orders"]:
             # 创建订单记录
             parsed_order = ParsedOrder(
@@ -133,40 +169,43 @@ async def parse_order_file(
                 destination=order_data["destination"],
                 port_code=order_data["port_code"],
                 supplier_name=order_data["supplier_name"],
-                raw_header_data=order_data["raw_data"]
+                raw_header_data=order_data["raw_data"],
+                total_amount=sum((item_data["total_price"] for item_data in order_data["items"]), 0.0)
             )
-
-            db.add(parsed_order)
-            db.flush()  # 获取ID
-
-            # 创建订单项目记录
-            total_amount = 0.0
-            for item_data in order_data["items"]:
-                # 匹配产品
-                match_result = product_matcher.match_product(item_data)
-
-                parsed_item = ParsedOrderItem(
-                    order_id=parsed_order.id,
-                    line_number=item_data["row_index"],
-                    product_id_from_file=item_data["product_id_from_file"],
-                    product_code=item_data["product_code"],
-                    quantity=item_data["quantity"],
-                    unit=item_data["unit"],
-                    unit_price=item_data["unit_price"],
-                    total_price=item_data["total_price"],
-                    description=item_data["description"],
-                    raw_detail_data=item_data["raw_data"],
-                    matched_product_id=match_result.get("matched_product_id"),
-                    match_confidence=match_result.get("confidence", 0.0),
-                    match_method=match_result.get("match_method"),
-                    match_notes=match_result.get("match_notes")
-                )
-
-                db.add(parsed_item)
-                total_amount += item_data["total_price"]
-
-            # 更新订单总金额
-            parsed_order.total_amount = total_amount
+            parsed_orders.append((parsed_order, order_data))
+
+        db.add_all([parsed_order for parsed_order, _ in parsed_orders])
+        db.flush()  # 获取ID
+
+        # 🚀 性能优化：整个文件的订单项目一次批量匹配产品，代替逐项调用 match_product
+        all_items = [
+            (parsed_order, item_data)
+            for parsed_order, order_data in parsed_orders
+            for item_data in order_data["items"]
+        ]
+        match_results = product_matcher.match_products([item_data for _, item_data in all_items])
+
+        # 🚀 性能优化：订单项目收集为字典后一次 bulk_insert_mappings 批量写入，代替逐个 db.add
+        item_rows = []
+        for (parsed_order, item_data), match_result in zip(all_items, match_results):
+            item_rows.append(dict(
+                order_id=parsed_order.id,
+                line_number=item_data["row_index"],
+                product_id_from_file=item_data["product_id_from_file"],
+                product_code=item_data["product_code"],
+                quantity=item_data["quantity"],
+                unit=item_data["unit"],
+                unit_price=item_data["unit_price"],
+                total_price=item_data["total_price"],
+                description=item_data["description"],
+                raw_detail_data=item_data["raw_data"],
+                matched_product_id=match_result.get("matched_product_id"),
+                match_confidence=match_result.get("confidence", 0.0),
+                match_method=match_result.get("match_method"),
+                match_notes=match_result.get("match_notes")
+            ))
+
+        db.bulk_insert_mappings(ParsedOrderItem, item_rows)
 
         # 更新文件处理状态
         file_upload.processing_status = "analyzed"
@@ -197,20 +236,54 @@ async def parse_order_file(
 
         raise HTTPException(status_code=500, detail=f"解析失败: {str(e)}")
 
+def next_cursor(rows: list, limit: int) -> Optional[dict]:
+    """根据本页最后一条记录生成下一页游标，不足一页时返回 None"""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return {"before_created_at": last.created_at, "before_id": last.id}
+
 @router.get("/file-uploads")
 async def get_file_uploads(
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(deps.get_db),
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_user)
 ):
     """
     获取用户的文件上传记录
+    传入上一页返回的 next_cursor（before_created_at + before_id）时按游标分页，否则按 skip 分页
     """
     try:
-        uploads = db.query(OrderFileUpload).filter(
+        # 异步会话中不能懒加载，国家和船舶一并预加载
+        stmt = select(OrderFileUpload).options(
+            selectinload(OrderFileUpload.country),
+            selectinload(OrderFileUpload.ship)
+        ).where(
             OrderFileUpload.uploaded_by == current_user.id
-        ).order_by(OrderFileUpload.created_at.desc()).offset(skip).limit(limit).all()
+        ).order_by(OrderFileUpload.created_at.desc(), OrderFileUpload.id.desc())
+
+        # 🚀 性能优化：游标分页直接从索引位置开始读取，不再扫描并丢弃前 skip 行
+        if before_created_at is not None and before_id is not None:
+            stmt = stmt.where(
+                tuple_(OrderFileUpload.created_at, OrderFileUpload.id) < tuple_(before_created_at, before_id)
+            )
+        else:
+            stmt = stmt.offset(skip)
+
+        # 🚀 性能优化：总数由 COUNT 查询在另一个会话中与分页查询并发执行
+        async with get_async_session_factory()() as count_db:
+            page_result, total = await asyncio.gather(
+                db.execute(stmt.limit(limit)),
+                count_db.scalar(
+                    select(func.count(OrderFileUpload.id)).where(
+                        OrderFileUpload.uploaded_by == current_user.id
+                    )
+                )
+            )
+        uploads = page_result.scalars().all()
 
         result = []
         for upload in uploads:
@@ -237,45 +310,102 @@ async def get_file_uploads(
         return {
             "success": True,
             "data": result,
-            "total": len(result)
+            "total": total,
+            "next_cursor": next_cursor(uploads, limit)
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取文件列表失败: {str(e)}")
 
-@router.get("/parsed-orders/{file_upload_id}")
+# 返回数据量大的端点使用 orjson（C 扩展）序列化响应
+async def load_parsed_orders(db: AsyncSession, file_upload_id: int):
+    """
+    加载文件解析出的订单及其全部项目，返回 (订单列表, 项目行列表)
+    🚀 性能优化：项目只查询响应需要的列（含左连接的匹配产品名称和编码），不构建 ORM 对象，
+    数值类型转换放到 SQL 中完成
+    """
+    orders = (await db.execute(
+        select(ParsedOrder).where(
+            ParsedOrder.file_upload_id == file_upload_id
+        )
+    )).scalars().all()
+
+    matched_product = aliased(ParsedOrderItem.matched_product.property.entity)
+    item_rows = (await db.execute(
+        select(
+            ParsedOrderItem.order_id,
+            ParsedOrderItem.id,
+            ParsedOrderItem.product_id_from_file,
+            ParsedOrderItem.product_code,
+            cast(ParsedOrderItem.quantity, Float).label("quantity"),
+            ParsedOrderItem.unit,
+            cast(ParsedOrderItem.unit_price, Float).label("unit_price"),
+            cast(ParsedOrderItem.total_price, Float).label("total_price"),
+            ParsedOrderItem.description,
+            ParsedOrderItem.matched_product_id,
+            cast(func.coalesce(ParsedOrderItem.match_confidence, 0), Float).label("match_confidence"),
+            ParsedOrderItem.match_method,
+            ParsedOrderItem.match_notes,
+            matched_product.name.label("matched_product_name"),
+            matched_product.product_code.label("matched_product_code")
+        ).join(
+            ParsedOrder, ParsedOrderItem.order_id == ParsedOrder.id
+        ).outerjoin(
+            matched_product, ParsedOrderItem.matched_product
+        ).where(
+            ParsedOrder.file_upload_id == file_upload_id
+        ).order_by(ParsedOrderItem.order_id, ParsedOrderItem.id)
+    )).all()
+
+    return orders, item_rows
+
+@router.get("/parsed-orders/{file_upload_id}", response_class=ORJSONResponse)
 async def get_parsed_orders(
     file_upload_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_user)
 ):
     """
     获取解析出的订单列表
     """
     try:
-        # 验证文件所有权
-        file_upload = db.query(OrderFileUpload).filter(
-            OrderFileUpload.id == file_upload_id,
-            OrderFileUpload.uploaded_by == current_user.id
-        ).first()
+        # 🚀 性能优化：所有权校验与订单查询互不依赖，用两个会话（各占一个连接）并发执行
+        async with get_async_session_factory()() as orders_db:
+            file_upload_result, (orders, item_rows) = await asyncio.gather(
+                db.execute(
+                    select(OrderFileUpload).where(
+                        OrderFileUpload.id == file_upload_id,
+                        OrderFileUpload.uploaded_by == current_user.id
+                    )
+                ),
+                load_parsed_orders(orders_db, file_upload_id)
+            )
+            file_upload = file_upload_result.scalars().first()
 
+        # 验证文件所有权
         if not file_upload:
             raise HTTPException(status_code=404, detail="文件记录不存在")
 
-        # 获取解析的订单
-        orders = db.query(ParsedOrder).filter(
-            ParsedOrder.file_upload_id == file_upload_id
-        ).all()
+        # 项目行直接转换为字典，匹配产品字段收拢为嵌套对象
+        items_by_order = {}
+        for row in item_rows:
+            item = dict(row._mapping)
+            order_id = item.pop("order_id")
+            product_name = item.pop("matched_product_name")
+            product_code = item.pop("matched_product_code")
+            item["matched_product"] = {
+                "id": item["matched_product_id"],
+                "name": product_name,
+                "product_code": product_code
+            } if item["matched_product_id"] is not None else None
+            items_by_order.setdefault(order_id, []).append(item)
 
         result = []
         for order in orders:
-            # 获取订单项目
-            items = db.query(ParsedOrderItem).filter(
-                ParsedOrderItem.order_id == order.id
-            ).all()
+            items = items_by_order.get(order.id, [])
 
             # 统计匹配情况
-            matched_items = sum(1 for item in items if item.matched_product_id)
+            matched_items = sum(1 for item in items if item["matched_product_id"])
             total_items = len(items)
             match_rate = (matched_items / total_items * 100) if total_items > 0 else 0
 
@@ -297,28 +427,7 @@ async def get_parsed_orders(
                 "total_items": total_items,
                 "matched_items": matched_items,
                 "match_rate": round(match_rate, 1),
-                "items": [
-                    {
-                        "id": item.id,
-                        "product_id_from_file": item.product_id_from_file,
-                        "product_code": item.product_code,
-                        "quantity": float(item.quantity),
-                        "unit": item.unit,
-                        "unit_price": float(item.unit_price),
-                        "total_price": float(item.total_price),
-                        "description": item.description,
-                        "matched_product_id": item.matched_product_id,
-                        "match_confidence": float(item.match_confidence) if item.match_confidence else 0.0,
-                        "match_method": item.match_method,
-                        "match_notes": item.match_notes,
-                        "matched_product": {
-                            "id": item.matched_product.id,
-                            "name": item.matched_product.name,
-                            "product_code": item.matched_product.product_code
-                        } if item.matched_product else None
-                    }
-                    for item in items
-                ]
+                "items": items
             }
 
             result.append(order_data)
@@ -344,7 +453,7 @@ async def get_parsed_orders(
 async def select_orders(
     file_upload_id: int,
     order_ids: List[int],
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_user)
 ):
     """
@@ -352,27 +461,25 @@ async def select_orders(
     """
     try:
         # 验证文件所有权
-        file_upload = db.query(OrderFileUpload).filter(
-            OrderFileUpload.id == file_upload_id,
-            OrderFileUpload.uploaded_by == current_user.id
-        ).first()
+        file_upload = (await db.execute(
+            select(OrderFileUpload).where(
+                OrderFileUpload.id == file_upload_id,
+                OrderFileUpload.uploaded_by == current_user.id
+            )
+        )).scalars().first()
 
         if not file_upload:
             raise HTTPException(status_code=404, detail="文件记录不存在")
 
-        # 重置所有订单的选择状态
-        db.query(ParsedOrder).filter(
-            ParsedOrder.file_upload_id == file_upload_id
-        ).update({"is_selected": False})
-
-        # 设置选中的订单
-        if order_ids:
-            db.query(ParsedOrder).filter(
-                ParsedOrder.file_upload_id == file_upload_id,
-                ParsedOrder.id.in_(order_ids)
-            ).update({"is_selected": True})
+        # 🚀 性能优化：一条 UPDATE 同时设置选中和未选中的订单，不再先全部重置再逐一设置
+        is_selected = case((ParsedOrder.id.in_(order_ids), True), else_=False) if order_ids else False
+        await db.execute(
+            update(ParsedOrder).where(
+                ParsedOrder.file_upload_id == file_upload_id
+            ).values(is_selected=is_selected)
+        )
 
-        db.commit()
+        await db.commit()
 
         return {
             "success": True,
@@ -385,6 +492,65 @@ async def select_orders(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"选择订单失败: {str(e)}")
 
+# 流式输出发票项目时每批从数据库游标读取的行数
+INVOICE_STREAM_BATCH_SIZE = 1000
+
+
+def invoice_item_data(item, order) -> dict:
+    """将订单项目及其所属订单转换为发票项目字典"""
+    return {
+        "order_po_number": order.po_number,
+        "order_date": order.order_date.isoformat() if order.order_date else None,
+        "delivery_date": order.delivery_date.isoformat() if order.delivery_date else None,
+        "ship_name": order.ship_name,
+        "destination": order.destination,
+        "product_id_from_file": item.product_id_from_file,
+        "product_code": item.product_code,
+        "description": item.description,
+        "quantity": float(item.quantity),
+        "unit": item.unit,
+        "unit_price": float(item.unit_price),
+        "total_price": float(item.total_price),
+        "currency": order.currency,
+        "matched_product": {
+            "id": item.matched_product.id,
+            "name": item.matched_product.name,
+            "product_code": item.matched_product.product_code
+        } if item.matched_product else None,
+        "match_confidence": float(item.match_confidence) if item.match_confidence else 0.0
+    }
+
+
+def stream_invoice(head: bytes, file_upload_id: int):
+    """
+    先输出发票头部，再逐条输出选中订单的项目，最后补齐括号
+    🚀 性能优化：项目通过服务端游标分批读取并逐条序列化，内存占用不随项目数量增长
+    """
+    yield head + b',"items":['
+
+    # 依赖注入的会话在响应发送前就会关闭，流式读取使用独立会话
+    db = SessionLocal()
+    try:
+        stmt = select(ParsedOrderItem, ParsedOrder).join(
+            ParsedOrder, ParsedOrderItem.order_id == ParsedOrder.id
+        ).options(
+            joinedload(ParsedOrderItem.matched_product)
+        ).where(
+            ParsedOrder.file_upload_id == file_upload_id,
+            ParsedOrder.is_selected == True
+        ).order_by(ParsedOrder.id, ParsedOrderItem.id).execution_options(
+            yield_per=INVOICE_STREAM_BATCH_SIZE
+        )
+
+        separator = b""
+        for item, order in db.execute(stmt):
+            yield separator + orjson.dumps(invoice_item_data(item, order))
+            separator = b","
+    finally:
+        db.close()
+
+    yield b"]}}"
+
 @router.post("/generate-invoice/{file_upload_id}")
 async def generate_invoice(
     file_upload_id: int,
@@ -394,6 +560,7 @@ async def generate_invoice(
 ):
     """
     生成选中订单的发票
+    响应以流的形式返回，invoice_data.items 在汇总信息之后逐条输出
     """
     try:
         # 验证文件所有权
@@ -414,47 +581,26 @@ async def generate_invoice(
         if not selected_orders:
             raise HTTPException(status_code=400, detail="没有选择任何订单")
 
-        # 收集所有订单项目
-        all_items = []
-        total_amount = 0.0
-        total_items_count = 0
-
-        for order in selected_orders:
-            items = db.query(ParsedOrderItem).filter(
-                ParsedOrderItem.order_id == order.id
-            ).all()
-
-            for item in items:
-                item_data = {
-                    "order_po_number": order.po_number,
-                    "order_date": order.order_date.isoformat() if order.order_date else None,
-                    "delivery_date": order.delivery_date.isoformat() if order.delivery_date else None,
-                    "ship_name": order.ship_name,
-                    "destination": order.destination,
-                    "product_id_from_file": item.product_id_from_file,
-                    "product_code": item.product_code,
-                    "description": item.description,
-                    "quantity": float(item.quantity),
-                    "unit": item.unit,
-                    "unit_price": float(item.unit_price),
-                    "total_price": float(item.total_price),
-                    "currency": order.currency,
-                    "matched_product": {
-                        "id": item.matched_product.id,
-                        "name": item.matched_product.name,
-                        "product_code": item.matched_product.product_code
-                    } if item.matched_product else None,
-                    "match_confidence": float(item.match_confidence) if item.match_confidence else 0.0
-                }
+        # 🚀 性能优化：项目数量和金额由数据库聚合，项目明细留到响应流中再读取
+        total_items_count, total_amount = db.query(
+            func.count(ParsedOrderItem.id),
+            func.coalesce(func.sum(ParsedOrderItem.total_price), 0)
+        ).join(
+            ParsedOrder, ParsedOrderItem.order_id == ParsedOrder.id
+        ).filter(
+            ParsedOrder.file_upload_id == file_upload_id,
+            ParsedOrder.is_selected == True
+        ).one()
+        total_amount = float(total_amount)
 
-                all_items.append(item_data)
-                total_amount += float(item.total_price)
-                total_items_count += 1
+        # 生成时间只取一次；发票号附加随机后缀，避免同一秒内并发生成时重号
+        now = datetime.now(timezone.utc)
+        invoice_number = f"INV-{file_upload_id}-{now.strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:6]}"
 
-        # 生成发票数据
+        # 生成发票数据（项目明细不再写入会话记录，可按 selected_order_ids 重新生成）
         invoice_data = {
-            "invoice_number": f"INV-{file_upload_id}-{datetime.now().strftime('%Y%m%d%H%M%S')}",
-            "generated_date": datetime.now().isoformat(),
+            "invoice_number": invoice_number,
+            "generated_date": now.isoformat(),
             "file_info": {
                 "id": file_upload.id,
                 "original_file_name": file_upload.original_file_name,
@@ -478,8 +624,7 @@ async def generate_invoice(
                     "total_amount": float(order.total_amount)
                 }
                 for order in selected_orders
-            ],
-            "items": all_items
+            ]
         }
 
         # 创建处理会话记录
@@ -487,7 +632,7 @@ async def generate_invoice(
 
         session = OrderProcessingSession(
             file_upload_id=file_upload_id,
-            session_name=session_name or f"发票-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
+            session_name=session_name or f"发票-{now.strftime('%Y%m%d-%H%M%S')}",
             selected_order_ids=[order.id for order in selected_orders],
             total_selected_orders=len(selected_orders),
             total_selected_items=total_items_count,
@@ -502,12 +647,15 @@ async def generate_invoice(
         db.commit()
         db.refresh(session)
 
-        return {
+        # 去掉结尾的 "}}"，由 stream_invoice 在 invoice_data 中续写 items
+        head = orjson.dumps({
             "success": True,
             "message": "发票生成成功",
             "session_id": session.id,
             "invoice_data": invoice_data
-        }
+        })[:-2]
+
+        return StreamingResponse(stream_invoice(head, file_upload_id), media_type="application/json")
 
     except HTTPException:
         raise
@@ -518,18 +666,41 @@ async def generate_invoice(
 async def get_processing_sessions(
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(deps.get_db),
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_user)
 ):
     """
     获取用户的处理会话列表
+    传入上一页返回的 next_cursor（before_created_at + before_id）时按游标分页，否则按 skip 分页
     """
     try:
         from app.models.models import OrderProcessingSession
 
-        sessions = db.query(OrderProcessingSession).filter(
+        stmt = select(OrderProcessingSession).options(
+            selectinload(OrderProcessingSession.file_upload)
+        ).where(
             OrderProcessingSession.created_by == current_user.id
-        ).order_by(OrderProcessingSession.created_at.desc()).offset(skip).limit(limit).all()
+        ).order_by(OrderProcessingSession.created_at.desc(), OrderProcessingSession.id.desc())
+
+        if before_created_at is not None and before_id is not None:
+            stmt = stmt.where(
+                tuple_(OrderProcessingSession.created_at, OrderProcessingSession.id) < tuple_(before_created_at, before_id)
+            )
+        else:
+            stmt = stmt.offset(skip)
+
+        async with get_async_session_factory()() as count_db:
+            page_result, total = await asyncio.gather(
+                db.execute(stmt.limit(limit)),
+                count_db.scalar(
+                    select(func.count(OrderProcessingSession.id)).where(
+                        OrderProcessingSession.created_by == current_user.id
+                    )
+                )
+            )
+        sessions = page_result.scalars().all()
 
         result = []
         for session in sessions:
@@ -551,7 +722,8 @@ async def get_processing_sessions(
         return {
             "success": True,
             "data": result,
-            "total": len(result)
+            "total": total,
+            "next_cursor": next_cursor(sessions, limit)
         }
 
     except Exception as e:
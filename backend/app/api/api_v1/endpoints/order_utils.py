@@ -1,7 +1,7 @@
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, func
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import select, func, case
 
 from app import crud
 from app.api import deps
@@ -18,16 +18,32 @@ def get_orders_overview(
     """获取订单概览信息，包括每个订单的完成情况"""
     try:
         # 获取所有订单
-        orders = db.query(OrderModel).all()
+        # 🚀 性能优化：船舶、公司、港口在同一条查询中左连接并用 contains_eager 填充，
+        # 不再在循环中逐个订单懒加载（每个订单 3 次额外查询）
+        orders = db.query(OrderModel)\
+            .outerjoin(OrderModel.ship)\
+            .outerjoin(OrderModel.company)\
+            .outerjoin(OrderModel.port)\
+            .options(
+                contains_eager(OrderModel.ship),
+                contains_eager(OrderModel.company),
+                contains_eager(OrderModel.port)
+            ).all()
+        
+        # 🚀 性能优化：各订单的项目总数和已处理数量由数据库一次分组统计，不再逐个订单加载全部项目
+        item_counts = {
+            order_id: (total, int(processed or 0))
+            for order_id, total, processed in db.query(
+                OrderItemModel.order_id,
+                func.count(OrderItemModel.id),
+                func.sum(case((OrderItemModel.status == "processed", 1), else_=0))
+            ).group_by(OrderItemModel.order_id).all()
+        }
         
         result = []
         for order in orders:
-            # 获取每个订单的所有项目
-            order_items = db.query(OrderItemModel).filter(OrderItemModel.order_id == order.id).all()
-            
             # 计算已处理和未处理项目数量
-            total_items = len(order_items)
-            processed_items = sum(1 for i in order_items if i.status == "processed")
+            total_items, processed_items = item_counts.get(order.id, (0, 0))
             
             # 计算订单的完成百分比
             completion_percentage = 0
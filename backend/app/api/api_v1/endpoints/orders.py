@@ -1,7 +1,9 @@
 from typing import List, Optional, Any, Union
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, cast, Float
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+from sqlalchemy import select, update, delete, case, cast, exists, func, tuple_, Float
 from pydantic import BaseModel
 import os
 import shutil
@@ -10,6 +12,7 @@ from datetime import datetime
 import csv
 import tempfile
 from decimal import Decimal
+import anyio
 
 from app import crud
 from app.api import deps
@@ -20,10 +23,12 @@ from app.crud.crud_order import order as crud_order
 # from app.schemas.order_analysis import OrderAnalysis, OrderAnalysisItem  # OrderAnalysis models have been removed
 # from app.schemas.order_upload import OrderUpload  # OrderUpload models have been removed
 from app.schemas.order import Order, OrderCreate, OrderItemBase, OrderItem
-from app.utils.excel import create_order_items_excel
-from app.models.models import OrderItem as OrderItemModel, Order as OrderModel, Product as ProductModel, Supplier
+from app.utils.excel import create_order_items_excel, select_order_item_excel_rows, ORDER_ITEM_ID_CHUNK_SIZE
+from app.models.models import OrderItem as OrderItemModel, Order as OrderModel, Product as ProductModel, Supplier, Ship
 # NotificationHistory model has been removed
 from app.utils.email import send_email_with_attachments
+from app.utils.cache import TTLCache
+from app.api.api_v1.endpoints.suppliers import supplier_cache
 
 class PendingOrderResponse(BaseModel):
     id: int
@@ -38,33 +43,68 @@ class PendingOrderResponse(BaseModel):
     total: float
     status: str
 
+class PendingOrderCursor(BaseModel):
+    after_order_no: str
+    after_id: int
+
+class PendingOrderPage(BaseModel):
+    items: List[PendingOrderResponse]
+    next_cursor: Optional[PendingOrderCursor] = None
+
 class OrderStatusUpdate(BaseModel):
     status: str
 
 class OrderItemStatusUpdate(BaseModel):
     status: str
 
-router = APIRouter()
+# 🚀 性能优化：订单接口返回的列表较大，统一使用 orjson 序列化响应
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
+# 待处理订单项目列表首页缓存（按每页数量缓存，订单项目增删改后全部失效）
+# 每页数量来自请求参数，限制缓存的键数量，防止不同 limit 撑大内存
+PENDING_ORDERS_CACHE_KEY = "orders:pending"
+pending_orders_cache = TTLCache(ttl=60, maxsize=32)
+
+# 随订单通知邮件发送的 BOX 标签模板
+BOX_LABEL_PATH = os.path.join(os.path.dirname(__file__), '../../../../ BOXラベル&Palletラベル(A4横).xlsx')
+# 邮件附件副本在内存中保留的最大字节数，超过后写入磁盘临时文件
+ATTACHMENT_SPOOL_MAX_SIZE = 1024 * 1024
+
+# 待处理订单项目分页大小
+PENDING_ORDERS_DEFAULT_LIMIT = 500
+PENDING_ORDERS_MAX_LIMIT = 2000
+
+# INTEGER 主键的最大值
+MAX_INTEGER_ID = 2 ** 31 - 1
+
 @router.get("/statistics")
 def get_order_statistics(
     db: Session = Depends(deps.get_db),
 ):
     """获取订单统计信息"""
     try:
+        # 🚀 性能优化：每张表一条聚合查询，用 COUNT(*) FILTER 一次返回总数和各状态数量，不再加载整张表
         # 获取所有订单的状态统计
-        orders = db.query(OrderModel).all()
-        total_orders = len(orders)
-        not_started_orders = sum(1 for o in orders if o.status == "not_started")
-        partially_processed_orders = sum(1 for o in orders if o.status == "partially_processed")
-        fully_processed_orders = sum(1 for o in orders if o.status == "fully_processed")
+        order_counts = db.execute(
+            select(
+                func.count(),
+                func.count().filter(OrderModel.status == "not_started"),
+                func.count().filter(OrderModel.status == "partially_processed"),
+                func.count().filter(OrderModel.status == "fully_processed")
+            ).select_from(OrderModel)
+        ).one()
+        total_orders, not_started_orders, partially_processed_orders, fully_processed_orders = order_counts
 
         # 获取所有订单项的状态统计
-        order_items = db.query(OrderItemModel).all()
-        total_items = len(order_items)
-        processed_items = sum(1 for i in order_items if i.status == "processed")
-        unprocessed_items = sum(1 for i in order_items if i.status == "unprocessed")
+        item_counts = db.execute(
+            select(
+                func.count(),
+                func.count().filter(OrderItemModel.status == "processed"),
+                func.count().filter(OrderItemModel.status == "unprocessed")
+            ).select_from(OrderItemModel)
+        ).one()
+        total_items, processed_items, unprocessed_items = item_counts
 
         return {
             "total_orders": total_orders,
@@ -82,8 +122,8 @@ def get_order_statistics(
         )
 
 @router.get("/", response_model=List[Order])
-def get_orders(
-    db: Session = Depends(deps.get_db),
+async def get_orders(
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
@@ -91,41 +131,67 @@ def get_orders(
 ):
     """获取订单列表"""
     try:
-        logger.info(f"正在获取订单列表: skip={skip}, limit={limit}, status={status}, include_relations={include_relations}")
-        orders = crud_order.get_multi(db, skip=skip, limit=limit, status=status, include_relations=include_relations)
-        logger.info(f"成功获取 {len(orders)} 个订单")
+        logger.info("正在获取订单列表: skip=%s, limit=%s, status=%s, include_relations=%s", skip, limit, status, include_relations)
+        # 🚀 性能优化：异步会话查询期间不占用线程池线程
+        # 响应模型会序列化全部关联，异步会话不能懒加载，因此始终预加载关联数据；
+        # raiseload('*') 让未预加载的关联访问直接报错，避免退化为逐行懒加载
+        stmt = select(OrderModel).options(
+            selectinload(OrderModel.ship),
+            selectinload(OrderModel.company),
+            selectinload(OrderModel.port),
+            selectinload(OrderModel.order_items).selectinload(OrderItemModel.product),
+            selectinload(OrderModel.order_items).selectinload(OrderItemModel.supplier),
+            raiseload('*')
+        )
+        if status:
+            stmt = stmt.where(OrderModel.status == status)
+        orders = (await db.execute(stmt.offset(skip).limit(limit))).scalars().all()
+        logger.info("成功获取 %s 个订单", len(orders))
         return orders
     except Exception as e:
-        logger.error(f"获取订单列表失败: {str(e)}")
+        logger.error("获取订单列表失败: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"获取订单列表失败: {str(e)}"
         )
 
 @router.get("/{order_id}", response_model=Order)
-def get_order(
+async def get_order(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     order_id: int
 ):
     """获取订单详情"""
     try:
-        logger.info(f"正在获取订单详情: order_id={order_id}")
-        order = crud_order.get_with_items(db, id=order_id)
+        logger.info("正在获取订单详情: order_id=%s", order_id)
+        # 🚀 性能优化：订单项目及其产品、供应商用 selectinload 按 IN 批量加载，
+        # 不再与订单行做笛卡尔积；船舶、公司、港口是多对一关联，随订单一起 JOIN 加载
+        order = (await db.execute(
+            select(OrderModel).options(
+                selectinload(OrderModel.order_items).selectinload(OrderItemModel.product),
+                selectinload(OrderModel.order_items).selectinload(OrderItemModel.supplier),
+                joinedload(OrderModel.ship),
+                joinedload(OrderModel.company),
+                joinedload(OrderModel.port),
+                raiseload('*')
+            ).where(OrderModel.id == order_id)
+        )).scalars().one_or_none()
         if not order:
-            logger.warning(f"未找到订单: order_id={order_id}")
+            logger.warning("未找到订单: order_id=%s", order_id)
             raise HTTPException(
                 status_code=404,
                 detail="订单不存在"
             )
         
         # 添加详细的订单项目信息日志
-        logger.info(f"订单状态: {order.status}, 总金额: {order.total_amount}, 订单项目数量: {len(order.order_items) if order.order_items else 0}")
+        logger.info("订单状态: %s, 总金额: %s, 订单项目数量: %s", order.status, order.total_amount, len(order.order_items) if order.order_items else 0)
         if order.order_items:
-            for idx, item in enumerate(order.order_items):
-                logger.info(f"订单项目 #{idx+1}: ID={item.id}, 产品ID={item.product_id}, 状态={item.status}, 数量={item.quantity}, 价格={item.price}")
+            # 逐项日志只在 INFO 级别开启时遍历
+            if logger.isEnabledFor(logging.INFO):
+                for idx, item in enumerate(order.order_items):
+                    logger.info("订单项目 #%s: ID=%s, 产品ID=%s, 状态=%s, 数量=%s, 价格=%s", idx+1, item.id, item.product_id, item.status, item.quantity, item.price)
         else:
-            logger.warning(f"订单 {order_id} 没有关联的订单项目")
+            logger.warning("订单 %s 没有关联的订单项目", order_id)
             
         # 检查前端请求头信息
         logger.info("请求获取订单详情的前端信息已记录")
@@ -135,35 +201,37 @@ def get_order(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"获取订单详情失败: {str(e)}")
+        logger.error("获取订单详情失败: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"获取订单详情失败: {str(e)}"
         )
 
 @router.delete("/{order_id}")
-def delete_order(
+async def delete_order(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     order_id: int
 ):
     """删除订单"""
     try:
-        logger.info(f"正在删除订单: order_id={order_id}")
-        order = crud_order.get(db, id=order_id)
+        logger.info("正在删除订单: order_id=%s", order_id)
+        order = await db.get(OrderModel, order_id)
         if not order:
-            logger.warning(f"未找到订单: order_id={order_id}")
+            logger.warning("未找到订单: order_id=%s", order_id)
             raise HTTPException(
                 status_code=404,
                 detail="订单不存在"
             )
-        crud_order.remove(db, id=order_id)
+        await db.delete(order)
+        await db.commit()
+        pending_orders_cache.invalidate()
         logger.info("成功删除订单")
         return {"message": "删除成功"}
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"删除订单失败: {str(e)}")
+        logger.error("删除订单失败: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"删除订单失败: {str(e)}"
@@ -205,10 +273,11 @@ def delete_order(
 #         # 确保上传目录存在
 #         os.makedirs("uploads", exist_ok=True)
 #         
-#         # 保存文件
+#         # 保存文件（异步分块写入，不阻塞事件循环）
 #         file_path = f"uploads/{file.filename}"
-#         with open(file_path, "wb") as f:
-#             shutil.copyfileobj(file.file, f)
+#         async with await anyio.open_file(file_path, "wb") as f:
+#             while chunk := await file.read(1024 * 1024):
+#                 await f.write(chunk)
 #         
 #         # 创建订单记录
 #         result = order_upload.create_from_upload(
@@ -254,157 +323,272 @@ def delete_order(
 #     )
 #     return items
 
-@router.get("/list/pending", response_model=List[PendingOrderResponse])
-def get_pending_orders(
-    db: Session = Depends(deps.get_db),
+# 待处理订单项目查询
+# 🚀 性能优化：只查询响应需要的列，不构建订单项目、订单、船舶、产品、供应商 ORM 对象；
+# 语句没有参数，在模块加载时构建一次，请求时不再重复构建，编译结果由引擎的编译缓存复用
+PENDING_ORDERS_STMT = (
+    select(
+        OrderItemModel.id,
+        OrderItemModel.order_id,
+        OrderModel.order_no,
+        Ship.name.label("ship_name"),
+        ProductModel.product_name_en.label("product_name"),
+        ProductModel.code.label("product_code"),
+        Supplier.name.label("supplier_name"),
+        # 数量、单价、总价在 SQL 中转换为浮点数并把 NULL 置为 0，驱动直接返回 float，不再逐行转换 Decimal
+        func.coalesce(cast(OrderItemModel.quantity, Float), 0.0).label("quantity"),
+        func.coalesce(cast(OrderItemModel.price, Float), 0.0).label("price"),
+        func.coalesce(cast(OrderItemModel.total, Float), 0.0).label("total"),
+        OrderItemModel.status
+    )
+    .join(OrderModel, OrderItemModel.order_id == OrderModel.id)
+    .outerjoin(Ship, OrderModel.ship_id == Ship.id)
+    .outerjoin(ProductModel, OrderItemModel.product_id == ProductModel.id)
+    .outerjoin(Supplier, OrderItemModel.supplier_id == Supplier.id)
+    .where(OrderItemModel.status == 'unprocessed')
+    .order_by(OrderModel.order_no, OrderItemModel.id)
+)
+
+async def load_pending_orders(
+    db: AsyncSession,
+    limit: int,
+    after_order_no: Optional[str] = None,
+    after_id: Optional[int] = None
+) -> dict:
+    """
+    按 (订单编号, 订单项目ID) 游标查询一页待处理订单项目并转换为响应格式
+    🚀 性能优化：游标分页直接从上一页最后一条记录之后开始读取，单次响应大小有上限
+    """
+    stmt = PENDING_ORDERS_STMT
+    if after_order_no is not None and after_id is not None:
+        stmt = stmt.where(tuple_(OrderModel.order_no, OrderItemModel.id) > (after_order_no, after_id))
+    rows = (await db.execute(stmt.limit(limit))).all()
+    logger.info("查询到 %s 个待处理订单项目", len(rows))
+    
+    # 转换为响应格式：查询列名与 PendingOrderResponse 字段一致，直接由行映射构建字典，由 orjson 序列化
+    result = [dict(row._mapping) for row in rows]
+
+    # 不足一页说明已经是最后一页
+    next_cursor = None
+    if len(result) == limit:
+        last = result[-1]
+        next_cursor = {"after_order_no": last["order_no"], "after_id": last["id"]}
+    return {"items": result, "next_cursor": next_cursor}
+
+# 🚀 性能优化：列表已按 PendingOrderResponse 字段从数据库构建，不再经过响应模型逐项校验
+@router.get(
+    "/list/pending",
+    response_model=None,
+    responses={200: {"model": PendingOrderPage}}
+)
+async def get_pending_orders(
+    db: AsyncSession = Depends(deps.get_async_db),
+    limit: int = Query(PENDING_ORDERS_DEFAULT_LIMIT, ge=1, le=PENDING_ORDERS_MAX_LIMIT),
+    after_order_no: Optional[str] = None,
+    after_id: Optional[int] = None
 ):
     """
-    获取所有待处理订单项目
+    分页获取待处理订单项目
+    传入上一页返回的 next_cursor（after_order_no + after_id）获取下一页
     """
     try:
         logger.info("开始查询待处理订单项目")
         
-        # 使用 join 来获取更多信息
-        query = (
-            db.query(OrderItemModel)
-            .join(OrderModel)
-            .options(
-                joinedload(OrderItemModel.order),
-                joinedload(OrderItemModel.product),
-                joinedload(OrderItemModel.supplier),
-                joinedload(OrderItemModel.order).joinedload(OrderModel.ship)
+        if after_order_no is not None and after_id is not None:
+            result = await load_pending_orders(db, limit, after_order_no, after_id)
+        else:
+            # 🚀 性能优化：待处理列表只在订单项目变化时改变，首页结果缓存 60 秒，相关写操作后主动失效
+            result = await pending_orders_cache.get_or_load(
+                (PENDING_ORDERS_CACHE_KEY, limit), lambda: load_pending_orders(db, limit)
             )
-            .filter(OrderItemModel.status == 'unprocessed')
-            .order_by(OrderModel.order_no)
-        )
-        
-        items = query.all()
-        logger.info(f"查询到 {len(items)} 个待处理订单项目")
         
-        # 转换为响应格式
-        result = []
-        for item in items:
-            try:
-                result.append(PendingOrderResponse(
-                    id=item.id,
-                    order_id=item.order_id,
-                    order_no=item.order.order_no if item.order else "",
-                    ship_name=item.order.ship.name if item.order and item.order.ship else None,
-                    product_name=item.product.product_name_en if item.product else None,
-                    product_code=item.product.code if item.product else None,
-                    supplier_name=item.supplier.name if item.supplier else None,
-                    quantity=float(item.quantity) if item.quantity else 0.0,
-                    price=float(item.price) if item.price else 0.0,
-                    total=float(item.total) if item.total else 0.0,
-                    status=item.status
-                ))
-            except Exception as e:
-                logger.error(f"处理订单项目时出错: {str(e)}, 项目ID: {item.id}")
-                continue
-        
-        logger.info(f"成功构建响应数据，返回 {len(result)} 个有效订单项目")
+        logger.info("成功构建响应数据，返回 %s 个有效订单项目", len(result["items"]))
         return result
         
     except Exception as e:
-        logger.error(f"获取待处理订单项目失败: {str(e)}")
+        logger.error("获取待处理订单项目失败: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"获取待处理订单项目失败: {str(e)}"
         )
 
 @router.post("/items/{item_id}/process")
-def process_order(
+async def process_order(
     item_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
 ):
     """
     处理指定订单项目
     """
     try:
-        item = db.query(OrderItemModel).filter(OrderItemModel.id == item_id).first()
-        if not item:
-            raise HTTPException(status_code=404, detail="订单项目不存在")
-            
         # 更新订单状态
-        item.status = "processed"
-        db.add(item)
-        db.commit()
+        # 🚀 性能优化：UPDATE ... RETURNING 一次往返完成存在性检查和更新，不加载 ORM 对象
+        updated = (await db.execute(
+            update(OrderItemModel)
+            .where(OrderItemModel.id == item_id)
+            .values(status="processed")
+            .returning(OrderItemModel.id)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if not updated:
+            raise HTTPException(status_code=404, detail="订单项目不存在")
+
+        await db.commit()
+        pending_orders_cache.invalidate()
         
         return {"message": "订单项目已开始处理"}
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=str(e)
         )
 
 @router.post("/items/{item_id}/remove")
-def remove_pending_order(
+async def remove_pending_order(
     item_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
 ):
     """
     移除待处理订单项目
     """
     try:
-        item = db.query(OrderItemModel).filter(
-            OrderItemModel.id == item_id,
-            OrderItemModel.status == 'unprocessed'
-        ).first()
+        # 删除订单项目
+        # 🚀 性能优化：一条 DELETE 语句按 ID 和待处理状态删除，不再先加载订单项目再删除
+        result = await db.execute(
+            delete(OrderItemModel)
+            .where(
+                OrderItemModel.id == item_id,
+                OrderItemModel.status == 'unprocessed'
+            )
+            .execution_options(synchronize_session=False)
+        )
         
-        if not item:
+        if not result.rowcount:
             raise HTTPException(status_code=404, detail="待处理订单项目不存在")
             
-        # 删除订单项目
-        db.delete(item)
-        db.commit()
+        await db.commit()
+        pending_orders_cache.invalidate()
         
         return {"message": "订单项目已移除"}
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=str(e)
         )
 
 @router.post("/items/remove/all")
-def remove_all_pending_orders(
-    db: Session = Depends(deps.get_db),
+async def remove_all_pending_orders(
+    db: AsyncSession = Depends(deps.get_async_db),
 ):
     """
     移除所有待处理订单项目
     """
     try:
-        # 查询所有待处理订单项目
-        items = db.query(OrderItemModel).filter(
-            OrderItemModel.status == 'unprocessed'
-        ).all()
+        # 🚀 性能优化：一条 DELETE 语句删除所有待处理订单项目，不再逐个加载后逐条删除
+        result = await db.execute(
+            delete(OrderItemModel)
+            .where(OrderItemModel.status == 'unprocessed')
+            .execution_options(synchronize_session=False)
+        )
+        count = result.rowcount
         
-        if not items:
+        if not count:
+            await db.rollback()
             return {"message": "没有待处理的订单项目"}
             
-        # 删除所有待处理订单项目
-        count = 0
-        for item in items:
-            db.delete(item)
-            count += 1
-            
-        db.commit()
+        await db.commit()
+        pending_orders_cache.invalidate()
         
         return {"message": f"成功移除 {count} 个待处理订单项目"}
         
     except Exception as e:
-        db.rollback()
-        logger.error(f"移除所有待处理订单项目失败: {str(e)}")
+        await db.rollback()
+        logger.error("移除所有待处理订单项目失败: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"移除所有待处理订单项目失败: {str(e)}"
         )
 
+async def load_supplier_contact(db: AsyncSession, supplier_id: int):
+    """查询发送邮件所需的供应商ID、名称和邮箱，供应商不存在时返回 None"""
+    return (await db.execute(
+        select(Supplier.id, Supplier.name, Supplier.email).where(Supplier.id == supplier_id)
+    )).first()
+
+async def read_box_label_attachment() -> Optional[dict]:
+    """读取 BOX 标签模板作为邮件附件，文件不存在或读取失败时返回 None"""
+    try:
+        if not os.path.exists(BOX_LABEL_PATH):
+            logger.warning("BOX标签文件不存在: %s", BOX_LABEL_PATH)
+            return None
+        async with await anyio.open_file(BOX_LABEL_PATH, 'rb') as f:
+            box_label_content = await f.read()
+    except Exception as e:
+        logger.error("添加BOX标签文件失败: %s", e)
+        # 不影响主流程，继续发送邮件
+        return None
+    return {
+        'content': box_label_content,
+        'filename': 'BOXラベル&Palletラベル(A4横).xlsx',
+        'content_type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    }
+
+async def send_order_email_job(
+    to_email: str,
+    subject: str,
+    body: str,
+    order_items: List[Any],
+    excel_filename: str,
+    box_label: Optional[dict],
+    extra_attachments: List[dict],
+    cc_list: Optional[List[str]] = None,
+    bcc_list: Optional[List[str]] = None
+) -> None:
+    """后台任务：生成订单项目 Excel，附上 BOX 标签和额外附件后发送邮件"""
+    try:
+        # 创建Excel文件
+        # 🚀 性能优化：生成 Excel 是 CPU 密集型操作，放到工作线程中执行，不阻塞事件循环
+        excel_file = await anyio.to_thread.run_sync(create_order_items_excel, order_items)
+
+        # 准备所有附件
+        attachments = [
+            {
+                'content': excel_file,
+                'filename': excel_filename,
+                'content_type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            }
+        ]
+
+        # 添加BOX标签文件作为第二个附件
+        if box_label is not None:
+            attachments.append(box_label)
+
+        # 添加额外的附件
+        attachments.extend(extra_attachments)
+
+        # 发送邮件
+        await send_email_with_attachments(
+            to_email=to_email,
+            subject=subject,
+            body=body,
+            attachments=attachments,
+            cc_list=cc_list,
+            bcc_list=bcc_list
+        )
+        logger.info("订单通知邮件已发送: to=%s", to_email)
+    except Exception:
+        logger.exception("发送订单通知邮件失败: to=%s", to_email)
+    finally:
+        for attachment in extra_attachments:
+            attachment['content'].close()
+
 @router.post("/send-email")
 async def send_order_email(
+    background_tasks: BackgroundTasks,
     supplier_id: int = Form(...),
     title: str = Form(...),
     content: str = Form(...),
@@ -412,14 +596,17 @@ async def send_order_email(
     cc_list: str = Form(default=""),  # 接收为逗号分隔的邮箱列表
     bcc_list: str = Form(default=""),  # 接收为逗号分隔的邮箱列表
     additional_attachments: List[UploadFile] = File([]),
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_async_db)
 ):
     """
-    向供应商发送订单通知邮件
+    向供应商发送订单通知邮件（校验和查询在请求中完成，邮件在后台发送）
     """
     try:
         # 获取供应商信息
-        supplier = crud.supplier.get(db, id=supplier_id)
+        # 🚀 性能优化：短时间内向同一供应商连续发送邮件时直接使用缓存，省去一次数据库查询
+        supplier = await supplier_cache.get_or_load(
+            supplier_id, lambda: load_supplier_contact(db, supplier_id)
+        )
         if not supplier:
             raise HTTPException(status_code=404, detail="供应商不存在")
         
@@ -433,67 +620,50 @@ async def send_order_email(
         # 解析订单项目ID列表
         try:
             order_item_ids_list = [int(id) for id in order_item_ids.split(',')]
+            # 超出 INTEGER 主键范围的ID同样按格式错误处理
+            if any(not 0 < id <= MAX_INTEGER_ID for id in order_item_ids_list):
+                raise ValueError(order_item_ids)
         except ValueError:
             raise HTTPException(status_code=400, detail="订单项目ID格式不正确")
 
         # 获取订单项目信息
-        order_items = db.query(OrderItemModel)\
-            .filter(OrderItemModel.id.in_(order_item_ids_list))\
-            .options(
-                joinedload(OrderItemModel.order),
-                joinedload(OrderItemModel.product),
-            ).all()
+        # 🚀 性能优化：只查询 Excel 需要的列；ID 按块拆分，避免超长 IN 列表的解析和绑定参数上限
+        order_items = []
+        for start in range(0, len(order_item_ids_list), ORDER_ITEM_ID_CHUNK_SIZE):
+            chunk = order_item_ids_list[start:start + ORDER_ITEM_ID_CHUNK_SIZE]
+            order_items.extend((await db.execute(select_order_item_excel_rows(chunk))).all())
         
         if not order_items:
             raise HTTPException(status_code=404, detail="未找到指定的订单项目")
 
-        # 创建Excel文件
-        excel_file = create_order_items_excel(order_items)
-
-        # 准备所有附件
-        attachments = [
-            {
-                'content': excel_file,
-                'filename': f'order_items_{supplier.name}.xlsx',
-                'content_type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            }
-        ]
-
-        # 添加BOX标签文件作为第二个附件
-        try:
-            import os
-            box_label_path = os.path.join(os.path.dirname(__file__), '../../../../ BOXラベル&Palletラベル(A4横).xlsx')
-            if os.path.exists(box_label_path):
-                with open(box_label_path, 'rb') as f:
-                    box_label_content = f.read()
-                attachments.append({
-                    'content': box_label_content,
-                    'filename': 'BOXラベル&Palletラベル(A4横).xlsx',
-                    'content_type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-                })
-                logger.info("已添加BOX标签文件作为附件")
-            else:
-                logger.warning(f"BOX标签文件不存在: {box_label_path}")
-        except Exception as e:
-            logger.error(f"添加BOX标签文件失败: {str(e)}")
-            # 不影响主流程，继续发送邮件
-
-        # 添加额外的附件
-        if additional_attachments:
-            for attachment in additional_attachments:
-                content = await attachment.read()
-                attachments.append({
-                    'content': content,
-                    'filename': attachment.filename,
-                    'content_type': attachment.content_type
-                })
-        
-        # 发送邮件
-        await send_email_with_attachments(
+        # 复制额外的附件
+        # 上传文件在请求结束后关闭，后台任务使用自己的 SpooledTemporaryFile 副本（超过 1MB 落盘），
+        # 内存占用不随附件大小增长
+        extra_attachments = []
+        for attachment in additional_attachments:
+            await attachment.seek(0)
+            spooled = tempfile.SpooledTemporaryFile(max_size=ATTACHMENT_SPOOL_MAX_SIZE)
+            await anyio.to_thread.run_sync(shutil.copyfileobj, attachment.file, spooled)
+            spooled.seek(0)
+            extra_attachments.append({
+                'content': spooled,
+                'filename': attachment.filename,
+                'content_type': attachment.content_type
+            })
+
+        # BOX 标签在请求中读取，返回的附件数量与实际发送的一致
+        box_label = await read_box_label_attachment()
+
+        # 🚀 性能优化：生成 Excel 和发送邮件在响应返回后由后台任务完成，请求不再等待 SMTP
+        background_tasks.add_task(
+            send_order_email_job,
             to_email=supplier.email,
             subject=title,
             body=content,
-            attachments=attachments,
+            order_items=order_items,
+            excel_filename=f'order_items_{supplier.name}.xlsx',
+            box_label=box_label,
+            extra_attachments=extra_attachments,
             cc_list=cc_emails,
             bcc_list=bcc_emails
         )
@@ -505,22 +675,21 @@ async def send_order_email(
         #     content=content,
         # )
         # db.add(notification_history)
-        db.commit()
 
         return {
-            "message": "邮件发送成功",
+            "message": "邮件发送任务已添加到队列",
             "details": {
                 "to": supplier.email,
                 "cc": cc_emails,
                 "bcc": bcc_emails,
-                "attachments_count": len(attachments)
+                "attachments_count": 1 + (box_label is not None) + len(extra_attachments)
             }
         }
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"发送邮件失败: {str(e)}")
 
 @router.post("/", response_model=Order)
@@ -531,12 +700,13 @@ def create_order(
 ):
     """创建新订单"""
     try:
-        logger.info(f"开始创建新订单: {order_in.order_no}")
+        logger.info("开始创建新订单: %s", order_in.order_no)
         order = crud_order.create_with_items(db, obj_in=order_in)
-        logger.info(f"订单创建成功: id={order.id}, order_no={order.order_no}")
+        pending_orders_cache.invalidate()
+        logger.info("订单创建成功: id=%s, order_no=%s", order.id, order.order_no)
         return order
     except Exception as e:
-        logger.error(f"创建订单失败: {str(e)}")
+        logger.error("创建订单失败: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"创建订单失败: {str(e)}"
@@ -551,10 +721,10 @@ def update_order_status(
 ):
     """更新订单状态"""
     try:
-        logger.info(f"正在更新订单状态: order_id={order_id}, 新状态={status_update.status}")
+        logger.info("正在更新订单状态: order_id=%s, 新状态=%s", order_id, status_update.status)
         order = crud_order.get(db, id=order_id)
         if not order:
-            logger.warning(f"未找到订单: order_id={order_id}")
+            logger.warning("未找到订单: order_id=%s", order_id)
             raise HTTPException(
                 status_code=404,
                 detail="订单不存在"
@@ -564,12 +734,12 @@ def update_order_status(
         order_in = {"status": status_update.status}
         updated_order = crud_order.update(db, db_obj=order, obj_in=order_in)
         
-        logger.info(f"成功更新订单状态: order_id={order_id}, 新状态={updated_order.status}")
+        logger.info("成功更新订单状态: order_id=%s, 新状态=%s", order_id, updated_order.status)
         return {"message": "更新成功", "order_id": order_id, "status": updated_order.status}
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"更新订单状态失败: {str(e)}")
+        logger.error("更新订单状态失败: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"更新订单状态失败: {str(e)}"
@@ -584,44 +754,61 @@ def update_order_items_status(
 ):
     """批量更新订单项状态"""
     try:
-        logger.info(f"尝试批量更新订单项状态: order_id={order_id}, new_status={status_update.status}")
-        
-        order = crud_order.get_with_items(db, id=order_id)
-        if not order:
-            logger.warning(f"未找到订单: order_id={order_id}")
-            raise HTTPException(status_code=404, detail="订单不存在")
+        logger.info("尝试批量更新订单项状态: order_id=%s, new_status=%s", order_id, status_update.status)
         
-        updated_count = 0
-        if order.order_items:
-            for item in order.order_items:
-                try:
-                    item.status = status_update.status
-                    updated_count += 1
-                    logger.info(f"已更新订单项状态: item_id={item.id}, new_status={status_update.status}")
-                except Exception as e:
-                    logger.error(f"更新订单项状态失败: item_id={item.id}, error={str(e)}")
-            
-            db.commit()
-            
-            # 根据订单项状态更新订单状态
-            if all(item.status == "processed" for item in order.order_items):
-                order.status = "fully_processed"
-            elif any(item.status == "processed" for item in order.order_items):
-                order.status = "partially_processed"
-            else:
-                order.status = "not_started"
-            
-            db.commit()
-            logger.info(f"订单状态已更新: order_id={order_id}, new_status={order.status}")
+        # 🚀 性能优化：一条 UPDATE 语句更新订单的全部订单项，不再加载订单项后逐条更新
+        updated_count = db.execute(
+            update(OrderItemModel)
+            .where(OrderItemModel.order_id == order_id)
+            .values(status=status_update.status)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        if not updated_count:
+            if db.get(OrderModel, order_id) is None:
+                logger.warning("未找到订单: order_id=%s", order_id)
+                raise HTTPException(status_code=404, detail="订单不存在")
+            return {
+                "message": "更新成功",
+                "order_id": order_id,
+                "updated_items_count": 0,
+                "order_status": "无更改"
+            }
+        logger.info("已更新订单项状态: order_id=%s, 数量=%s, new_status=%s", order_id, updated_count, status_update.status)
+
+        # 根据订单项状态更新订单状态（由数据库统计已处理数量并计算，同一条语句返回新状态）
+        processed_count = func.sum(case((OrderItemModel.status == "processed", 1), else_=0))
+        aggregate_status = (
+            select(
+                case(
+                    (processed_count == func.count(OrderItemModel.id), "fully_processed"),
+                    (processed_count > 0, "partially_processed"),
+                    else_="not_started"
+                )
+            )
+            .where(OrderItemModel.order_id == order_id)
+            .scalar_subquery()
+        )
+        order_status = db.execute(
+            update(OrderModel)
+            .where(OrderModel.id == order_id)
+            .values(status=aggregate_status)
+            .returning(OrderModel.status)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
+
+        db.commit()
+        pending_orders_cache.invalidate()
+        logger.info("订单状态已更新: order_id=%s, new_status=%s", order_id, order_status)
             
         return {
             "message": "更新成功",
             "order_id": order_id,
             "updated_items_count": updated_count,
-            "order_status": order.status if updated_count > 0 else "无更改"
+            "order_status": order_status
         }
     except Exception as e:
-        logger.error(f"更新订单项状态发生错误: {str(e)}")
+        logger.error("更新订单项状态发生错误: %s", e)
         raise HTTPException(status_code=500, detail=f"更新订单项状态失败: {str(e)}")
 
 @router.post("/items", response_model=OrderItem)
@@ -632,24 +819,30 @@ def create_order_item(
 ):
     """创建新的订单项目"""
     try:
-        logger.info(f"尝试创建新的订单项目: order_id={item_data.order_id}, product_id={item_data.product_id}")
+        logger.info("尝试创建新的订单项目: order_id=%s, product_id=%s", item_data.order_id, item_data.product_id)
         
+        # 🚀 性能优化：订单、产品、供应商是否存在由一条查询同时检查，不再依次查询三次
+        order_exists, product_exists, supplier_exists = db.execute(
+            select(
+                exists().where(OrderModel.id == item_data.order_id),
+                exists().where(ProductModel.id == item_data.product_id),
+                exists().where(Supplier.id == item_data.supplier_id)
+            )
+        ).one()
+
         # 检查订单是否存在
-        order = crud_order.get(db, id=item_data.order_id)
-        if not order:
-            logger.warning(f"未找到订单: order_id={item_data.order_id}")
+        if not order_exists:
+            logger.warning("未找到订单: order_id=%s", item_data.order_id)
             raise HTTPException(status_code=404, detail="订单不存在")
         
         # 检查产品是否存在
-        product = db.query(ProductModel).get(item_data.product_id)
-        if not product:
-            logger.warning(f"未找到产品: product_id={item_data.product_id}")
+        if not product_exists:
+            logger.warning("未找到产品: product_id=%s", item_data.product_id)
             raise HTTPException(status_code=404, detail="产品不存在")
         
         # 检查供应商是否存在
-        supplier = db.query(Supplier).get(item_data.supplier_id)
-        if not supplier:
-            logger.warning(f"未找到供应商: supplier_id={item_data.supplier_id}")
+        if not supplier_exists:
+            logger.warning("未找到供应商: supplier_id=%s", item_data.supplier_id)
             raise HTTPException(status_code=404, detail="供应商不存在")
         
         # 创建新的订单项目
@@ -664,17 +857,20 @@ def create_order_item(
         )
         
         db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
         
         # 更新订单总金额
-        if order.total_amount is None:
-            order.total_amount = new_item.total
-        else:
-            order.total_amount = order.total_amount + new_item.total
+        # 在数据库中累加，与新订单项目在同一事务中提交，避免并发添加时读-改-写覆盖
+        db.execute(
+            update(OrderModel)
+            .where(OrderModel.id == item_data.order_id)
+            .values(total_amount=func.coalesce(OrderModel.total_amount, 0) + item_data.total)
+            .execution_options(synchronize_session=False)
+        )
         db.commit()
+        db.refresh(new_item)
+        pending_orders_cache.invalidate()
         
-        logger.info(f"成功创建订单项目: id={new_item.id}")
+        logger.info("成功创建订单项目: id=%s", new_item.id)
         
         return new_item
     except HTTPException:
@@ -682,5 +878,5 @@ def create_order_item(
         raise
     except Exception as e:
         db.rollback()
-        logger.error(f"创建订单项目失败: {str(e)}")
+        logger.error("创建订单项目失败: %s", e)
         raise HTTPException(status_code=500, detail=f"创建订单项目失败: {str(e)}")
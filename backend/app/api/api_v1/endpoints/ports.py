@@ -1,9 +1,12 @@
 from typing import List, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 from app.api import deps
 from app.schemas.port import PortCreate, PortUpdate, Port
 from app.crud.crud_port import port
+from app.models.models import Port as PortModel
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,8 +14,8 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/", response_model=List[Port])
-def read_ports(
-    db: Session = Depends(deps.get_db),
+async def read_ports(
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
     country_id: Optional[int] = None,
@@ -21,7 +24,11 @@ def read_ports(
     获取港口列表
     """
     logger.info(f"获取港口列表，参数: skip={skip}, limit={limit}, country_id={country_id}")
-    result = port.get_multi(db, skip=skip, limit=limit, country_id=country_id)
+    # 🚀 性能优化：异步会话查询期间不占用线程池线程；响应包含国家信息，随港口一起加载
+    stmt = select(PortModel).options(joinedload(PortModel.country))
+    if country_id is not None:
+        stmt = stmt.where(PortModel.country_id == country_id)
+    result = (await db.execute(stmt.offset(skip).limit(limit))).scalars().all()
     logger.info(f"返回 {len(result)} 个港口")
     return result
 
@@ -71,15 +78,15 @@ def update_port(
         )
 
 @router.get("/{port_id}", response_model=Port)
-def read_port(
+async def read_port(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     port_id: int,
 ) -> Any:
     """
     根据ID获取港口信息
     """
-    port_obj = port.get(db, id=port_id)
+    port_obj = await db.get(PortModel, port_id, options=[joinedload(PortModel.country)])
     if not port_obj:
         raise HTTPException(
             status_code=404,
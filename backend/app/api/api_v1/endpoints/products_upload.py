@@ -95,7 +95,7 @@ def preload_reference_data(db: Session) -> Dict[str, Dict[str, int]]:
         logger.error(f"Failed to load reference data: {str(e)}")
         return {'countries': {}, 'categories': {}, 'suppliers': {}, 'ports': {}}
 
-def process_product_row(row: pd.Series, row_number: int, db: Session, reference_data: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+def process_product_row(row: Dict[str, Any], row_number: int, db: Session, reference_data: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
     """Process a single product row"""
     try:
         # Validate required fields
@@ -186,21 +186,9 @@ def process_product_row(row: pd.Series, row_number: int, db: Session, reference_
                     "field": "port_name"
                 }
 
-        # Check for duplicates based on unique constraint (country_id, product_name_en, port_id)
+        # In-memory checks (required fields, preloaded foreign keys, value parsing)
+        # run first; the duplicate lookup is the only database query, so it runs last
         product_name_en = str(row.get("product_name_en")).strip()
-        existing_product = db.query(Product).filter(
-            Product.product_name_en == product_name_en,
-            Product.country_id == country_id,
-            Product.port_id == port_id
-        ).first()
-
-        if existing_product:
-            return {
-                "status": "skipped",
-                "row": row_number,
-                "product_name": product_name_en,
-                "reason": f"产品已存在（相同国家和港口）"
-            }
 
         # Parse dates
         try:
@@ -261,7 +249,7 @@ def process_product_row(row: pd.Series, row_number: int, db: Session, reference_
                 }
 
         # Validate product code format if provided
-        code = str(row.get("code", "")).strip() or None
+        code = str(row.get("code") or "").strip() or None
         if code and len(code) > 50:
             return {
                 "status": "error",
@@ -281,7 +269,7 @@ def process_product_row(row: pd.Series, row_number: int, db: Session, reference_
                 "field": "product_name_en"
             }
 
-        product_name_jp = str(row.get("product_name_jp", "")).strip() or None
+        product_name_jp = str(row.get("product_name_jp") or "").strip() or None
         if product_name_jp and len(product_name_jp) > 255:
             return {
                 "status": "error",
@@ -291,6 +279,21 @@ def process_product_row(row: pd.Series, row_number: int, db: Session, reference_
                 "field": "product_name_jp"
             }
 
+        # Check for duplicates based on unique constraint (country_id, product_name_en, port_id)
+        existing_product = db.query(Product).filter(
+            Product.product_name_en == product_name_en,
+            Product.country_id == country_id,
+            Product.port_id == port_id
+        ).first()
+
+        if existing_product:
+            return {
+                "status": "skipped",
+                "row": row_number,
+                "product_name": product_name_en,
+                "reason": f"产品已存在（相同国家和港口）"
+            }
+
         # Create product
         product = Product(
             product_name_en=product_name_en,
@@ -300,13 +303,13 @@ def process_product_row(row: pd.Series, row_number: int, db: Session, reference_
             category_id=category_id,
             supplier_id=supplier_id,
             port_id=port_id,
-            unit=str(row.get("unit", "")).strip() or None,
+            unit=str(row.get("unit") or "").strip() or None,
             price=price,
-            unit_size=str(row.get("unit_size", "")).strip() or None,
-            pack_size=str(row.get("pack_size", "")).strip() or None,
-            country_of_origin=str(row.get("country_of_origin", "")).strip() or None,
-            brand=str(row.get("brand", "")).strip() or None,
-            currency=str(row.get("currency", "JPY")).strip(),
+            unit_size=str(row.get("unit_size") or "").strip() or None,
+            pack_size=str(row.get("pack_size") or "").strip() or None,
+            country_of_origin=str(row.get("country_of_origin") or "").strip() or None,
+            brand=str(row.get("brand") or "").strip() or None,
+            currency=str(row.get("currency") or "JPY").strip(),
             effective_from=effective_from,
             effective_to=effective_to,
             status=str(row.get("status", "true")).lower() in ["true", "1", "yes"],
@@ -377,8 +380,12 @@ async def upload_products_simple(
 
         logger.info(f"Starting product upload: {len(df)} rows, upload_id: {upload_id}")
 
+        # Convert the frame to plain dicts once (NaN -> None); dict lookups in the
+        # row loop are much cheaper than indexing a pd.Series per cell
+        records = df.astype(object).where(pd.notna(df), None).to_dict("records")
+
         # Process each row
-        for index, row in df.iterrows():
+        for index, row in zip(df.index, records):
             try:
                 row_result = process_product_row(row, index + 2, db, reference_data)
                 
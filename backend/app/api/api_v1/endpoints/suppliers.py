@@ -1,6 +1,6 @@
 from typing import List, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, File, UploadFile, Form
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from pydantic import BaseModel
 import json
 import logging
@@ -12,9 +12,9 @@ from app import crud
 from app.api import deps
 from app.schemas.supplier import SupplierCreate, SupplierUpdate, Supplier
 from app.utils.email import send_email_with_attachments
-from app.utils.excel import create_order_items_excel
-from app.models.models import OrderItem as models
+from app.utils.excel import create_order_items_excel, select_order_item_excel_rows, ORDER_ITEM_ID_CHUNK_SIZE
 from app.utils.gmail_sender import create_gmail_sender
+from app.utils.cache import TTLCache
 from app.api.api_v2.endpoints.excel_generator import create_purchase_order_excel, PurchaseOrderRequest, ProductItem
 # NotificationHistory model has been removed
 
@@ -22,6 +22,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 供应商联系信息缓存（按供应商ID，发送订单邮件时使用；供应商更新或删除后失效）
+supplier_cache = TTLCache(ttl=60, maxsize=1024)
+
 class CategoryUpdate(BaseModel):
     category_ids: List[int]
 
@@ -78,6 +81,7 @@ def update_supplier(
     if not supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
     supplier = crud.supplier.update(db, db_obj=supplier, obj_in=supplier_in)
+    supplier_cache.invalidate(supplier_id)
     return supplier
 
 @router.get("/{supplier_id}", response_model=Supplier)
@@ -107,6 +111,7 @@ def delete_supplier(
     if not supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
     supplier = crud.supplier.remove(db, id=supplier_id)
+    supplier_cache.invalidate(supplier_id)
     return {"ok": True}
 
 @router.put("/{supplier_id}/categories", response_model=Supplier)
@@ -162,12 +167,10 @@ async def send_order_notification(
         order_item_ids_list = json.loads(order_item_ids)
 
         # 获取订单项目信息
-        order_items = db.query(models.OrderItem)\
-            .filter(models.OrderItem.id.in_(order_item_ids_list))\
-            .options(
-                joinedload(models.OrderItem.order),
-                joinedload(models.OrderItem.product),
-            ).all()
+        order_items = []
+        for start in range(0, len(order_item_ids_list), ORDER_ITEM_ID_CHUNK_SIZE):
+            chunk = order_item_ids_list[start:start + ORDER_ITEM_ID_CHUNK_SIZE]
+            order_items.extend(db.execute(select_order_item_excel_rows(chunk)).all())
         
         if not order_items:
             raise HTTPException(status_code=404, detail="未找到指定的订单项目")
@@ -87,6 +87,19 @@ class Settings(BaseSettings):
             return self.SUPABASE_DB_URL
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
 
+    @property
+    def get_async_database_url(self) -> str:
+        """异步引擎使用的数据库URL：PostgreSQL 使用 asyncpg 驱动，SQLite 使用 aiosqlite 驱动"""
+        url = self.get_database_url
+        if url.startswith("sqlite:///"):
+            return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+        for prefix in ("postgresql+asyncpg://", "postgresql+psycopg2://", "postgresql://", "postgres://"):
+            if url.startswith(prefix):
+                url = "postgresql+asyncpg://" + url[len(prefix):]
+                # asyncpg 不识别 libpq 的 sslmode 参数，改用 ssl
+                return url.replace("sslmode=", "ssl=")
+        raise ValueError(f"异步数据库接口只支持 PostgreSQL 和 SQLite，当前数据库URL不受支持: {url.split('://', 1)[0]}")
+
     def setup_logging(self):
         logging_config = {
             "version": 1,
@@ -1,5 +1,5 @@
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.crud.base import CRUDBase
 from app.models.models import OrderAssignment, OrderAnalysisItem
 from app.schemas.order_assignment import OrderAssignmentCreate
@@ -38,6 +38,20 @@ class CRUDOrderAssignment(CRUDBase[OrderAssignment, OrderAssignmentCreate, Order
         db.commit()
         return assignments
     
+    def get_multi_with_items(
+        self,
+        db: Session,
+        *,
+        ids: List[int]
+    ) -> List[OrderAssignment]:
+        """按ID获取分配记录，并预加载分析项目及其匹配产品和类别，避免逐条懒加载"""
+        return db.query(OrderAssignment).options(
+            selectinload(OrderAssignment.analysis_item).selectinload(OrderAnalysisItem.matched_product),
+            selectinload(OrderAssignment.analysis_item).selectinload(OrderAnalysisItem.category),
+        ).filter(
+            OrderAssignment.id.in_(ids)
+        ).order_by(OrderAssignment.id).all()
+    
     def get_by_supplier(
         self,
         db: Session,
@@ -75,5 +89,26 @@ class CRUDOrderAssignment(CRUDBase[OrderAssignment, OrderAssignmentCreate, Order
         db.commit()
         db.refresh(assignment)
         return assignment
+    
+    def update_notification_status_bulk(
+        self,
+        db: Session,
+        *,
+        assignment_ids: List[int],
+        notification_status: str
+    ) -> int:
+        """批量更新通知状态，一条 UPDATE ... WHERE id IN (...) 完成，返回更新的行数"""
+        if not assignment_ids:
+            return 0
+        
+        updated = db.query(OrderAssignment).filter(
+            OrderAssignment.id.in_(assignment_ids)
+        ).update(
+            {OrderAssignment.notification_status: notification_status},
+            synchronize_session=False
+        )
+        # 提交后会话中的对象会过期，再次访问时读取到更新后的状态
+        db.commit()
+        return updated
 
 order_assignment = CRUDOrderAssignment(OrderAssignment) 
\ No newline at end of file
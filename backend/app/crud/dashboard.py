@@ -1,31 +1,41 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, select
 from app.models.models import Product, Supplier, Order, Ship, Company, Port
 from datetime import datetime, timedelta
 
 def get_dashboard_stats(db: Session):
     """获取仪表盘统计数据"""
-    # 获取总数统计
-    total_products = db.query(func.count(Product.id)).scalar() or 0
-    total_suppliers = db.query(func.count(Supplier.id)).scalar() or 0
-    total_orders = db.query(func.count(Order.id)).scalar() or 0
-    total_ships = db.query(func.count(Ship.id)).scalar() or 0
-    total_companies = db.query(func.count(Company.id)).scalar() or 0
-    total_ports = db.query(func.count(Port.id)).scalar() or 0
-
-    # 获取待处理订单数量（状态为 not_started 的订单）
-    total_pending_orders = db.query(func.count(Order.id)).filter(
-        Order.status == "not_started"
-    ).scalar() or 0
-
-    # 获取最近30天的订单数量
+    # 🚀 性能优化：所有计数作为标量子查询合并到一条 SELECT 中，一次数据库往返完成
     thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    orders_last_30_days = db.query(func.count(Order.id)).filter(
-        Order.created_at >= thirty_days_ago
-    ).scalar() or 0
+    stats = db.execute(select(
+        # 获取总数统计
+        select(func.count(Product.id)).scalar_subquery().label("total_products"),
+        select(func.count(Supplier.id)).scalar_subquery().label("total_suppliers"),
+        select(func.count(Order.id)).scalar_subquery().label("total_orders"),
+        select(func.count(Ship.id)).scalar_subquery().label("total_ships"),
+        select(func.count(Company.id)).scalar_subquery().label("total_companies"),
+        select(func.count(Port.id)).scalar_subquery().label("total_ports"),
+        # 获取待处理订单数量（状态为 not_started 的订单）
+        select(func.count(Order.id)).where(
+            Order.status == "not_started"
+        ).scalar_subquery().label("total_pending_orders"),
+        # 获取最近30天的订单数量
+        select(func.count(Order.id)).where(
+            Order.created_at >= thirty_days_ago
+        ).scalar_subquery().label("orders_last_30_days"),
+        # 获取活跃的供应商数量（有关联产品的供应商）
+        select(func.count(func.distinct(Product.supplier_id))).scalar_subquery().label("active_suppliers")
+    )).one()
 
-    # 获取活跃的供应商数量（有关联产品的供应商）
-    active_suppliers = db.query(func.count(func.distinct(Product.supplier_id))).scalar() or 0
+    total_products = stats.total_products or 0
+    total_suppliers = stats.total_suppliers or 0
+    total_orders = stats.total_orders or 0
+    total_ships = stats.total_ships or 0
+    total_companies = stats.total_companies or 0
+    total_ports = stats.total_ports or 0
+    total_pending_orders = stats.total_pending_orders or 0
+    orders_last_30_days = stats.orders_last_30_days or 0
+    active_suppliers = stats.active_suppliers or 0
 
     return {
         "total_products": total_products,
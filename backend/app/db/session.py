@@ -1,10 +1,34 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
 engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 异步引擎在第一次使用时创建，未使用异步接口的部署无需安装异步驱动
+_async_session_factory = None
+
+def get_async_session_factory() -> async_sessionmaker:
+    """获取异步会话工厂（PostgreSQL 使用 asyncpg，SQLite 使用 aiosqlite），查询期间不阻塞事件循环"""
+    global _async_session_factory
+    if _async_session_factory is None:
+        async_engine = create_async_engine(
+            settings.get_async_database_url,
+            pool_pre_ping=True,
+            # 与同步引擎的默认连接池（5 + 10）并存，每个进程最多占用 30 个数据库连接，
+            # 多进程部署时需确认 进程数 × 30 不超过数据库的 max_connections
+            pool_size=5,
+            max_overflow=10
+        )
+        _async_session_factory = async_sessionmaker(
+            async_engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return _async_session_factory
+
 def get_db():
     db = SessionLocal()
     try:
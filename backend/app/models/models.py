@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Numeric, Text, UniqueConstraint, CheckConstraint, JSON
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Numeric, Text, UniqueConstraint, CheckConstraint, JSON, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -174,7 +174,7 @@ class Order(Base):
     port_id = Column(Integer, ForeignKey("ports.id"))
     order_date = Column(DateTime, nullable=False)
     delivery_date = Column(DateTime)
-    status = Column(String(20), default="not_started")  # not_started, partially_processed, fully_processed
+    status = Column(String(20), default="not_started", index=True)  # not_started, partially_processed, fully_processed
     total_amount = Column(Numeric(10, 2), default=0)
     notes = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -199,6 +199,11 @@ class OrderItem(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # 待处理订单项目列表按状态过滤、按订单关联，部分索引只包含未处理的项目
+        Index('ix_order_items_status_order_id', 'status', 'order_id', postgresql_where=text("status = 'unprocessed'")),
+    )
+
     order = relationship("Order", back_populates="order_items")
     product = relationship("Product", back_populates="order_items")
     supplier = relationship("Supplier", back_populates="order_items")
@@ -2,8 +2,8 @@
 Excel文件解析服务
 用于解析邮轮订单Excel文件
 """
-import pandas as pd
 import re
+from openpyxl import load_workbook
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 from decimal import Decimal
@@ -30,14 +30,14 @@ class CruiseOrderParser:
         """
         try:
             # 读取Excel文件
-            df = pd.read_excel(file_path, header=None)
+            rows = self._read_rows(file_path)
             
             # 重置解析状态
             self.orders = []
             self.errors = []
             
             # 解析数据
-            self._parse_dataframe(df)
+            self._parse_rows(rows)
             
             return {
                 "success": True,
@@ -56,15 +56,37 @@ class CruiseOrderParser:
                 "errors": [f"文件解析失败: {str(e)}"]
             }
     
-    def _parse_dataframe(self, df: pd.DataFrame):
-        """解析DataFrame数据"""
+    def _read_rows(self, file_path: str) -> List[List[str]]:
+        """
+        读取第一个工作表的所有行并转换为字符串列表（空单元格为空字符串）
+        🚀 性能优化：openpyxl 只读模式按行流式读取单元格值，不构建 DataFrame，也不逐格调用 ws.cell()
+        """
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = []
+            for values in workbook.worksheets[0].iter_rows(values_only=True):
+                # 与 pandas 读取一致：整数值的浮点数按整数处理
+                rows.append([
+                    "" if value is None
+                    else str(int(value)) if isinstance(value, float) and value.is_integer()
+                    else str(value)
+                    for value in values
+                ])
+        finally:
+            workbook.close()
+        
+        # 去掉末尾的空行和空列，与 pandas 读取的数据范围一致
+        while rows and not any(rows[-1]):
+            rows.pop()
+        width = max((i + 1 for row in rows for i, cell in enumerate(row) if cell != ""), default=0)
+        return [row[:width] + [""] * (width - len(row)) for row in rows]
+    
+    def _parse_rows(self, rows: List[List[str]]):
+        """解析按行读取的单元格数据"""
         current_order = None
         
-        for index, row in df.iterrows():
+        for index, row_data in enumerate(rows):
             try:
-                # 转换为字符串列表，处理NaN值
-                row_data = [str(cell) if pd.notna(cell) else "" for cell in row]
-                
                 if not row_data or all(cell == "" for cell in row_data):
                     continue
                 
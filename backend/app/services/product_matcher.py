@@ -9,14 +9,35 @@ import re
 from difflib import SequenceMatcher
 import logging
 
+try:
+    from rapidfuzz import fuzz, process as rapidfuzz_process
+except ImportError:  # rapidfuzz 未安装时退回逐个产品的 difflib 比较
+    fuzz = None
+    rapidfuzz_process = None
+
 logger = logging.getLogger(__name__)
 
+# 批量模糊匹配时每批订单项目数量，限制相似度矩阵的内存占用
+FUZZY_BATCH_SIZE = 500
+
+# 模糊名称匹配的字段及对应的匹配类型
+FUZZY_NAME_FIELDS = (("name_en", "fuzzy_name_en"), ("name_jp", "fuzzy_name_jp"))
+
+# 关键词提取：特殊字符替换为空格，过滤停用词
+KEYWORD_CLEAN_PATTERN = re.compile(r'[^\w\s]')
+KEYWORD_STOP_WORDS = frozenset({'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'})
+
 class ProductMatcher:
     """产品匹配器"""
     
     def __init__(self, db: Session):
         self.db = db
         self.products_cache = None
+        # 产品代码 / 名称（小写）到产品的索引，精确匹配时直接查字典
+        self._by_code = {}
+        self._by_name = {}
+        # 模糊匹配用的小写名称：字段 -> (产品在缓存中的下标列表, 小写名称列表)
+        self._fuzzy_choices = {}
         self._load_products()
     
     def _load_products(self):
@@ -38,10 +59,24 @@ class ProductMatcher:
                 }
                 for p in products
             ]
+            # 🚀 性能优化：建立精确匹配索引，代替每次匹配时遍历全部产品；同名时保留最先加载的产品
+            for product in self.products_cache:
+                if product["code"]:
+                    self._by_code.setdefault(product["code"].lower(), product)
+                for name in (product["name_en"], product["name_jp"]):
+                    if name:
+                        self._by_name.setdefault(name.lower(), product)
+            # 🚀 性能优化：产品名称在加载时统一转小写一次，模糊匹配时不再对每个产品重复处理
+            for field, _ in FUZZY_NAME_FIELDS:
+                choices = [(index, product[field].lower()) for index, product in enumerate(self.products_cache) if product[field]]
+                self._fuzzy_choices[field] = ([index for index, _ in choices], [text for _, text in choices])
             logger.info(f"加载了 {len(self.products_cache)} 个产品到缓存")
         except Exception as e:
             logger.error(f"加载产品缓存失败: {str(e)}")
             self.products_cache = []
+            self._by_code = {}
+            self._by_name = {}
+            self._fuzzy_choices = {}
     
     def _create_search_text(self, product: Product) -> str:
         """创建产品搜索文本"""
@@ -56,12 +91,13 @@ class ProductMatcher:
             texts.append(product.brand.lower())
         return " ".join(texts)
     
-    def match_product(self, order_item: Dict[str, Any]) -> Dict[str, Any]:
+    def match_product(self, order_item: Dict[str, Any], fuzzy_matches: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         匹配单个产品
         
         Args:
             order_item: 订单项目字典
+            fuzzy_matches: 预先批量计算好的模糊匹配结果，为 None 时逐个产品计算
             
         Returns:
             匹配结果字典
@@ -104,7 +140,8 @@ class ProductMatcher:
         
         # 3. 模糊名称匹配
         if product_name:
-            fuzzy_matches = self._match_by_fuzzy_name(product_name)
+            if fuzzy_matches is None:
+                fuzzy_matches = self._match_by_fuzzy_name(product_name)
             matches.extend(fuzzy_matches)
         
         # 4. 关键词匹配
@@ -137,31 +174,26 @@ class ProductMatcher:
     
     def _match_by_code(self, product_code: str) -> Optional[Dict[str, Any]]:
         """通过产品代码精确匹配"""
-        code_lower = product_code.lower()
-        
-        for product in self.products_cache:
-            if product["code"].lower() == code_lower:
-                return {
-                    "product_id": product["id"],
-                    "confidence": 1.0,
-                    "match_type": "exact_code",
-                    "product": product
-                }
+        product = self._by_code.get(product_code.lower())
+        if product:
+            return {
+                "product_id": product["id"],
+                "confidence": 1.0,
+                "match_type": "exact_code",
+                "product": product
+            }
         return None
     
     def _match_by_exact_name(self, product_name: str) -> Optional[Dict[str, Any]]:
         """通过产品名称精确匹配"""
-        name_lower = product_name.lower().strip()
-        
-        for product in self.products_cache:
-            if (product["name_en"].lower() == name_lower or 
-                product["name_jp"].lower() == name_lower):
-                return {
-                    "product_id": product["id"],
-                    "confidence": 1.0,
-                    "match_type": "exact_name",
-                    "product": product
-                }
+        product = self._by_name.get(product_name.lower().strip())
+        if product:
+            return {
+                "product_id": product["id"],
+                "confidence": 1.0,
+                "match_type": "exact_name",
+                "product": product
+            }
         return None
     
     def _match_by_fuzzy_name(self, product_name: str, threshold: float = 0.8) -> List[Dict[str, Any]]:
@@ -169,29 +201,58 @@ class ProductMatcher:
         matches = []
         name_lower = product_name.lower().strip()
         
-        for product in self.products_cache:
-            # 与英文名称比较
-            if product["name_en"]:
-                similarity = SequenceMatcher(None, name_lower, product["name_en"].lower()).ratio()
+        # 分别与英文名称、日文名称比较
+        for field, match_type in FUZZY_NAME_FIELDS:
+            indexes, texts = self._fuzzy_choices.get(field, ([], []))
+            for index, text in zip(indexes, texts):
+                similarity = SequenceMatcher(None, name_lower, text).ratio()
                 if similarity >= threshold:
+                    product = self.products_cache[index]
                     matches.append({
                         "product_id": product["id"],
                         "confidence": similarity,
-                        "match_type": "fuzzy_name_en",
+                        "match_type": match_type,
                         "product": product
                     })
-            
-            # 与日文名称比较
-            if product["name_jp"]:
-                similarity = SequenceMatcher(None, name_lower, product["name_jp"].lower()).ratio()
-                if similarity >= threshold:
-                    matches.append({
+        
+        return matches
+    
+    def _match_by_fuzzy_names(self, product_names: List[str], threshold: float = 0.8) -> List[List[Dict[str, Any]]]:
+        """
+        批量模糊名称匹配，返回与 product_names 一一对应的匹配列表
+        🚀 性能优化：用 rapidfuzz.process.cdist 一次计算整批名称与全部产品的相似度矩阵（C 实现、多线程），
+        代替逐个名称、逐个产品的 SequenceMatcher 比较
+        """
+        if rapidfuzz_process is None:
+            return [self._match_by_fuzzy_name(name, threshold) for name in product_names]
+
+        queries = [name.lower().strip() for name in product_names]
+        results = []
+        for field, match_type in FUZZY_NAME_FIELDS:
+            choice_indexes, choice_texts = self._fuzzy_choices.get(field, ([], []))
+            if not choice_texts:
+                continue
+            for start in range(0, len(queries), FUZZY_BATCH_SIZE):
+                scores = rapidfuzz_process.cdist(
+                    queries[start:start + FUZZY_BATCH_SIZE],
+                    choice_texts,
+                    scorer=fuzz.ratio,
+                    score_cutoff=threshold * 100,
+                    workers=-1
+                )
+                # 低于阈值的得分为 0，只取非零位置
+                for row, column in zip(*scores.nonzero()):
+                    product = self.products_cache[choice_indexes[column]]
+                    results.append((start + row, {
                         "product_id": product["id"],
-                        "confidence": similarity,
-                        "match_type": "fuzzy_name_jp",
+                        "confidence": float(scores[row, column]) / 100,
+                        "match_type": match_type,
                         "product": product
-                    })
-        
+                    }))
+
+        matches = [[] for _ in queries]
+        for query_index, match in results:
+            matches[query_index].append(match)
         return matches
     
     def _match_by_keywords(self, product_name: str, threshold: float = 0.6) -> List[Dict[str, Any]]:
@@ -218,12 +279,11 @@ class ProductMatcher:
     def _extract_keywords(self, text: str) -> List[str]:
         """提取关键词"""
         # 移除特殊字符，分割单词
-        cleaned = re.sub(r'[^\w\s]', ' ', text.lower())
+        cleaned = KEYWORD_CLEAN_PATTERN.sub(' ', text.lower())
         words = cleaned.split()
         
         # 过滤停用词和短词
-        stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-        keywords = [word for word in words if len(word) > 2 and word not in stop_words]
+        keywords = [word for word in words if len(word) > 2 and word not in KEYWORD_STOP_WORDS]
         
         return keywords
     
@@ -259,6 +319,24 @@ class ProductMatcher:
         
         return unique_matches
     
+    def match_products(self, order_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        批量匹配产品，返回与 order_items 一一对应的匹配结果
+        模糊名称匹配对整批订单项目一次完成，其余匹配策略与 match_product 相同
+        """
+        if not self.products_cache:
+            return [self.match_product(item) for item in order_items]
+
+        names = [(item.get("product_name") or "").strip() for item in order_items]
+        named_indexes = [index for index, name in enumerate(names) if name]
+        fuzzy_results = self._match_by_fuzzy_names([names[index] for index in named_indexes])
+        fuzzy_by_index = dict(zip(named_indexes, fuzzy_results))
+
+        return [
+            self.match_product(item, fuzzy_matches=fuzzy_by_index.get(index))
+            for index, item in enumerate(order_items)
+        ]
+    
     def match_order_items(self, order_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         批量匹配订单项目
@@ -0,0 +1,78 @@
+"""
+进程内 TTL 缓存
+用于缓存读多写少的查询结果（cache-aside），写操作后主动失效
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class TTLCache:
+    """带过期时间和容量上限的进程内缓存，超过容量时淘汰最久未使用的键；同一个键的并发加载只执行一次"""
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # 键 -> [锁, 正在使用该锁的请求数]，最后一个请求用完后删除，避免锁随键无限增长
+        self._locks: Dict[Hashable, List[Any]] = {}
+        # 每次失效递增，加载期间发生失效时不写入加载结果，避免缓存写入前的旧数据
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """获取未过期的缓存值，不存在或已过期时返回 None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """写入缓存值，超过容量时淘汰最久未使用的键"""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """删除指定键的缓存，不传键时清空全部缓存"""
+        self._generation += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        命中缓存直接返回；未命中时调用 loader 加载并写入缓存
+        加载期间持有该键的锁，并发请求等待第一个请求的结果，避免缓存击穿
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        holder = self._locks.get(key)
+        if holder is None:
+            holder = self._locks[key] = [asyncio.Lock(), 0]
+        holder[1] += 1
+        try:
+            async with holder[0]:
+                value = self.get(key)
+                if value is None:
+                    generation = self._generation
+                    value = await loader()
+                    if generation == self._generation:
+                        self.set(key, value)
+        finally:
+            holder[1] -= 1
+            if holder[1] == 0:
+                self._locks.pop(key, None)
+        return value
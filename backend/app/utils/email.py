@@ -2,14 +2,14 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
-from typing import List, Dict, Optional, Union
+from typing import BinaryIO, List, Dict, Optional, Union
 from app.core.config import settings
 
 async def send_email_with_attachments(
     to_email: str,
     subject: str,
     body: str,
-    attachments: List[Dict[str, Union[bytes, str]]],
+    attachments: List[Dict[str, Union[bytes, str, BinaryIO]]],
     cc_list: Optional[List[str]] = None,
     bcc_list: Optional[List[str]] = None
 ) -> None:
@@ -20,7 +20,7 @@ async def send_email_with_attachments(
     :param subject: 邮件主题
     :param body: 邮件正文
     :param attachments: 附件列表，每个附件是一个字典，包含：
-        - content: 附件内容（bytes）
+        - content: 附件内容（bytes，或可分块读取的二进制文件对象，如上传文件的临时文件）
         - filename: 附件文件名
         - content_type: 附件MIME类型
     :param cc_list: 抄送列表，可选
@@ -1,20 +1,51 @@
 import pandas as pd
 from io import BytesIO
-from typing import List
-from app.models.models import OrderItem
+from typing import Any, List, Sequence
+from sqlalchemy import Select, select
+from app.models.models import OrderItem, Order, Ship, Product
 
-def create_order_items_excel(order_items: List[OrderItem]) -> bytes:
+# 按订单项目ID查询时每条 IN 语句包含的ID数量上限
+ORDER_ITEM_ID_CHUNK_SIZE = 1000
+
+
+def select_order_item_excel_rows(order_item_ids: Sequence[int]) -> Select:
+    """
+    构造查询订单项目 Excel 所需列的语句（同步和异步会话通用）
+    🚀 性能优化：只查询 Excel 用到的列，不构建订单项目、订单、船舶、产品 ORM 对象
+    """
+    return (
+        select(
+            Order.order_no,
+            Ship.name.label("ship_name"),
+            Product.product_name_en.label("product_name"),
+            Product.code.label("product_code"),
+            OrderItem.quantity,
+            OrderItem.price,
+            OrderItem.total,
+            OrderItem.status,
+            OrderItem.created_at
+        )
+        .outerjoin(Order, OrderItem.order_id == Order.id)
+        .outerjoin(Ship, Order.ship_id == Ship.id)
+        .outerjoin(Product, OrderItem.product_id == Product.id)
+        .where(OrderItem.id.in_(order_item_ids))
+        .order_by(OrderItem.id)
+    )
+
+
+def create_order_items_excel(order_items: List[Any]) -> bytes:
     """
     将订单项目信息转换为Excel文件
+    order_items 为 select_order_item_excel_rows 查询返回的行
     """
     # 准备数据
     data = []
     for item in order_items:
         data.append({
-            '订单编号': item.order.order_no if item.order else '',
-            '船舶': item.order.ship.name if item.order and item.order.ship else '',
-            '产品名称': item.product.name if item.product else '',
-            '产品代码': item.product.code if item.product else '',
+            '订单编号': item.order_no or '',
+            '船舶': item.ship_name or '',
+            '产品名称': item.product_name or '',
+            '产品代码': item.product_code or '',
             '数量': float(item.quantity),
             '单价': float(item.price),
             '总价': float(item.total),
@@ -0,0 +1,40 @@
+"""add_order_items_status_index
+
+Revision ID: 311895e667dc
+Revises: 763921598f3f
+Create Date: 2026-10-16 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '311895e667dc'
+down_revision: Union[str, None] = '763921598f3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 待处理订单项目的部分索引，CONCURRENTLY 创建不锁表，需要在事务外执行
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_order_items_status_order_id',
+            'order_items',
+            ['status', 'order_id'],
+            unique=False,
+            postgresql_where=sa.text("status = 'unprocessed'"),
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_order_items_status_order_id',
+            table_name='order_items',
+            postgresql_concurrently=True
+        )
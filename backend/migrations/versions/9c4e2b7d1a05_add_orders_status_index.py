@@ -0,0 +1,39 @@
+"""add_orders_status_index
+
+Revision ID: 9c4e2b7d1a05
+Revises: 311895e667dc
+Create Date: 2026-10-16 23:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e2b7d1a05'
+down_revision: Union[str, None] = '311895e667dc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 订单按状态统计和过滤（仪表盘待处理订单数、订单列表状态筛选），CONCURRENTLY 创建不锁表，需要在事务外执行
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_orders_status'),
+            'orders',
+            ['status'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_orders_status'),
+            table_name='orders',
+            postgresql_concurrently=True
+        )
@@ -1,12 +1,14 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.db.base import Base
 from app.db.session import get_db
+from app.api import deps
 from app.core.config import settings
 
 # 使用内存数据库进行测试
@@ -18,6 +20,10 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# async 端点使用同一个测试数据库文件（aiosqlite 驱动）
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=StaticPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # 设置测试数据库
 @pytest.fixture(scope="function")
 def db():
@@ -44,6 +50,13 @@ def client(db):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[deps.get_db] = override_get_db
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+
+    app.dependency_overrides[deps.get_async_db] = override_get_async_db
     
     with TestClient(app) as c:
         yield c
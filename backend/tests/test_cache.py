@@ -0,0 +1,33 @@
+import asyncio
+
+from app.utils.cache import TTLCache
+
+# 测试进程内 TTL 缓存
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # 访问 a 之后，b 成为最久未使用的键
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+def test_ttl_cache_loads_once_and_releases_lock():
+    cache = TTLCache(ttl=60, maxsize=8)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*[cache.get_or_load("key", loader) for _ in range(5)])
+
+    assert asyncio.run(run()) == ["value"] * 5
+    assert len(calls) == 1
+    # 加载完成后不再保留该键的锁
+    assert cache._locks == {}
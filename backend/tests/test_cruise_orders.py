@@ -0,0 +1,41 @@
+import asyncio
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.api_v1.endpoints import cruise_orders, orders
+from app.models.models import Category, Company, Country, Port, Product, Ship, Supplier
+from app.schemas.cruise_order import CruiseOrderHeader, CruiseOrderProduct
+
+# 测试邮轮订单导入
+def test_created_cruise_order_appears_in_pending_list(client: TestClient, db: Session):
+    db.add_all([
+        Country(id=1, name="日本", code="JP", status=True),
+        Category(id=1, name="食品", code="FOOD", status=True),
+    ])
+    db.add(Company(id=1, name="测试公司", country_id=1, status=True))
+    db.add(Port(id=1, name="东京港", code="TYO", country_id=1, status=True))
+    db.add(Ship(id=1, name="测试船舶", company_id=1, capacity=100, status=True))
+    db.add(Supplier(id=1, name="测试供应商", country_id=1, status=True))
+    db.add(Product(id=1, product_name_en="Apple", code="P1", country_id=1, category_id=1, effective_from=datetime(2024, 1, 1)))
+    db.commit()
+    orders.pending_orders_cache.invalidate()
+
+    # 先请求一次，待处理列表首页被缓存
+    assert client.get("/api/v1/orders/list/pending").json()["items"] == []
+
+    order_data = CruiseOrderHeader(
+        po_number="PO-001",
+        ship_name="测试船舶",
+        supplier_name="测试供应商",
+        destination_port="东京港",
+        delivery_date=datetime(2024, 2, 1),
+        total_amount=30,
+        products=[CruiseOrderProduct(product_name="Apple", quantity=3, unit_price=10, total_price=30)]
+    )
+    asyncio.run(cruise_orders._create_order_from_cruise_data(db, order_data))
+
+    items = client.get("/api/v1/orders/list/pending").json()["items"]
+    assert [(item["order_no"], item["product_name"], item["total"]) for item in items] == [("PO-001", "Apple", 30.0)]
+    orders.pending_orders_cache.invalidate()
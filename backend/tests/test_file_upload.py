@@ -0,0 +1,127 @@
+import re
+
+import pandas as pd
+import pytest
+from sqlalchemy.orm import Session
+
+from app.api.api_v1.endpoints import file_upload
+from app.api.api_v1.endpoints.file_upload import DuplicateHandlingStrategy
+from app.models.models import Category, Country, Port, Product, Supplier
+
+# 测试数据导入（upload 接口使用的逐行提交导入）的校验和外键解析
+@pytest.fixture
+def reference_data(db: Session):
+    # 外键映射缓存跨测试共享，每个测试重新加载
+    file_upload.invalidate_foreign_key_cache()
+    db.add_all([
+        Country(id=1, name="日本", code="JP", status=True),
+        Category(id=1, name="食品", code="FOOD", status=True),
+    ])
+    db.add(Supplier(id=1, name="测试供应商", country_id=1, status=True))
+    db.add(Port(id=1, name="东京港", code="TYO", country_id=1, status=True))
+    db.add(Product(product_name_en="Existing", country_id=1, category_id=1, effective_from=pd.Timestamp("2024-01-01")))
+    db.commit()
+    yield
+    file_upload.invalidate_foreign_key_cache()
+
+def product_frame(rows):
+    base = {
+        "country_name": "日本",
+        "category_name": "食品",
+        "effective_from": "2024-01-01",
+        "price": 10,
+    }
+    return pd.DataFrame([{**base, **row} for row in rows])
+
+def product_names(db: Session):
+    return sorted(name for (name,) in db.query(Product.product_name_en))
+
+def test_resolve_foreign_keys_maps_names_to_ids():
+    df = pd.DataFrame({"country_name": ["日本", "不存在", None]})
+    resolved = file_upload._resolve_foreign_keys(df, "ports", {"countries": {"日本": 1}})
+    assert resolved["country_id"].tolist()[0] == 1
+    assert resolved["country_id"].isna().tolist() == [False, True, True]
+
+def test_atomic_import_error_strategy_stops_at_bad_row(db: Session, reference_data):
+    df = product_frame([
+        {"product_name_en": "Apple"},
+        {"product_name_en": "Pear", "country_name": "火星"},
+        {"product_name_en": "Plum"},
+    ])
+    with pytest.raises(Exception, match="第3行: 国家 '火星' 不存在"):
+        file_upload.import_table_data_atomic("products", df, db)
+
+    # 逐行提交：出错行之前的行已经写入，之后的行不再处理
+    assert product_names(db) == ["Apple", "Existing"]
+
+@pytest.mark.parametrize("row, message", [
+    ({"product_name_en": "Existing"}, "第2行: 产品 'Existing' 已存在"),
+    ({"product_name_en": "Apple", "price": -1}, "第2行: price (价格) 不能为负数"),
+    ({"product_name_en": "Apple", "price": "abc"}, "第2行: price (价格) 格式错误，必须为数字"),
+    ({"product_name_en": "Apple", "effective_to": "2023-01-01"}, "第2行: 结束日期不能早于起始日期"),
+    ({"product_name_en": "Apple", "supplier_name": "不存在的供应商"}, "第2行: 供应商 '不存在的供应商' 不存在"),
+])
+def test_atomic_import_error_strategy_rejects_row(db: Session, reference_data, row, message):
+    with pytest.raises(Exception, match=re.escape(message)):
+        file_upload.import_table_data_atomic("products", product_frame([row]), db)
+    assert product_names(db) == ["Existing"]
+
+def test_atomic_import_skip_strategy_imports_valid_rows(db: Session, reference_data, monkeypatch):
+    monkeypatch.setitem(file_upload.DUPLICATE_STRATEGIES, "products", DuplicateHandlingStrategy.SKIP)
+    df = product_frame([
+        {"product_name_en": "Apple", "supplier_name": "测试供应商", "port_name": "东京港"},
+        {"product_name_en": "Existing"},
+        {"product_name_en": "Pear", "port_name": "不存在的港口"},
+        {"product_name_en": "Apple"},
+        {"product_name_en": "Plum", "effective_to": "2023-01-01"},
+        {"product_name_en": "Fig", "effective_from": "2024-03-01"},
+    ])
+    result = file_upload.import_table_data_atomic("products", df, db)
+
+    assert result.success_count == 2
+    assert result.skipped_items == [
+        "第3行: 产品 'Existing' 已存在，已跳过",
+        "第5行: 产品 'Apple' 已存在，已跳过",
+    ]
+    assert result.errors == [
+        "第4行: 港口 '不存在的港口' 不存在",
+        "第6行: 结束日期不能早于起始日期",
+    ]
+    assert product_names(db) == ["Apple", "Existing", "Fig"]
+    apple = db.query(Product).filter(Product.product_name_en == "Apple").one()
+    assert (apple.supplier_id, apple.port_id) == (1, 1)
+    # 没有结束日期时默认为起始日期后 90 天
+    fig = db.query(Product).filter(Product.product_name_en == "Fig").one()
+    assert (fig.effective_to - fig.effective_from).days == file_upload.DEFAULT_EFFECTIVE_DAYS
+
+def test_atomic_import_mixed_date_formats(db: Session, reference_data):
+    # effective_from 列混有两种格式：pandas 按第一行推断的格式解析出 Timestamp，
+    # 其余行按 %Y-%m-%d 回退解析为 date，与 effective_to 列的 Timestamp 出现在同一行
+    df = product_frame([
+        {"product_name_en": "Apple", "effective_from": "2024/03/15", "effective_to": "2024-06-01"},
+        {"product_name_en": "Pear", "effective_from": "2024-02-01", "effective_to": "2024-05-01"},
+        {"product_name_en": "Plum", "effective_from": "2024-02-01"},
+    ])
+    result = file_upload.import_table_data_atomic("products", df, db)
+
+    assert result.success_count == 3
+    assert result.errors == []
+    dates = {name: (start.date().isoformat(), end.date().isoformat()) for name, start, end in
+             db.query(Product.product_name_en, Product.effective_from, Product.effective_to)
+             .filter(Product.product_name_en != "Existing")}
+    assert dates["Apple"] == ("2024-03-15", "2024-06-01")
+    assert dates["Pear"] == ("2024-02-01", "2024-05-01")
+    # 没有结束日期时默认为起始日期后 90 天
+    assert dates["Plum"] == ("2024-02-01", "2024-05-01")
+
+def test_atomic_import_zero_price_is_stored_as_null(db: Session, reference_data):
+    df = product_frame([
+        {"product_name_en": "Apple", "price": 0},
+        {"product_name_en": "Pear", "price": 12.5},
+    ])
+    result = file_upload.import_table_data_atomic("products", df, db)
+
+    assert result.success_count == 2
+    prices = dict(db.query(Product.product_name_en, Product.price).filter(Product.product_name_en != "Existing"))
+    assert prices["Apple"] is None
+    assert float(prices["Pear"]) == 12.5
@@ -0,0 +1,107 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.api_v1.endpoints import orders
+from app.models.models import Category, Company, Country, Order, OrderItem, Port, Product, Ship, Supplier
+from app.schemas.order import OrderItemBase
+
+# 测试订单API
+@pytest.fixture
+def order_data(db: Session):
+    db.add_all([
+        Country(id=1, name="日本", code="JP", status=True),
+        Category(id=1, name="食品", code="FOOD", status=True),
+    ])
+    db.add(Company(id=1, name="测试公司", country_id=1, status=True))
+    db.add(Port(id=1, name="东京港", code="TYO", country_id=1, status=True))
+    db.add(Ship(id=1, name="测试船舶", company_id=1, capacity=100, status=True))
+    db.add(Supplier(id=1, name="测试供应商", country_id=1, status=True))
+    db.add(Product(id=1, product_name_en="Apple", code="P1", country_id=1, category_id=1, effective_from=datetime(2024, 1, 1)))
+    db.add_all([
+        Order(id=1, order_no="ON-001", ship_id=1, company_id=1, port_id=1, order_date=datetime(2024, 1, 1), status="not_started", total_amount=10),
+        Order(id=2, order_no="ON-002", ship_id=1, company_id=1, port_id=1, order_date=datetime(2024, 1, 2), status="partially_processed", total_amount=None),
+        Order(id=3, order_no="ON-003", ship_id=1, company_id=1, port_id=1, order_date=datetime(2024, 1, 3), status="fully_processed", total_amount=0),
+    ])
+    # 每个订单 2 个项目，其中订单 ON-003 的项目已处理
+    for item_id, order_id in enumerate([2, 1, 2, 1, 3, 3], start=1):
+        db.add(OrderItem(
+            id=item_id, order_id=order_id, product_id=1, supplier_id=1,
+            quantity=item_id, price=2.5, total=item_id * 2.5,
+            status="processed" if order_id == 3 else "unprocessed"
+        ))
+    db.commit()
+    # 待处理列表首页缓存跨测试共享，每个测试重新加载
+    orders.pending_orders_cache.invalidate()
+    yield
+    orders.pending_orders_cache.invalidate()
+
+def test_order_statistics(client: TestClient, order_data):
+    response = client.get("/api/v1/orders/statistics")
+    assert response.status_code == 200
+    assert response.json() == {
+        "total_orders": 3,
+        "not_started_orders": 1,
+        "partially_processed_orders": 1,
+        "fully_processed_orders": 1,
+        "total_items": 6,
+        "processed_items": 2,
+        "unprocessed_items": 4
+    }
+
+def test_pending_orders_keyset_pages(client: TestClient, order_data):
+    # 按 (订单编号, 项目ID) 排序：ON-001 的 2、4，ON-002 的 1、3
+    response = client.get("/api/v1/orders/list/pending", params={"limit": 3})
+    assert response.status_code == 200
+    page = response.json()
+    assert [(item["order_no"], item["id"]) for item in page["items"]] == [("ON-001", 2), ("ON-001", 4), ("ON-002", 1)]
+    assert page["items"][0]["ship_name"] == "测试船舶"
+    assert page["items"][0]["product_name"] == "Apple"
+    assert page["items"][0]["total"] == 5.0
+    assert page["next_cursor"] == {"after_order_no": "ON-002", "after_id": 1}
+
+    response = client.get("/api/v1/orders/list/pending", params={"limit": 3, **page["next_cursor"]})
+    page = response.json()
+    assert [(item["order_no"], item["id"]) for item in page["items"]] == [("ON-002", 3)]
+    assert page["next_cursor"] is None
+
+def test_pending_orders_last_full_page(client: TestClient, order_data):
+    # 最后一页恰好填满时仍返回游标，下一页为空且没有游标
+    page = client.get("/api/v1/orders/list/pending", params={"limit": 4}).json()
+    assert len(page["items"]) == 4
+    assert page["next_cursor"] == {"after_order_no": "ON-002", "after_id": 3}
+
+    page = client.get("/api/v1/orders/list/pending", params={"limit": 4, **page["next_cursor"]}).json()
+    assert page == {"items": [], "next_cursor": None}
+
+def test_create_order_item_adds_to_order_total(db: Session, order_data):
+    # 直接调用端点函数：OrderItem 响应模型的 ProductInfo 需要产品没有的 name 字段
+    item = orders.create_order_item(
+        db=db,
+        item_data=OrderItemBase(order_id=1, product_id=1, supplier_id=1, quantity=2, price=3, total=6)
+    )
+    assert item.id is not None
+    orders.create_order_item(
+        db=db,
+        item_data=OrderItemBase(order_id=2, product_id=1, supplier_id=1, quantity=1, price=4, total=4)
+    )
+
+    db.expire_all()
+    assert float(db.get(Order, 1).total_amount) == 16
+    # 订单总金额为空时按 0 累加
+    assert float(db.get(Order, 2).total_amount) == 4
+
+def test_create_order_item_missing_reference(db: Session, order_data):
+    with pytest.raises(HTTPException) as exc_info:
+        orders.create_order_item(
+            db=db,
+            item_data=OrderItemBase(order_id=1, product_id=1, supplier_id=99, quantity=1, price=1, total=1)
+        )
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.detail == "供应商不存在"
+    db.expire_all()
+    assert float(db.get(Order, 1).total_amount) == 10
+    assert db.query(OrderItem).count() == 6
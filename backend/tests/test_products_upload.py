@@ -0,0 +1,38 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.main import app
+from app.models.models import Category, Country, Product, User
+
+# 测试产品简易上传API
+def test_upload_products_simple_stores_blank_cells_as_null(client: TestClient, db: Session):
+    db.add_all([
+        Country(id=1, name="日本", code="JP", status=True),
+        Category(id=1, name="食品", code="FOOD", status=True),
+    ])
+    db.commit()
+    app.dependency_overrides[deps.get_current_active_user] = lambda: User(id=1, email="test@example.com", is_active=True)
+
+    content = (
+        "product_name_en,country_name,category_name,effective_from,brand,currency,unit,price\n"
+        "Apple,日本,食品,2024-01-01,,,,\n"
+        "Pear,日本,食品,2024-01-01,Fresh,USD,kg,12.5\n"
+        ",日本,食品,2024-01-01,,,,\n"
+        "Plum,火星,食品,2024-01-01,,,,\n"
+    ).encode("utf-8")
+    response = client.post(
+        "/api/v1/file-upload/products/upload-simple",
+        files={"file": ("products.csv", content, "text/csv")},
+        data={"upload_id": "test"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success_count"] == 2
+    assert data["errors"] == ["第4行: 产品英文名称不能为空", "第5行: 找不到国家: 火星"]
+
+    # 空白单元格存为 NULL，而不是字符串 'nan'；空白币种默认为 JPY
+    apple = db.query(Product).filter(Product.product_name_en == "Apple").one()
+    assert (apple.brand, apple.unit, apple.price, apple.currency) == (None, None, None, "JPY")
+    pear = db.query(Product).filter(Product.product_name_en == "Pear").one()
+    assert (pear.brand, pear.unit, float(pear.price), pear.currency) == ("Fresh", "kg", 12.5, "USD")